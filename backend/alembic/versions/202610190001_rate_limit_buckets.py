@@ -0,0 +1,30 @@
+"""shared GCRA rate limit buckets
+
+Revision ID: 202610190001
+Revises: 202602210001
+Create Date: 2026-10-19 00:01:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190001"
+down_revision = "202602210001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE rate_limit_buckets (
+          key VARCHAR(128) PRIMARY KEY,
+          tat DOUBLE PRECISION NOT NULL
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_rate_limit_buckets_tat ON rate_limit_buckets(tat);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limit_buckets;")
@@ -0,0 +1,50 @@
+"""hourly bucketed rate limit counters
+
+Revision ID: 202610190002
+Revises: 202610190001
+Create Date: 2026-10-19 00:02:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190002"
+down_revision = "202610190001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE rate_limit_counters (
+          scope VARCHAR(16) NOT NULL,
+          key VARCHAR(64) NOT NULL,
+          bucket_start TIMESTAMPTZ NOT NULL,
+          count INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (scope, key, bucket_start)
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_rate_limit_counters_bucket_start ON rate_limit_counters(bucket_start);")
+
+    # Seed the counters from the existing event log so limits carry over.
+    op.execute(
+        """
+        INSERT INTO rate_limit_counters (scope, key, bucket_start, count)
+        SELECT scope, key, bucket_start, COUNT(*)
+        FROM (
+          SELECT 'ip' AS scope, ip AS key, date_trunc('hour', created_at) AS bucket_start FROM rate_limit_events
+          UNION ALL
+          SELECT 'building', building_id::text, date_trunc('hour', created_at) FROM rate_limit_events
+          UNION ALL
+          SELECT 'fp', fingerprint, date_trunc('hour', created_at) FROM rate_limit_events
+        ) AS e
+        WHERE bucket_start > now() - interval '48 hours'
+        GROUP BY scope, key, bucket_start;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limit_counters;")
@@ -0,0 +1,114 @@
+"""partition rate_limit_events by day
+
+Revision ID: 202610190003
+Revises: 202610190002
+Create Date: 2026-10-19 00:03:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190003"
+down_revision = "202610190002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE rate_limit_events RENAME TO rate_limit_events_legacy;")
+    op.execute("ALTER SEQUENCE rate_limit_events_id_seq RENAME TO rate_limit_events_legacy_id_seq;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_ip;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_fingerprint;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_building_id;")
+
+    op.execute(
+        """
+        CREATE TABLE rate_limit_events (
+          id SERIAL,
+          ip VARCHAR(64) NOT NULL,
+          fingerprint VARCHAR(64) NOT NULL,
+          building_id INTEGER NOT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          type VARCHAR(40) NOT NULL,
+          PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        """
+    )
+    # Catches rows outside any daily partition (e.g. if maintenance has not run yet).
+    op.execute("CREATE TABLE rate_limit_events_default PARTITION OF rate_limit_events DEFAULT;")
+    # Daily partitions for the retention window plus a few days ahead; the
+    # maintenance job keeps creating new ones and dropping expired ones.
+    # Days and bounds are UTC (explicit +00 literals), whatever the session
+    # TimeZone, matching what ``app.maintenance.retention`` creates.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+          today DATE := (now() AT TIME ZONE 'UTC')::date;
+          d DATE;
+        BEGIN
+          FOR d IN SELECT generate_series(today - 30, today + 3, interval '1 day')::date LOOP
+            EXECUTE format(
+              'CREATE TABLE IF NOT EXISTS %I PARTITION OF rate_limit_events FOR VALUES FROM (%L) TO (%L)',
+              'rate_limit_events_p' || to_char(d, 'YYYYMMDD'),
+              to_char(d, 'YYYY-MM-DD') || ' 00:00:00+00',
+              to_char(d + 1, 'YYYY-MM-DD') || ' 00:00:00+00'
+            );
+          END LOOP;
+        END
+        $$;
+        """
+    )
+    op.execute("CREATE INDEX ix_rate_limit_events_ip ON rate_limit_events(ip);")
+    op.execute("CREATE INDEX ix_rate_limit_events_fingerprint ON rate_limit_events(fingerprint);")
+    op.execute("CREATE INDEX ix_rate_limit_events_building_id ON rate_limit_events(building_id);")
+    op.execute("CREATE INDEX ix_rate_limit_events_created_at ON rate_limit_events(created_at);")
+
+    op.execute(
+        """
+        INSERT INTO rate_limit_events (id, ip, fingerprint, building_id, created_at, type)
+        SELECT id, ip, fingerprint, building_id, created_at, type
+        FROM rate_limit_events_legacy
+        WHERE created_at >= ((now() AT TIME ZONE 'UTC')::date - 30) AT TIME ZONE 'UTC';
+        """
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('rate_limit_events', 'id'), "
+        "COALESCE((SELECT MAX(id) FROM rate_limit_events_legacy), 0) + 1, false);"
+    )
+    op.execute("DROP TABLE rate_limit_events_legacy;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE rate_limit_events RENAME TO rate_limit_events_partitioned;")
+    op.execute("ALTER SEQUENCE rate_limit_events_id_seq RENAME TO rate_limit_events_partitioned_id_seq;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_ip;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_fingerprint;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_building_id;")
+    op.execute("DROP INDEX IF EXISTS ix_rate_limit_events_created_at;")
+    op.execute(
+        """
+        CREATE TABLE rate_limit_events (
+          id SERIAL PRIMARY KEY,
+          ip VARCHAR(64) NOT NULL,
+          fingerprint VARCHAR(64) NOT NULL,
+          building_id INTEGER NOT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          type VARCHAR(40) NOT NULL
+        );
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO rate_limit_events (id, ip, fingerprint, building_id, created_at, type)
+        SELECT id, ip, fingerprint, building_id, created_at, type FROM rate_limit_events_partitioned;
+        """
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('rate_limit_events', 'id'), "
+        "COALESCE((SELECT MAX(id) FROM rate_limit_events), 0) + 1, false);"
+    )
+    op.execute("DROP TABLE rate_limit_events_partitioned;")
+    op.execute("CREATE INDEX ix_rate_limit_events_ip ON rate_limit_events(ip);")
+    op.execute("CREATE INDEX ix_rate_limit_events_fingerprint ON rate_limit_events(fingerprint);")
+    op.execute("CREATE INDEX ix_rate_limit_events_building_id ON rate_limit_events(building_id);")
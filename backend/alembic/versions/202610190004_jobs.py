@@ -0,0 +1,41 @@
+"""durable background jobs
+
+Revision ID: 202610190004
+Revises: 202610190003
+Create Date: 2026-10-19 00:04:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190004"
+down_revision = "202610190003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE jobstatus AS ENUM ('QUEUED','RUNNING','DONE','FAILED');")
+    op.execute(
+        """
+        CREATE TABLE jobs (
+          id SERIAL PRIMARY KEY,
+          kind VARCHAR(64) NOT NULL,
+          payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+          status jobstatus NOT NULL DEFAULT 'QUEUED',
+          attempts INTEGER NOT NULL DEFAULT 0,
+          max_attempts INTEGER NOT NULL DEFAULT 5,
+          run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+          locked_at TIMESTAMPTZ NULL,
+          finished_at TIMESTAMPTZ NULL,
+          last_error TEXT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_jobs_status_run_after ON jobs(status, run_after);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS jobs;")
+    op.execute("DROP TYPE IF EXISTS jobstatus;")
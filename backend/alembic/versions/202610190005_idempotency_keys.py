@@ -0,0 +1,33 @@
+"""idempotency keys for POST /reviews and /reports
+
+Revision ID: 202610190005
+Revises: 202610190004
+Create Date: 2026-10-19 00:05:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190005"
+down_revision = "202610190004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE idempotency_keys (
+          key_hash VARCHAR(64) PRIMARY KEY,
+          request_hash VARCHAR(64) NOT NULL,
+          response_body JSONB NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          expires_at TIMESTAMPTZ NOT NULL
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_idempotency_keys_expires_at ON idempotency_keys(expires_at);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS idempotency_keys;")
@@ -0,0 +1,25 @@
+"""pii ruleset version on reviews
+
+Revision ID: 202610190006
+Revises: 202610190005
+Create Date: 2026-10-19 00:06:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190006"
+down_revision = "202610190005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep version 0 so the first re-scan covers them.
+    op.execute("ALTER TABLE reviews ADD COLUMN pii_ruleset_version INTEGER NOT NULL DEFAULT 0;")
+    op.execute("CREATE INDEX ix_review_pii_ruleset_version ON reviews(pii_ruleset_version, id);")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_review_pii_ruleset_version;")
+    op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS pii_ruleset_version;")
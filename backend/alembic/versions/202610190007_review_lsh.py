@@ -0,0 +1,41 @@
+"""minhash signatures and lsh bands for near-duplicate reviews
+
+Revision ID: 202610190007
+Revises: 202610190006
+Create Date: 2026-10-19 00:07:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190007"
+down_revision = "202610190006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE review_signatures (
+          review_id INTEGER PRIMARY KEY REFERENCES reviews(id) ON DELETE CASCADE,
+          signature BYTEA NOT NULL
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE review_lsh_bands (
+          band SMALLINT NOT NULL,
+          band_hash BIGINT NOT NULL,
+          review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+          PRIMARY KEY (band, band_hash, review_id)
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_review_lsh_bands_review_id ON review_lsh_bands(review_id);")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS review_lsh_bands;")
+    op.execute("DROP TABLE IF EXISTS review_signatures;")
@@ -0,0 +1,29 @@
+"""partial indexes for the moderation queue
+
+Revision ID: 202610190008
+Revises: 202610190007
+Create Date: 2026-10-19 00:08:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190008"
+down_revision = "202610190007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only the statuses moderators work through; they stay small as the
+    # table grows, unlike a full (status, created_at) index.
+    op.execute("CREATE INDEX ix_review_queue_pending ON reviews(created_at, id) WHERE status = 'PENDING';")
+    op.execute(
+        "CREATE INDEX ix_review_queue_changes_requested ON reviews(created_at, id) "
+        "WHERE status = 'CHANGES_REQUESTED';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_review_queue_changes_requested;")
+    op.execute("DROP INDEX IF EXISTS ix_review_queue_pending;")
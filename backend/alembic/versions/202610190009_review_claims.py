@@ -0,0 +1,26 @@
+"""moderation leases on reviews
+
+Revision ID: 202610190009
+Revises: 202610190008
+Create Date: 2026-10-19 00:09:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190009"
+down_revision = "202610190008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE reviews ADD COLUMN claimed_by UUID NULL REFERENCES users(id) ON DELETE SET NULL;")
+    op.execute("ALTER TABLE reviews ADD COLUMN claim_expires_at TIMESTAMPTZ NULL;")
+    op.execute("CREATE INDEX ix_review_claimed_by ON reviews(claimed_by) WHERE claimed_by IS NOT NULL;")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_review_claimed_by;")
+    op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS claim_expires_at;")
+    op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS claimed_by;")
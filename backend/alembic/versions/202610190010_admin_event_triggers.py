@@ -0,0 +1,75 @@
+"""row-level NOTIFY triggers for the admin event stream
+
+Revision ID: 202610190010
+Revises: 202610190009
+Create Date: 2026-10-19 00:10:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190010"
+down_revision = "202610190009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Separate from db-tools' statement-level 'db_data_changed' trigger, which
+    # only carries the table name. Payloads stay far below NOTIFY's 8000 bytes.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_admin_review_event() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            PERFORM pg_notify('admin_events', json_build_object(
+              'type', 'review.created', 'id', NEW.id, 'status', NEW.status,
+              'building_id', NEW.building_id, 'pii_flagged', NEW.pii_flagged)::text);
+          ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+            PERFORM pg_notify('admin_events', json_build_object(
+              'type', 'review.status_changed', 'id', NEW.id, 'status', NEW.status,
+              'previous_status', OLD.status)::text);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_admin_report_event() RETURNS trigger AS $$
+        BEGIN
+          IF TG_OP = 'INSERT' THEN
+            PERFORM pg_notify('admin_events', json_build_object(
+              'type', 'report.created', 'id', NEW.id, 'review_id', NEW.review_id, 'reason', NEW.reason)::text);
+          ELSIF NEW.resolved_at IS DISTINCT FROM OLD.resolved_at THEN
+            PERFORM pg_notify('admin_events', json_build_object(
+              'type', 'report.resolved', 'id', NEW.id, 'review_id', NEW.review_id,
+              'resolved_at', NEW.resolved_at)::text);
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_admin_events_reviews
+        AFTER INSERT OR UPDATE OF status ON reviews
+        FOR EACH ROW EXECUTE FUNCTION notify_admin_review_event();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_admin_events_reports
+        AFTER INSERT OR UPDATE OF resolved_at ON reports
+        FOR EACH ROW EXECUTE FUNCTION notify_admin_report_event();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_admin_events_reports ON reports;")
+    op.execute("DROP TRIGGER IF EXISTS trg_admin_events_reviews ON reviews;")
+    op.execute("DROP FUNCTION IF EXISTS notify_admin_report_event();")
+    op.execute("DROP FUNCTION IF EXISTS notify_admin_review_event();")
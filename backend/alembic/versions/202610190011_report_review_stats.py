@@ -0,0 +1,69 @@
+"""per-review report counters for triage
+
+Revision ID: 202610190011
+Revises: 202610190010
+Create Date: 2026-10-19 00:11:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190011"
+down_revision = "202610190010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE report_review_stats (
+          review_id INTEGER PRIMARY KEY REFERENCES reviews(id) ON DELETE CASCADE,
+          open_count INTEGER NOT NULL DEFAULT 0,
+          total_count INTEGER NOT NULL DEFAULT 0,
+          pii_count INTEGER NOT NULL DEFAULT 0,
+          harassment_count INTEGER NOT NULL DEFAULT 0,
+          false_info_count INTEGER NOT NULL DEFAULT 0,
+          spam_count INTEGER NOT NULL DEFAULT 0,
+          other_count INTEGER NOT NULL DEFAULT 0,
+          first_reported_at TIMESTAMPTZ NULL,
+          last_reported_at TIMESTAMPTZ NOT NULL
+        );
+        """
+    )
+    # Per-reason counters and first_reported_at describe open reports only.
+    op.execute(
+        """
+        INSERT INTO report_review_stats (
+          review_id, open_count, total_count, pii_count, harassment_count, false_info_count,
+          spam_count, other_count, first_reported_at, last_reported_at
+        )
+        SELECT
+          review_id,
+          count(*) FILTER (WHERE resolved_at IS NULL),
+          count(*),
+          count(*) FILTER (WHERE resolved_at IS NULL AND reason = 'PII'),
+          count(*) FILTER (WHERE resolved_at IS NULL AND reason = 'Harassment'),
+          count(*) FILTER (WHERE resolved_at IS NULL AND reason = 'FalseInfo'),
+          count(*) FILTER (WHERE resolved_at IS NULL AND reason = 'Spam'),
+          count(*) FILTER (WHERE resolved_at IS NULL AND reason = 'Other'),
+          min(created_at) FILTER (WHERE resolved_at IS NULL),
+          max(created_at)
+        FROM reports
+        GROUP BY review_id;
+        """
+    )
+    op.execute(
+        "CREATE INDEX ix_report_review_stats_open ON report_review_stats"
+        "(open_count DESC, last_reported_at DESC, review_id DESC) WHERE open_count > 0;"
+    )
+    op.execute(
+        "CREATE INDEX ix_report_review_stats_resolved ON report_review_stats"
+        "(last_reported_at DESC, review_id DESC) WHERE open_count = 0;"
+    )
+    op.execute("CREATE INDEX ix_reports_resolved_at_review_id ON reports(resolved_at, review_id);")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_reports_resolved_at_review_id;")
+    op.execute("DROP TABLE IF EXISTS report_review_stats;")
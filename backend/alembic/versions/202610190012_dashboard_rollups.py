@@ -0,0 +1,235 @@
+"""hourly/daily dashboard rollups maintained by statement-level triggers
+
+Revision ID: 202610190012
+Revises: 202610190011
+Create Date: 2026-10-19 00:12:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190012"
+down_revision = "202610190011"
+branch_labels = None
+depends_on = None
+
+_COUNTERS = """
+          submitted BIGINT NOT NULL DEFAULT 0,
+          pii_flagged BIGINT NOT NULL DEFAULT 0,
+          approved BIGINT NOT NULL DEFAULT 0,
+          rejected BIGINT NOT NULL DEFAULT 0,
+          changes_requested BIGINT NOT NULL DEFAULT 0,
+          removed BIGINT NOT NULL DEFAULT 0,
+          approval_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+          reports_created BIGINT NOT NULL DEFAULT 0,
+          reports_resolved BIGINT NOT NULL DEFAULT 0
+"""
+
+_ADD_COUNTERS = """
+            submitted = r.submitted + EXCLUDED.submitted,
+            pii_flagged = r.pii_flagged + EXCLUDED.pii_flagged,
+            approved = r.approved + EXCLUDED.approved,
+            rejected = r.rejected + EXCLUDED.rejected,
+            changes_requested = r.changes_requested + EXCLUDED.changes_requested,
+            removed = r.removed + EXCLUDED.removed,
+            approval_seconds = r.approval_seconds + EXCLUDED.approval_seconds,
+            reports_created = r.reports_created + EXCLUDED.reports_created,
+            reports_resolved = r.reports_resolved + EXCLUDED.reports_resolved
+"""
+
+_VALUES = """
+            bump_dashboard_rollups.submitted, bump_dashboard_rollups.pii_flagged,
+            bump_dashboard_rollups.approved, bump_dashboard_rollups.rejected,
+            bump_dashboard_rollups.changes_requested, bump_dashboard_rollups.removed,
+            bump_dashboard_rollups.approval_seconds, bump_dashboard_rollups.reports_created,
+            bump_dashboard_rollups.reports_resolved
+"""
+
+_COLUMNS = (
+    "submitted, pii_flagged, approved, rejected, changes_requested, removed, "
+    "approval_seconds, reports_created, reports_resolved"
+)
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE TABLE dashboard_rollup_hourly (bucket TIMESTAMPTZ PRIMARY KEY, {_COUNTERS});")
+    op.execute(f"CREATE TABLE dashboard_rollup_daily (day DATE PRIMARY KEY, {_COUNTERS});")
+    op.execute(
+        """
+        CREATE TABLE review_status_counts (
+          status reviewstatus PRIMARY KEY,
+          review_count BIGINT NOT NULL DEFAULT 0
+        );
+        """
+    )
+    # Buckets are UTC hours/days whatever the session time zone is.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_hour(ts TIMESTAMPTZ) RETURNS TIMESTAMPTZ AS $$
+          SELECT date_trunc('hour', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION bump_dashboard_rollups(
+          happened_at TIMESTAMPTZ,
+          submitted BIGINT DEFAULT 0,
+          pii_flagged BIGINT DEFAULT 0,
+          approved BIGINT DEFAULT 0,
+          rejected BIGINT DEFAULT 0,
+          changes_requested BIGINT DEFAULT 0,
+          removed BIGINT DEFAULT 0,
+          approval_seconds DOUBLE PRECISION DEFAULT 0,
+          reports_created BIGINT DEFAULT 0,
+          reports_resolved BIGINT DEFAULT 0
+        ) RETURNS void AS $$
+          INSERT INTO dashboard_rollup_hourly AS r (bucket, {_COLUMNS})
+          VALUES (rollup_hour(happened_at), {_VALUES})
+          ON CONFLICT (bucket) DO UPDATE SET {_ADD_COUNTERS};
+          INSERT INTO dashboard_rollup_daily AS r (day, {_COLUMNS})
+          VALUES ((happened_at AT TIME ZONE 'UTC')::date, {_VALUES})
+          ON CONFLICT (day) DO UPDATE SET {_ADD_COUNTERS};
+        $$ LANGUAGE sql;
+        """
+    )
+    # Statement-level triggers with transition tables: a bulk moderation
+    # UPDATE or an import COPY does one upsert per touched bucket, not one
+    # per row. Status counters are upserted in status order so concurrent
+    # writers always lock them in the same order.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_reviews_inserted() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(g.hour, submitted => g.n, pii_flagged => g.flagged)
+          FROM (
+            SELECT rollup_hour(created_at) AS hour, count(*) AS n, count(*) FILTER (WHERE pii_flagged) AS flagged
+            FROM new_rows GROUP BY 1
+          ) g;
+          PERFORM bump_dashboard_rollups(g.hour, approved => g.n, approval_seconds => g.seconds)
+          FROM (
+            SELECT rollup_hour(approved_at) AS hour, count(*) AS n,
+                   sum(extract(epoch FROM approved_at - created_at))::double precision AS seconds
+            FROM new_rows WHERE approved_at IS NOT NULL GROUP BY 1
+          ) g;
+          INSERT INTO review_status_counts AS c (status, review_count)
+          SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+          ON CONFLICT (status) DO UPDATE SET review_count = c.review_count + EXCLUDED.review_count;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_reviews_updated() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(
+            g.hour, approved => g.approved, rejected => g.rejected, changes_requested => g.changes_requested,
+            removed => g.removed, approval_seconds => g.seconds)
+          FROM (
+            SELECT
+              rollup_hour(CASE WHEN n.status = 'APPROVED' THEN coalesce(n.approved_at, now()) ELSE now() END) AS hour,
+              count(*) FILTER (WHERE n.status = 'APPROVED') AS approved,
+              count(*) FILTER (WHERE n.status = 'REJECTED') AS rejected,
+              count(*) FILTER (WHERE n.status = 'CHANGES_REQUESTED') AS changes_requested,
+              count(*) FILTER (WHERE n.status = 'REMOVED') AS removed,
+              coalesce(sum(extract(epoch FROM coalesce(n.approved_at, now()) - n.created_at))
+                FILTER (WHERE n.status = 'APPROVED'), 0)::double precision AS seconds
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.status <> o.status
+            GROUP BY 1
+          ) g;
+          -- Flags can change after creation (near-duplicate detection, PII
+          -- re-scans); they count against the submission's own bucket.
+          PERFORM bump_dashboard_rollups(g.hour, pii_flagged => g.delta)
+          FROM (
+            SELECT rollup_hour(n.created_at) AS hour, sum(CASE WHEN n.pii_flagged THEN 1 ELSE -1 END) AS delta
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.pii_flagged IS DISTINCT FROM o.pii_flagged
+            GROUP BY 1
+          ) g;
+          INSERT INTO review_status_counts AS c (status, review_count)
+          SELECT s.status, sum(s.delta)
+          FROM old_rows o JOIN new_rows n ON n.id = o.id
+          CROSS JOIN LATERAL (VALUES (o.status, -1), (n.status, 1)) AS s(status, delta)
+          WHERE n.status <> o.status
+          GROUP BY s.status ORDER BY s.status
+          ON CONFLICT (status) DO UPDATE SET review_count = c.review_count + EXCLUDED.review_count;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_reviews_deleted() RETURNS trigger AS $$
+        BEGIN
+          INSERT INTO review_status_counts AS c (status, review_count)
+          SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+          ON CONFLICT (status) DO UPDATE SET review_count = c.review_count + EXCLUDED.review_count;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_reports_inserted() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(g.hour, reports_created => g.n)
+          FROM (SELECT rollup_hour(created_at) AS hour, count(*) AS n FROM new_rows GROUP BY 1) g;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION rollup_reports_updated() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(g.hour, reports_resolved => g.n)
+          FROM (
+            SELECT rollup_hour(n.resolved_at) AS hour, count(*) AS n
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE o.resolved_at IS NULL AND n.resolved_at IS NOT NULL
+            GROUP BY 1
+          ) g;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Transition tables rule out column lists and multi-event triggers, hence
+    # one trigger per event.
+    for table, event, transition, function in (
+        ("reviews", "INSERT", "NEW TABLE AS new_rows", "rollup_reviews_inserted"),
+        ("reviews", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows", "rollup_reviews_updated"),
+        ("reviews", "DELETE", "OLD TABLE AS old_rows", "rollup_reviews_deleted"),
+        ("reports", "INSERT", "NEW TABLE AS new_rows", "rollup_reports_inserted"),
+        ("reports", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows", "rollup_reports_updated"),
+    ):
+        op.execute(
+            f"CREATE TRIGGER trg_{function} AFTER {event} ON {table} "
+            f"REFERENCING {transition} FOR EACH STATEMENT EXECUTE FUNCTION {function}();"
+        )
+
+
+def downgrade() -> None:
+    for table, function in (
+        ("reports", "rollup_reports_updated"),
+        ("reports", "rollup_reports_inserted"),
+        ("reviews", "rollup_reviews_deleted"),
+        ("reviews", "rollup_reviews_updated"),
+        ("reviews", "rollup_reviews_inserted"),
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{function} ON {table};")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}();")
+    op.execute(
+        "DROP FUNCTION IF EXISTS bump_dashboard_rollups("
+        "TIMESTAMPTZ, BIGINT, BIGINT, BIGINT, BIGINT, BIGINT, BIGINT, DOUBLE PRECISION, BIGINT, BIGINT);"
+    )
+    op.execute("DROP FUNCTION IF EXISTS rollup_hour(TIMESTAMPTZ);")
+    op.execute("DROP TABLE IF EXISTS review_status_counts;")
+    op.execute("DROP TABLE IF EXISTS dashboard_rollup_daily;")
+    op.execute("DROP TABLE IF EXISTS dashboard_rollup_hourly;")
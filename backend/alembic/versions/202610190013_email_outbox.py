@@ -0,0 +1,46 @@
+"""email outbox for asynchronous delivery
+
+Revision ID: 202610190013
+Revises: 202610190012
+Create Date: 2026-10-19 00:13:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190013"
+down_revision = "202610190012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reuses the jobs table's status enum: QUEUED -> RUNNING -> DONE/FAILED.
+    op.execute(
+        """
+        CREATE TABLE email_outbox (
+          id SERIAL PRIMARY KEY,
+          recipient VARCHAR(320) NOT NULL,
+          subject VARCHAR(255) NOT NULL,
+          body TEXT NOT NULL,
+          dedupe_key VARCHAR(400) NULL,
+          status jobstatus NOT NULL DEFAULT 'QUEUED',
+          attempts INTEGER NOT NULL DEFAULT 0,
+          max_attempts INTEGER NOT NULL DEFAULT 6,
+          run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+          locked_at TIMESTAMPTZ NULL,
+          sent_at TIMESTAMPTZ NULL,
+          last_error TEXT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute("CREATE INDEX ix_email_outbox_status_run_after ON email_outbox(status, run_after);")
+    op.execute(
+        "CREATE INDEX ix_email_outbox_dedupe_key_created_at ON email_outbox(dedupe_key, created_at) "
+        "WHERE dedupe_key IS NOT NULL;"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS email_outbox;")
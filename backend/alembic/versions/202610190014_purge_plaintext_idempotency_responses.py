@@ -0,0 +1,24 @@
+"""purge idempotency responses stored in plaintext
+
+Revision ID: 202610190014
+Revises: 202610190013
+Create Date: 2026-10-19 00:14:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190014"
+down_revision = "202610190013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Earlier rows hold unsealed responses (including review edit tokens) and
+    # were keyed without the caller, so no request can match them any more.
+    op.execute("DELETE FROM idempotency_keys;")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,23 @@
+"""blank bodies of permanently failed outbox emails
+
+Revision ID: 202610190015
+Revises: 202610190014
+Create Date: 2026-10-19 00:15:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190015"
+down_revision = "202610190014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The dispatcher now blanks bodies (which carry sign-in links) on final failure too.
+    op.execute("UPDATE email_outbox SET body = '' WHERE status = 'FAILED' AND body <> '';")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,192 @@
+"""shard dashboard rollup rows to spread trigger write contention
+
+Revision ID: 202610190016
+Revises: 202610190015
+Create Date: 2026-10-19 00:16:00
+
+Every review insert and status change used to upsert the same hourly, daily
+and status-count rows, and each writer held those row locks until commit,
+so concurrent submissions and moderation actions queued behind each other
+(the group-commit writer included).  Each logical row is now split into
+``ROLLUP_SHARDS`` rows keyed by ``(bucket, shard)``; a transaction writes the
+shard picked from its backend pid, so writers on different connections
+almost never touch the same row.  The cost is on the read side: the
+dashboard sums up to ``ROLLUP_SHARDS`` rows per bucket/status, which is
+still a few thousand small rows at most.  Append-only deltas would remove
+contention entirely but need a periodic fold job; shards keep the rollups
+exact at commit time with no extra moving part.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190016"
+down_revision = "202610190015"
+branch_labels = None
+depends_on = None
+
+ROLLUP_SHARDS = 8
+
+_COLUMNS = (
+    "submitted, pii_flagged, approved, rejected, changes_requested, removed, "
+    "approval_seconds, reports_created, reports_resolved"
+)
+
+_ADD_COUNTERS = ", ".join(f"{name} = r.{name} + EXCLUDED.{name}" for name in _COLUMNS.split(", "))
+
+_VALUES = ", ".join(f"bump_dashboard_rollups.{name}" for name in _COLUMNS.split(", "))
+
+# (table, key column)
+_TABLES = (
+    ("dashboard_rollup_hourly", "bucket"),
+    ("dashboard_rollup_daily", "day"),
+    ("review_status_counts", "status"),
+)
+
+
+def _functions(sharded: bool) -> list[str]:
+    """Rollup functions writing one shard per backend, or the single unsharded row."""
+    shard_column = ", shard" if sharded else ""
+    shard_value = ", rollup_shard()" if sharded else ""
+    status_insert = f"INSERT INTO review_status_counts AS c (status{shard_column}, review_count)"
+    status_conflict = (
+        f"ON CONFLICT (status{shard_column}) DO UPDATE SET review_count = c.review_count + EXCLUDED.review_count"
+    )
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION bump_dashboard_rollups(
+          happened_at TIMESTAMPTZ,
+          submitted BIGINT DEFAULT 0,
+          pii_flagged BIGINT DEFAULT 0,
+          approved BIGINT DEFAULT 0,
+          rejected BIGINT DEFAULT 0,
+          changes_requested BIGINT DEFAULT 0,
+          removed BIGINT DEFAULT 0,
+          approval_seconds DOUBLE PRECISION DEFAULT 0,
+          reports_created BIGINT DEFAULT 0,
+          reports_resolved BIGINT DEFAULT 0
+        ) RETURNS void AS $$
+          INSERT INTO dashboard_rollup_hourly AS r (bucket{shard_column}, {_COLUMNS})
+          VALUES (rollup_hour(happened_at){shard_value}, {_VALUES})
+          ON CONFLICT (bucket{shard_column}) DO UPDATE SET {_ADD_COUNTERS};
+          INSERT INTO dashboard_rollup_daily AS r (day{shard_column}, {_COLUMNS})
+          VALUES ((happened_at AT TIME ZONE 'UTC')::date{shard_value}, {_VALUES})
+          ON CONFLICT (day{shard_column}) DO UPDATE SET {_ADD_COUNTERS};
+        $$ LANGUAGE sql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION rollup_reviews_inserted() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(g.hour, submitted => g.n, pii_flagged => g.flagged)
+          FROM (
+            SELECT rollup_hour(created_at) AS hour, count(*) AS n, count(*) FILTER (WHERE pii_flagged) AS flagged
+            FROM new_rows GROUP BY 1
+          ) g;
+          PERFORM bump_dashboard_rollups(g.hour, approved => g.n, approval_seconds => g.seconds)
+          FROM (
+            SELECT rollup_hour(approved_at) AS hour, count(*) AS n,
+                   sum(extract(epoch FROM approved_at - created_at))::double precision AS seconds
+            FROM new_rows WHERE approved_at IS NOT NULL GROUP BY 1
+          ) g;
+          {status_insert}
+          SELECT status{shard_value}, count(*) FROM new_rows GROUP BY status ORDER BY status
+          {status_conflict};
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION rollup_reviews_updated() RETURNS trigger AS $$
+        BEGIN
+          PERFORM bump_dashboard_rollups(
+            g.hour, approved => g.approved, rejected => g.rejected, changes_requested => g.changes_requested,
+            removed => g.removed, approval_seconds => g.seconds)
+          FROM (
+            SELECT
+              rollup_hour(CASE WHEN n.status = 'APPROVED' THEN coalesce(n.approved_at, now()) ELSE now() END) AS hour,
+              count(*) FILTER (WHERE n.status = 'APPROVED') AS approved,
+              count(*) FILTER (WHERE n.status = 'REJECTED') AS rejected,
+              count(*) FILTER (WHERE n.status = 'CHANGES_REQUESTED') AS changes_requested,
+              count(*) FILTER (WHERE n.status = 'REMOVED') AS removed,
+              coalesce(sum(extract(epoch FROM coalesce(n.approved_at, now()) - n.created_at))
+                FILTER (WHERE n.status = 'APPROVED'), 0)::double precision AS seconds
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.status <> o.status
+            GROUP BY 1
+          ) g;
+          PERFORM bump_dashboard_rollups(g.hour, pii_flagged => g.delta)
+          FROM (
+            SELECT rollup_hour(n.created_at) AS hour, sum(CASE WHEN n.pii_flagged THEN 1 ELSE -1 END) AS delta
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.pii_flagged IS DISTINCT FROM o.pii_flagged
+            GROUP BY 1
+          ) g;
+          {status_insert}
+          SELECT s.status{shard_value}, sum(s.delta)
+          FROM old_rows o JOIN new_rows n ON n.id = o.id
+          CROSS JOIN LATERAL (VALUES (o.status, -1), (n.status, 1)) AS s(status, delta)
+          WHERE n.status <> o.status
+          GROUP BY s.status ORDER BY s.status
+          {status_conflict};
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION rollup_reviews_deleted() RETURNS trigger AS $$
+        BEGIN
+          {status_insert}
+          SELECT status{shard_value}, -count(*) FROM old_rows GROUP BY status ORDER BY status
+          {status_conflict};
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+    ]
+
+
+def upgrade() -> None:
+    # Stable for the whole session, so one transaction always hits the same
+    # shard and its status-count upserts keep their status lock order.
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION rollup_shard() RETURNS SMALLINT AS $$
+          SELECT (pg_backend_pid() % {ROLLUP_SHARDS})::smallint;
+        $$ LANGUAGE sql STABLE;
+        """
+    )
+    for table, key in _TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN shard SMALLINT NOT NULL DEFAULT 0;")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey, ADD PRIMARY KEY ({key}, shard);")
+    for statement in _functions(sharded=True):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in _functions(sharded=False):
+        op.execute(statement)
+    for table, key in _TABLES:
+        # Fold every shard into shard 0 before dropping the column.
+        sums = (
+            "review_count = s.review_count"
+            if table == "review_status_counts"
+            else ", ".join(f"{name} = s.{name}" for name in _COLUMNS.split(", "))
+        )
+        totals = (
+            "sum(review_count) AS review_count"
+            if table == "review_status_counts"
+            else ", ".join(f"sum({name}) AS {name}" for name in _COLUMNS.split(", "))
+        )
+        op.execute(
+            f"""
+            UPDATE {table} t SET {sums}
+            FROM (SELECT {key}, {totals} FROM {table} GROUP BY {key}) s
+            WHERE t.{key} = s.{key} AND t.shard = (SELECT min(shard) FROM {table} m WHERE m.{key} = t.{key});
+            """
+        )
+        op.execute(
+            f"DELETE FROM {table} t WHERE t.shard > (SELECT min(shard) FROM {table} m WHERE m.{key} = t.{key});"
+        )
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey, ADD PRIMARY KEY ({key});")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN shard;")
+    op.execute("DROP FUNCTION IF EXISTS rollup_shard();")
@@ -0,0 +1,35 @@
+"""index the moderation queue for every status
+
+Revision ID: 202610190017
+Revises: 202610190016
+Create Date: 2026-10-19 00:17:00
+
+The queue endpoint filters on any status, but only PENDING and
+CHANGES_REQUESTED had a ``(created_at, id)`` index; APPROVED and REJECTED
+pages fell back to ``ix_review_created_at`` plus a filter.  One
+``(status, created_at, id)`` index serves every status and replaces both
+partial indexes.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202610190017"
+down_revision = "202610190016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX ix_review_status_created_at ON reviews(status, created_at, id);")
+    op.execute("DROP INDEX IF EXISTS ix_review_queue_changes_requested;")
+    op.execute("DROP INDEX IF EXISTS ix_review_queue_pending;")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX ix_review_queue_pending ON reviews(created_at, id) WHERE status = 'PENDING';")
+    op.execute(
+        "CREATE INDEX ix_review_queue_changes_requested ON reviews(created_at, id) "
+        "WHERE status = 'CHANGES_REQUESTED';"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_review_status_created_at;")
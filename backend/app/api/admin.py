@@ -1,15 +1,31 @@
+import asyncio
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_admin
-from app.core.database import get_db
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import get_db, stick_to_primary
 from app.models.entities import Review, User
-from app.models.enums import ReviewStatus
+from app.models.enums import AuthorBadge, ReviewStatus
+from app.moderation.queue import (
+    CLAIM_STATEMENT,
+    RELEASE_STATEMENT,
+    QueueFilters,
+    bulk_transition_statement,
+    claim_blocks,
+    decode_cursor,
+    encode_cursor,
+    queue_query,
+)
 from app.moderation.state import can_transition
-from app.schemas.reviews import AdminModerationPayload
+from app.schemas.reviews import AdminModerationPayload, BulkModerationPayload, ClaimPayload, ReleasePayload
+from app.services.admin_events import admin_events, format_sse
+from app.services.dashboard_stats import Granularity, dashboard_stats
 
 router = APIRouter(prefix="/admin")
 
@@ -17,13 +33,68 @@ router = APIRouter(prefix="/admin")
 def _apply_status(review: Review, target: ReviewStatus, admin: User, message: str | None = None) -> None:
     if not can_transition(review.status, target):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status transition")
+    if claim_blocks(review.claimed_by, review.claim_expires_at, admin.id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Review is claimed by another moderator")
     review.status = target
     review.moderated_by = admin.id
     review.moderation_message = message
+    review.claimed_by = None
+    review.claim_expires_at = None
     if target == ReviewStatus.APPROVED:
         review.approved_at = datetime.now(UTC)
 
 
+@router.get("/metrics")
+async def metrics_snapshot(_: User = Depends(require_admin)) -> dict:
+    """Per-worker latency histograms, counters and gauges."""
+    return metrics.snapshot()
+
+
+@router.get("/stats")
+async def admin_stats(
+    granularity: Granularity = "day",
+    points: int = Query(default=30, ge=1, le=744),
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> dict:
+    """Review counts by status plus per-bucket submission, moderation and report series."""
+    return await dashboard_stats(db, granularity, points)
+
+
+@router.get("/events")
+async def admin_event_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> StreamingResponse:
+    """Server-sent events for new reviews, status changes and reports."""
+    # The session only served the admin check; don't pin a pooled
+    # connection for the lifetime of the stream.
+    await db.close()
+
+    async def stream():
+        # Subscribed on the first step, so a client that disconnects before the
+        # body starts never leaves a queue behind (this ``finally`` would not run).
+        queue = admin_events.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            admin_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/reviews")
 async def list_reviews(db: AsyncSession = Depends(get_db), _: User = Depends(require_admin)) -> list[dict]:
     reviews = (await db.execute(select(Review).order_by(Review.created_at.desc()))).scalars().all()
@@ -40,7 +111,144 @@ async def list_reviews(db: AsyncSession = Depends(get_db), _: User = Depends(req
     ]
 
 
-@router.post("/reviews/{review_id}/approve")
+@router.get("/reviews/queue")
+async def review_queue(
+    status_filter: ReviewStatus = Query(default=ReviewStatus.PENDING, alias="status"),
+    pii_flagged: bool | None = None,
+    verified: bool | None = None,
+    language: str | None = Query(default=None, max_length=8),
+    building_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> dict:
+    """Oldest-first moderation queue with filters and keyset pagination."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    filters = QueueFilters(status_filter, pii_flagged, verified, language, building_id)
+    rows = (await db.execute(queue_query(filters, after, limit + 1))).all()
+    page = rows[:limit]
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "status": row.status.value,
+                "tracking_code": row.tracking_code,
+                "building_id": row.building_id,
+                "language_tag": row.language_tag,
+                "verified": row.author_badge == AuthorBadge.VERIFIED_ACCOUNT,
+                "overall_score": float(row.overall_score),
+                "pii_flagged": row.pii_flagged,
+                "pii_reasons": row.pii_reasons or [],
+                "created_at": row.created_at.isoformat(),
+                "comment_preview": row.comment_preview,
+            }
+            for row in page
+        ],
+        "next_cursor": encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None,
+    }
+
+
+@router.post("/reviews/claim")
+async def claim_reviews(
+    payload: ClaimPayload,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(require_admin),
+) -> dict:
+    """Lease the next reviews to this moderator; expired leases go back to the pool."""
+    try:
+        queue_status = ReviewStatus(payload.status)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status") from exc
+
+    rows = (
+        await db.execute(
+            CLAIM_STATEMENT,
+            {
+                "admin_id": admin.id,
+                "status": queue_status.value,
+                "limit": payload.limit,
+                "lease_seconds": settings.moderation_lease_seconds,
+            },
+        )
+    ).all()
+    await db.commit()
+    metrics.counter("moderation.claimed").inc(len(rows))
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "status": row.status,
+                "tracking_code": row.tracking_code,
+                "building_id": row.building_id,
+                "language_tag": row.language_tag,
+                "verified": row.author_badge == AuthorBadge.VERIFIED_ACCOUNT.value,
+                "overall_score": float(row.overall_score),
+                "pii_flagged": row.pii_flagged,
+                "pii_reasons": row.pii_reasons or [],
+                "created_at": row.created_at.isoformat(),
+                "claim_expires_at": row.claim_expires_at.isoformat(),
+                "comment_preview": row.comment_preview,
+            }
+            for row in sorted(rows, key=lambda row: (row.created_at, row.id))
+        ]
+    }
+
+
+@router.post("/reviews/release")
+async def release_reviews(
+    payload: ReleasePayload,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(require_admin),
+) -> dict:
+    released = (await db.execute(RELEASE_STATEMENT, {"review_ids": payload.review_ids, "admin_id": admin.id})).scalars().all()
+    await db.commit()
+    return {"ok": True, "released": sorted(released)}
+
+
+@router.post("/reviews/bulk", dependencies=[Depends(stick_to_primary)])
+async def bulk_moderate(
+    payload: BulkModerationPayload,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(require_admin),
+) -> dict:
+    """Apply one target status to many reviews in a single statement.
+
+    Each id is reported as ``applied``, ``invalid_transition``, ``claimed`` (by
+    another moderator) or ``not_found``; the others do not prevent the valid
+    ones from being applied.
+    """
+    try:
+        target = ReviewStatus(payload.status)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status") from exc
+
+    review_ids = list(dict.fromkeys(payload.review_ids))
+    rows = (await db.execute(bulk_transition_statement(review_ids, target, admin.id, payload.message))).all()
+    await db.commit()
+
+    found = {row.id: row for row in rows}
+    results = []
+    for review_id in review_ids:
+        row = found.get(review_id)
+        if row is None:
+            results.append({"id": review_id, "outcome": "not_found"})
+        elif row.claimed:
+            results.append({"id": review_id, "outcome": "claimed", "status": row.status.value})
+        elif row.applied:
+            results.append({"id": review_id, "outcome": "applied", "previous_status": row.status.value})
+        else:
+            results.append({"id": review_id, "outcome": "invalid_transition", "status": row.status.value})
+    applied = sum(1 for result in results if result["outcome"] == "applied")
+    metrics.counter("moderation.bulk.applied").inc(applied)
+    return {"ok": True, "applied": applied, "results": results}
+
+
+@router.post("/reviews/{review_id}/approve", dependencies=[Depends(stick_to_primary)])
 async def approve_review(
     review_id: int,
     payload: AdminModerationPayload,
@@ -55,7 +263,7 @@ async def approve_review(
     return {"ok": True}
 
 
-@router.post("/reviews/{review_id}/reject")
+@router.post("/reviews/{review_id}/reject", dependencies=[Depends(stick_to_primary)])
 async def reject_review(
     review_id: int,
     payload: AdminModerationPayload,
@@ -70,7 +278,7 @@ async def reject_review(
     return {"ok": True}
 
 
-@router.post("/reviews/{review_id}/request-changes")
+@router.post("/reviews/{review_id}/request-changes", dependencies=[Depends(stick_to_primary)])
 async def request_changes(
     review_id: int,
     payload: AdminModerationPayload,
@@ -85,7 +293,7 @@ async def request_changes(
     return {"ok": True}
 
 
-@router.post("/reviews/{review_id}/remove")
+@router.post("/reviews/{review_id}/remove", dependencies=[Depends(stick_to_primary)])
 async def remove_review(
     review_id: int,
     payload: AdminModerationPayload,
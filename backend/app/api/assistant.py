@@ -10,10 +10,8 @@ from __future__ import annotations
 import json
 import logging
 import re
-import time
-from collections import defaultdict
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
@@ -23,22 +21,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/assistant")
 
-# ---- simple in-memory rate limiter (per IP) ----
-_rate_store: dict[str, list[float]] = defaultdict(list)
-_MAX_PER_HOUR = 30
-
-
-def _check_rate(ip: str) -> bool:
-    now = time.time()
-    window = now - 3600
-    hits = _rate_store[ip]
-    _rate_store[ip] = [t for t in hits if t > window]
-    if len(_rate_store[ip]) >= _MAX_PER_HOUR:
-        return False
-    _rate_store[ip].append(now)
-    return True
-
-
 # ---- input sanitisation ----
 _DANGEROUS_PATTERNS = re.compile(
     r"(ignore\s+(previous|above|all)\s+instructions?"
@@ -183,19 +165,15 @@ def _looks_like_place_query(query: str) -> bool:
 
 # ---- endpoint ----
 @router.post("", response_model=AssistantResponse)
-async def chat(body: AssistantRequest, request: Request) -> AssistantResponse:
+async def chat(body: AssistantRequest) -> AssistantResponse:
     if not settings.gemini_api_key:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="AI assistant is not configured.",
         )
 
-    client_ip = request.client.host if request.client else "unknown"
-    if not _check_rate(client_ip):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests. Please wait a moment.",
-        )
+    # Per-IP limits are enforced by the public rate limiter middleware
+    # (see app.rate_limit.gcra), shared with the search/map/geocode routes.
 
     # Sanitise user input
     safe_message = _sanitise_input(body.message)
@@ -217,6 +195,9 @@ async def chat(body: AssistantRequest, request: Request) -> AssistantResponse:
         system=_SYSTEM,
         max_tokens=300,
         temperature=0.3,
+        purpose="assistant",
+        queue_timeout=2.0,
+        deadline=15.0,
     )
 
     if not raw:
@@ -5,13 +5,16 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
+from app.auth.session_cache import session_cache
+from app.core import metrics
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import create_jwt, hash_token, random_token, utcnow
 from app.models.entities import MagicLinkToken, Session, User
 from app.models.enums import UserRole
 from app.schemas.auth import RequestLinkPayload
-from app.services.email import send_magic_link_email
+from app.services.email import MAGIC_LINK_SUBJECT, magic_link_body
+from app.services.email_outbox import email_dispatcher, enqueue_email, recently_enqueued
 
 router = APIRouter(prefix="/auth")
 
@@ -19,15 +22,22 @@ router = APIRouter(prefix="/auth")
 @router.post("/request-link")
 async def request_magic_link(payload: RequestLinkPayload, db: AsyncSession = Depends(get_db)) -> dict:
     normalized_email = payload.email.strip().lower()
+    dedupe_key = f"magic_link:{normalized_email}"
+    # A link sent moments ago is still valid; repeated clicks do not mail again.
+    # Without real email nothing is mailed, and each request returns its own dev link.
+    if settings.send_real_email and await recently_enqueued(db, dedupe_key, settings.magic_link_dedupe_seconds):
+        metrics.counter("auth.magic_link.suppressed").inc()
+        return {"ok": True, "dev_link": None}
+
     token = random_token(32)
     token_hash = hash_token(token)
     expires_at = utcnow() + timedelta(minutes=15)
+    link = f"{settings.app_url}/en/auth/login?token={token}"
 
     db.add(MagicLinkToken(email=normalized_email, token_hash=token_hash, expires_at=expires_at))
+    enqueue_email(db, normalized_email, MAGIC_LINK_SUBJECT, magic_link_body(link), dedupe_key=dedupe_key)
     await db.commit()
-
-    link = f"{settings.app_url}/en/auth/login?token={token}"
-    await send_magic_link_email(normalized_email, link)
+    email_dispatcher.wake()
 
     return {"ok": True, "dev_link": link if not settings.send_real_email else None}
 
@@ -47,6 +57,7 @@ async def auth_callback(token: str = Query(min_length=10), db: AsyncSession = De
     user_stmt = select(User).where(User.email == token_obj.email)
     user = (await db.execute(user_stmt)).scalar_one_or_none()
     desired_role = UserRole.ADMIN if settings.is_admin_email(token_obj.email) else UserRole.USER
+    role_changed = False
     if not user:
         user = User(email=token_obj.email, role=desired_role)
         db.add(user)
@@ -54,6 +65,7 @@ async def auth_callback(token: str = Query(min_length=10), db: AsyncSession = De
     else:
         if user.role != desired_role:
             user.role = desired_role
+            role_changed = True
 
     token_obj.used_at = utcnow()
     session_token = create_jwt(str(user.id))
@@ -65,6 +77,8 @@ async def auth_callback(token: str = Query(min_length=10), db: AsyncSession = De
         )
     )
     await db.commit()
+    if role_changed:
+        session_cache.invalidate_user(user.id)
 
     response = Response(content="Authenticated", media_type="text/plain")
     response.set_cookie(
@@ -91,6 +105,10 @@ async def logout(
         if existing:
             await db.delete(existing)
             await db.commit()
+    if session_token:
+        # The tombstone stops a request that read the row before the delete
+        # from caching it again.
+        session_cache.invalidate(hash_token(session_token))
     response = Response(content="Logged out", media_type="text/plain")
     response.delete_cookie("lh_session", path="/")
     return response
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.core import metrics
+from app.core.config import settings
+from app.pii.incremental import PiiSessionStore, apply_edit, summarize
+from app.pii.scanner import find_pii
+from app.schemas.reviews import PiiCheckPayload
+
+router = APIRouter(prefix="/pii")
+
+MAX_TEXT_LENGTH = 4000
+
+# Sessions live in this process only; after a restart or when a request lands
+# on another worker the client gets a 409 and resends the full text.
+_sessions = PiiSessionStore(max_sessions=settings.pii_check_max_sessions)
+
+
+@router.post("/check")
+async def check_pii(payload: PiiCheckPayload, request: Request) -> dict:
+    """Live PII check for the review form.
+
+    Send ``text`` for a full scan, or ``edit`` with the ``session_key`` of an
+    earlier call to re-scan only the region around the change.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    session_key = f"{client_ip}:{payload.session_key}" if payload.session_key else None
+
+    if payload.text is not None:
+        text = payload.text
+        matches = find_pii(text)
+        metrics.counter("pii.check.full").inc()
+    elif payload.edit is not None and session_key is not None:
+        session = _sessions.get(session_key)
+        if session is None or (payload.base_length is not None and payload.base_length != len(session.text)):
+            metrics.counter("pii.check.resync").inc()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Unknown or stale PII check session. Please resend the full text.",
+            )
+        edit = payload.edit
+        try:
+            text, matches = apply_edit(session.text, session.matches, edit.start, edit.end, edit.insert)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+        if len(text) > MAX_TEXT_LENGTH:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Comment is too long")
+        metrics.counter("pii.check.incremental").inc()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Provide either text or an edit with a session_key",
+        )
+
+    if session_key is not None:
+        _sessions.put(session_key, text, matches)
+
+    flagged, reasons, blocked = summarize(matches)
+    return {
+        "flagged": flagged,
+        "blocked": blocked,
+        "reasons": reasons,
+        "length": len(text),
+        "spans": [
+            {"category": m.category, "start": m.start, "end": m.end, "blocking": m.blocking} for m in matches
+        ],
+    }
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, stick_to_primary
 from app.models.entities import Area, Building, City, Country, Street
 from app.schemas.places import PlaceCreatePayload, PlaceResolvePayload
 from app.services.text import normalize_name
@@ -11,13 +11,13 @@ router = APIRouter()
 
 
 @router.get("/countries")
-async def countries(db: AsyncSession = Depends(get_db)) -> list[dict]:
+async def countries(db: AsyncSession = Depends(get_read_db)) -> list[dict]:
     rows = (await db.execute(select(Country))).scalars().all()
     return [{"id": c.id, "code": c.code, "name_en": c.name_en, "name_pt": c.name_pt} for c in rows]
 
 
 @router.get("/cities")
-async def cities(country_code: str | None = None, db: AsyncSession = Depends(get_db)) -> list[dict]:
+async def cities(country_code: str | None = None, db: AsyncSession = Depends(get_read_db)) -> list[dict]:
     stmt = select(City)
     if country_code:
         stmt = stmt.join(Country, Country.id == City.country_id).where(Country.code == country_code.upper())
@@ -26,7 +26,7 @@ async def cities(country_code: str | None = None, db: AsyncSession = Depends(get
 
 
 @router.get("/areas")
-async def areas(city_id: int | None = None, db: AsyncSession = Depends(get_db)) -> list[dict]:
+async def areas(city_id: int | None = None, db: AsyncSession = Depends(get_read_db)) -> list[dict]:
     stmt = select(Area)
     if city_id:
         stmt = stmt.where(Area.city_id == city_id)
@@ -35,7 +35,7 @@ async def areas(city_id: int | None = None, db: AsyncSession = Depends(get_db))
 
 
 @router.get("/streets")
-async def streets(area_id: int | None = None, db: AsyncSession = Depends(get_db)) -> list[dict]:
+async def streets(area_id: int | None = None, db: AsyncSession = Depends(get_read_db)) -> list[dict]:
     stmt = select(Street)
     if area_id:
         stmt = stmt.where(Street.area_id == area_id)
@@ -43,7 +43,7 @@ async def streets(area_id: int | None = None, db: AsyncSession = Depends(get_db)
     return [{"id": s.id, "name": s.name} for s in rows]
 
 
-@router.post("/places/create")
+@router.post("/places/create", dependencies=[Depends(stick_to_primary)])
 async def create_place(payload: PlaceCreatePayload, db: AsyncSession = Depends(get_db)) -> dict:
     country = (await db.execute(select(Country).where(Country.code == payload.country_code.upper()))).scalar_one_or_none()
     if not country:
@@ -101,7 +101,7 @@ async def create_place(payload: PlaceCreatePayload, db: AsyncSession = Depends(g
     return {"id": building.id}
 
 
-@router.post("/places/resolve")
+@router.post("/places/resolve", dependencies=[Depends(stick_to_primary)])
 async def resolve_place(payload: PlaceResolvePayload, db: AsyncSession = Depends(get_db)) -> dict:
     """Resolve a street-level geocoded selection into an internal building id.
 
@@ -1,22 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Cookie, Depends, Header, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_admin
-from app.core.database import get_db
+from app.core.database import get_db, stick_to_primary
 from app.models.entities import Report, Review, User
 from app.models.enums import ReportReason
+from app.moderation.reports import (
+    REASON_COLUMNS,
+    decode_triage_cursor,
+    encode_triage_cursor,
+    record_report,
+    resolve_review_reports,
+    triage_query,
+)
 from app.schemas.reviews import ReportPayload
+from app.services.idempotency import caller_identity, run_idempotent
 
 router = APIRouter()
 
 
-@router.post("/reports")
+@router.post("/reports", dependencies=[Depends(stick_to_primary)])
 async def create_report(
     payload: ReportPayload,
     db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
+    fingerprint: str | None = Cookie(default=None, alias="lh_fp"),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
 ) -> dict:
+    async def handler() -> dict:
+        return await _create_report(payload, db, current_user)
+
+    if idempotency_key is None:
+        return await handler()
+    caller = caller_identity(current_user.id if current_user else None, fingerprint)
+    return await run_idempotent("reports", idempotency_key, payload.model_dump(), handler, caller=caller)
+
+
+async def _create_report(payload: ReportPayload, db: AsyncSession, current_user: User | None) -> dict:
     review = (await db.execute(select(Review).where(Review.id == payload.review_id))).scalar_one_or_none()
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
@@ -34,6 +58,7 @@ async def create_report(
         details=payload.details,
     )
     db.add(report)
+    await record_report(db, review.id, reason, datetime.now(UTC))
     await db.commit()
     return {"ok": True, "id": report.id}
 
@@ -51,3 +76,51 @@ async def admin_reports(db: AsyncSession = Depends(get_db), _: User = Depends(re
         }
         for report in reports
     ]
+
+
+@router.get("/admin/reports/triage")
+async def admin_report_triage(
+    state: Literal["open", "resolved"] = "open",
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_admin),
+) -> dict:
+    """Reports grouped per review, most-reported first, with keyset pagination."""
+    try:
+        after = decode_triage_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+    rows = (await db.execute(triage_query(state == "resolved", after, limit + 1))).all()
+    page = rows[:limit]
+    last = page[-1] if page else None
+    return {
+        "items": [
+            {
+                "review_id": row.review_id,
+                "review_status": row.review_status.value,
+                "comment_preview": row.comment_preview,
+                "open_count": row.open_count,
+                "total_count": row.total_count,
+                "reasons": {reason.value: getattr(row, column) for reason, column in REASON_COLUMNS.items()},
+                "first_reported_at": row.first_reported_at.isoformat() if row.first_reported_at else None,
+                "last_reported_at": row.last_reported_at.isoformat(),
+            }
+            for row in page
+        ],
+        "next_cursor": (
+            encode_triage_cursor((last.open_count, last.last_reported_at, last.review_id))
+            if len(rows) > limit
+            else None
+        ),
+    }
+
+
+@router.post("/admin/reports/reviews/{review_id}/resolve", dependencies=[Depends(stick_to_primary)])
+async def resolve_reports(
+    review_id: int, db: AsyncSession = Depends(get_db), admin: User = Depends(require_admin)
+) -> dict:
+    resolved = await resolve_review_reports(db, review_id, admin.id)
+    await db.commit()
+    return {"ok": True, "resolved": resolved}
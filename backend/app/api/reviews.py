@@ -1,22 +1,46 @@
+import asyncio
+import time
 from datetime import timedelta
 
-from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Cookie, Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
-from app.core.database import get_db
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, stick_to_primary
 from app.core.security import hash_token, random_token, utcnow
+from app.jobs import enqueue_review_enrichment
 from app.models.entities import Building, Review, ReviewEditHistory, User
 from app.models.enums import AuthorBadge, AuthorType, EditorType, ReviewStatus
-from app.pii.scanner import scan_pii
-from app.rate_limit.service import RateLimitExceeded, evaluate_rate_limit
+from app.pii.scanner import RULESET_VERSION, SCANNER_CATEGORIES, scan_pii
+from app.rate_limit.service import RateLimitExceeded, RateLimitHit, evaluate_rate_limit
 from app.schemas.reviews import ReviewCreatePayload, ReviewUpdatePayload
 from app.services.captcha import verify_captcha
+from app.services.idempotency import caller_identity, run_idempotent
+from app.services.review_writer import review_writer
 
 router = APIRouter(prefix="/reviews")
 
 
+def _reject_blocked_pii(reasons: list[str]) -> None:
+    blocked_types = [r for r in reasons if r in {"email", "phone", "nif", "citizen_card", "iban"}]
+    hint_map = {
+        "email": "email addresses",
+        "phone": "phone numbers",
+        "nif": "tax identification numbers (NIF)",
+        "citizen_card": "citizen card numbers",
+        "iban": "bank account numbers (IBAN)",
+    }
+    hints = ", ".join(hint_map.get(t, t) for t in blocked_types)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Your review contains personal data that must be removed for privacy: {hints}. "
+        "Please edit your comment and try again.",
+    )
+
+
 def _score(payload: ReviewCreatePayload) -> tuple[float, int]:
     values = [
         payload.people_noise,
@@ -34,7 +58,7 @@ def _score(payload: ReviewCreatePayload) -> tuple[float, int]:
     return overall, round(overall)
 
 
-@router.post("")
+@router.post("", dependencies=[Depends(stick_to_primary)])
 async def create_review(
     payload: ReviewCreatePayload,
     request: Request,
@@ -42,47 +66,84 @@ async def create_review(
     db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_current_user),
     fingerprint: str | None = Cookie(default=None, alias="lh_fp"),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
 ) -> dict:
-    building = (await db.execute(select(Building).where(Building.id == payload.building_id))).scalar_one_or_none()
-    if not building:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Building not found")
+    fp = fingerprint or random_token(16)
+
+    async def handler() -> dict:
+        # The fingerprint travels with the (sealed) stored result so a replay
+        # sets the same lh_fp cookie the rate limiter counted.
+        return {"fingerprint": fp, **await _create_review(payload, request, db, current_user, fp)}
+
+    if idempotency_key is None:
+        result = await handler()
+    else:
+        caller = caller_identity(current_user.id if current_user else None, fingerprint)
+        result = await run_idempotent("reviews", idempotency_key, payload.model_dump(), handler, caller=caller)
 
+    fp = result.pop("fingerprint")
+    if not fingerprint:
+        response.set_cookie(key="lh_fp", value=fp, httponly=True, samesite="lax", max_age=60 * 60 * 24 * 365, path="/")
+    return result
+
+
+async def _create_review(
+    payload: ReviewCreatePayload,
+    request: Request,
+    db: AsyncSession,
+    current_user: User | None,
+    fp: str,
+) -> dict:
+    started = time.perf_counter()
     remote_ip = request.client.host if request.client else "unknown"
-    fp = fingerprint or random_token(16)
-    try:
-        await evaluate_rate_limit(db, ip=remote_ip, fingerprint=fp, building_id=payload.building_id)
-    except RateLimitExceeded as exc:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(exc),
-            headers={"Retry-After": "3600"},
-        ) from exc
-
-    if current_user is None:
-        await verify_captcha(payload.captcha_token, remote_ip)
 
-    flagged, reasons, blocked = scan_pii(payload.comment)
+    async def check_rate_limit(*, record: bool) -> None:
+        try:
+            await evaluate_rate_limit(
+                db, ip=remote_ip, fingerprint=fp, building_id=payload.building_id, record=record
+            )
+        except RateLimitExceeded as exc:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(exc),
+                headers={"Retry-After": "3600"},
+            ) from exc
+
+    async def db_checks() -> None:
+        with metrics.timer("reviews.submit.building_lookup_seconds"):
+            building = (await db.execute(select(Building).where(Building.id == payload.building_id))).scalar_one_or_none()
+        if not building:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Building not found")
+        with metrics.timer("reviews.submit.rate_limit_seconds"):
+            # Read-only and lock-free: the hit is counted (under the key locks)
+            # right before the insert, so other submissions sharing an IP,
+            # fingerprint or building never wait on this request's captcha.
+            await check_rate_limit(record=False)
+
+    async def captcha_check() -> None:
+        if current_user is None:
+            with metrics.timer("reviews.submit.captcha_seconds"):
+                await verify_captcha(payload.captcha_token, remote_ip)
+
+    # Errors keep their order: 404, 429, captcha, then PII. The captcha is only
+    # verified once the DB checks pass, so a 404 or 429 never spends the
+    # one-time token; the PII scan runs while its round trip (up to 8s) is in flight.
+    with metrics.timer("reviews.submit.prechecks_seconds"):
+        await db_checks()
+        captcha = asyncio.create_task(captcha_check())
+        try:
+            with metrics.timer("reviews.submit.pii_scan_seconds"):
+                flagged, reasons, blocked = scan_pii(payload.comment)
+        finally:
+            await captcha
     if blocked:
-        blocked_types = [r for r in reasons if r in {"email", "phone", "nif", "citizen_card", "iban"}]
-        hint_map = {
-            "email": "email addresses",
-            "phone": "phone numbers",
-            "nif": "tax identification numbers (NIF)",
-            "citizen_card": "citizen card numbers",
-            "iban": "bank account numbers (IBAN)",
-        }
-        hints = ", ".join(hint_map.get(t, t) for t in blocked_types)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Your review contains personal data that must be removed for privacy: {hints}. "
-            "Please edit your comment and try again.",
-        )
+        _reject_blocked_pii(reasons)
 
     overall_score, rounded = _score(payload)
     tracking_code = random_token(8)[:12].upper()
     edit_token = random_token(32)
 
-    review = Review(
+    values = dict(
         building_id=payload.building_id,
         author_user_id=current_user.id if current_user else None,
         author_type=AuthorType.USER if current_user else AuthorType.ANONYMOUS,
@@ -110,19 +171,35 @@ async def create_review(
         comment=payload.comment,
         pii_flagged=flagged,
         pii_reasons=reasons,
+        pii_ruleset_version=RULESET_VERSION,
+        created_at=utcnow(),
     )
-    db.add(review)
-    await db.commit()
-    await db.refresh(review)
+    with metrics.timer("reviews.submit.insert_seconds"):
+        if settings.review_group_commit:
+            # Nothing to keep from the read-only checks; free the connection while we
+            # wait. The writer counts the hit in its batch transaction.
+            await db.rollback()
+            review_id = await review_writer.submit(
+                values, RateLimitHit(ip=remote_ip, fingerprint=fp, building_id=payload.building_id)
+            )
+        else:
+            # Locks the rate-limit keys until the commit just below.
+            await check_rate_limit(record=True)
+            review = Review(**values)
+            db.add(review)
+            # Flush assigns the id; the enrichment job commits atomically with the
+            # review. No refresh needed: expire_on_commit is off.
+            await db.flush()
+            enqueue_review_enrichment(db, review.id)
+            await db.commit()
+            review_id = review.id
 
-    if not fingerprint:
-        response.set_cookie(key="lh_fp", value=fp, httponly=True, samesite="lax", max_age=60 * 60 * 24 * 365, path="/")
-
-    return {"id": review.id, "tracking_code": tracking_code, "edit_token": edit_token}
+    metrics.histogram("reviews.submit.total_seconds").observe(time.perf_counter() - started)
+    return {"id": review_id, "tracking_code": tracking_code, "edit_token": edit_token}
 
 
 @router.get("/{review_id}")
-async def get_review(review_id: int, db: AsyncSession = Depends(get_db), current_user: User | None = Depends(get_current_user)) -> dict:
+async def get_review(review_id: int, db: AsyncSession = Depends(get_read_db), current_user: User | None = Depends(get_current_user)) -> dict:
     review = (await db.execute(select(Review).where(Review.id == review_id))).scalar_one_or_none()
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
@@ -139,7 +216,7 @@ async def get_review(review_id: int, db: AsyncSession = Depends(get_db), current
     }
 
 
-@router.put("/{review_id}")
+@router.put("/{review_id}", dependencies=[Depends(stick_to_primary)])
 async def update_review(
     review_id: int,
     payload: ReviewUpdatePayload,
@@ -160,10 +237,20 @@ async def update_review(
     if not allowed:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You cannot edit this review")
 
+    flagged, reasons, blocked = scan_pii(payload.comment)
+    if blocked:
+        _reject_blocked_pii(reasons)
+    # Reasons added outside the scanner (e.g. near_duplicate) are kept.
+    extra = [reason for reason in review.pii_reasons or [] if reason not in SCANNER_CATEGORIES]
+    reasons += [reason for reason in extra if reason not in reasons]
+
     before = {"comment": review.comment, "status": review.status.value}
     review.comment = payload.comment
     review.status = ReviewStatus.PENDING
     review.moderation_message = None
+    review.pii_flagged = flagged or bool(extra)
+    review.pii_reasons = reasons
+    review.pii_ruleset_version = RULESET_VERSION
     after = {"comment": review.comment, "status": review.status.value}
     db.add(ReviewEditHistory(review_id=review.id, before_json=before, after_json=after, editor_type=editor))
     await db.commit()
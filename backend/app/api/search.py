@@ -1,12 +1,13 @@
 import logging
 import re
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import String, and_, case, cast, desc, func, or_, select
+from sqlalchemy import ARRAY, Integer, Select, String, all_, and_, any_, bindparam, cast, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.entities import Area, Building, City, Review, Street, StreetSegment
 from app.models.enums import AuthorBadge, ReviewStatus
 from app.services.text import normalize_name
@@ -30,17 +31,10 @@ async def _ai_correct_query(q: str) -> str | None:
     if cache_key in _correction_cache:
         return _correction_cache[cache_key]
 
-    from app.services.gemini import generate_text
+    from app.services.query_correction import correction_batcher
 
-    corrected = await generate_text(
-        prompt=(
-            "Fix this Portuguese address search. Add missing prepositions "
-            "(de, do, da, dos, das), articles, or fix typos. "
-            "Return ONLY the corrected text, nothing else.\n\n" + q
-        ),
-        max_tokens=60,
-        temperature=0.0,
-    )
+    # Concurrent zero-result searches share one batched Gemini call.
+    corrected = await correction_batcher.correct(q, key=cache_key)
 
     # Manage cache size
     if len(_correction_cache) >= _CACHE_MAX:
@@ -50,13 +44,15 @@ async def _ai_correct_query(q: str) -> str | None:
     return corrected
 
 
-async def _run_search(
-    q: str,
-    sort: str,
-    verified_only: bool,
-    db: AsyncSession,
-) -> list[dict]:
-    """Core search logic — reusable for AI-corrected re-queries."""
+@lru_cache(maxsize=None)
+def _search_statement(has_query: bool, sort: str, verified_only: bool) -> Select:
+    """Build the search statement for one shape; every value is a bind parameter.
+
+    Query tokens are passed as arrays (``LIKE ANY``/``LIKE ALL``/``unnest``)
+    rather than one clause per token, so there are only eight distinct SQL
+    strings: each is compiled once by SQLAlchemy and prepared once per
+    connection by asyncpg.
+    """
     review_agg = (
         select(
             Review.building_id.label("building_id"),
@@ -91,59 +87,43 @@ async def _run_search(
 
     relevance_score = None
 
-    if q:
-        q_norm = normalize_name(q)
-        tokens = [t for t in q_norm.split() if len(t) >= 2 and not t.isdigit()]
-        numbers = [int(n) for n in re.findall(r"\d+", q_norm)[:3]]
-        term = f"%{q_norm}%"
+    if has_query:
+        raw_like = bindparam("raw_like", type_=String)
+        term = bindparam("term", type_=String)
+        numbers = bindparam("numbers", type_=ARRAY(Integer))
+        token_patterns = bindparam("token_patterns", type_=ARRAY(String))
+        loose_patterns = bindparam("loose_patterns", type_=ARRAY(String))
+        concat_field = func.concat(
+            Street.normalized_name, ' ',
+            Area.normalized_name, ' ',
+            City.normalized_name,
+        )
 
         matchers = [
-            func.lower(Street.name).like(f"%{q.lower()}%"),
-            func.lower(Area.name).like(f"%{q.lower()}%"),
-            func.lower(City.name).like(f"%{q.lower()}%"),
-            cast(Building.street_number, String).like(f"%{q_norm}%"),
+            func.lower(Street.name).like(raw_like),
+            func.lower(Area.name).like(raw_like),
+            func.lower(City.name).like(raw_like),
+            cast(Building.street_number, String).like(term),
             Street.normalized_name.like(term),
             Area.normalized_name.like(term),
             City.normalized_name.like(term),
+            # If the user includes a street number (e.g. "... 100"), match it directly.
+            Building.street_number == any_(numbers),
+            # Loose matching: any token (or typo-tolerant prefix) can match any normalized field.
+            Street.normalized_name.like(any_(loose_patterns)),
+            Area.normalized_name.like(any_(loose_patterns)),
+            City.normalized_name.like(any_(loose_patterns)),
+            # Cross-field AND: ALL tokens must appear in combined street+area+city
+            and_(func.cardinality(token_patterns) > 0, concat_field.like(all_(token_patterns))),
         ]
-
-        # If the user includes a street number (e.g. "... 100"), match it directly.
-        for n in numbers:
-            matchers.append(Building.street_number == n)
-
-        # Loose matching: any token can match any normalized field.
-        for tok in tokens:
-            like_tok = f"%{tok}%"
-            matchers.append(Street.normalized_name.like(like_tok))
-            matchers.append(Area.normalized_name.like(like_tok))
-            matchers.append(City.normalized_name.like(like_tok))
-
-            # Conservative typo tolerance: for longer tokens, also match by prefix.
-            # Example: "republca" still matches streets containing "repub".
-            if len(tok) >= 5:
-                prefix = tok[:4]
-                like_prefix = f"%{prefix}%"
-                matchers.append(Street.normalized_name.like(like_prefix))
-                matchers.append(Area.normalized_name.like(like_prefix))
-                matchers.append(City.normalized_name.like(like_prefix))
-
-        # Cross-field AND: ALL tokens must appear in combined street+area+city
-        if tokens:
-            concat_field = func.concat(
-                Street.normalized_name, ' ',
-                Area.normalized_name, ' ',
-                City.normalized_name,
-            )
-            matchers.append(and_(*[concat_field.like(f"%{tok}%") for tok in tokens]))
-
-            # Relevance score: prioritise results matching more query tokens
-            _tcases = [case((concat_field.like(f"%{tok}%"), 1), else_=0) for tok in tokens]
-            relevance_score = _tcases[0]
-            for _tc in _tcases[1:]:
-                relevance_score = relevance_score + _tc
-
         stmt = stmt.where(or_(*matchers))
 
+        # Relevance score: prioritise results matching more query tokens
+        pattern = func.unnest(token_patterns).table_valued("pattern").render_derived()
+        relevance_score = (
+            select(func.count()).select_from(pattern).where(concat_field.like(pattern.c.pattern)).scalar_subquery()
+        )
+
     # When verified_only is enabled, keep previous behavior: only show addresses with verified reviews.
     if verified_only:
         stmt = stmt.where(func.coalesce(review_agg_sq.c.review_count, 0) > 0)
@@ -157,9 +137,37 @@ async def _run_search(
         # default "recency"
         order_clauses.append(desc(review_agg_sq.c.last_review_at).nullslast())
         order_clauses.append(desc(func.coalesce(review_agg_sq.c.review_count, 0)))
-    stmt = stmt.order_by(*order_clauses)
+    return stmt.order_by(*order_clauses).limit(100)
+
 
-    rows = (await db.execute(stmt.limit(100))).all()
+def search_params(q: str) -> dict:
+    """Bind values for ``_search_statement(has_query=True, ...)``."""
+    q_norm = normalize_name(q)
+    tokens = [t for t in q_norm.split() if len(t) >= 2 and not t.isdigit()]
+    token_patterns = [f"%{tok}%" for tok in tokens]
+    # Conservative typo tolerance: for longer tokens, also match by prefix.
+    # Example: "republca" still matches streets containing "repub".
+    prefix_patterns = [f"%{tok[:4]}%" for tok in tokens if len(tok) >= 5]
+    return {
+        "raw_like": f"%{q.lower()}%",
+        "term": f"%{q_norm}%",
+        "numbers": [int(n) for n in re.findall(r"\d+", q_norm)[:3]],
+        "token_patterns": token_patterns,
+        "loose_patterns": token_patterns + prefix_patterns,
+    }
+
+
+async def _run_search(
+    q: str,
+    sort: str,
+    verified_only: bool,
+    db: AsyncSession,
+) -> list[dict]:
+    """Core search logic — reusable for AI-corrected re-queries."""
+    stmt = _search_statement(bool(q), "top" if sort == "top" else "recency", verified_only)
+    params = search_params(q) if q else {}
+
+    rows = (await db.execute(stmt, params)).all()
     results: list[dict] = []
     for building, street, area, city, seg_start, seg_end, review_count, avg_score, _last_review_at in rows:
         count = int(review_count or 0)
@@ -187,7 +195,7 @@ async def search(
     q: str = Query(default="", min_length=0),
     sort: str = Query(default="recency"),
     verified_only: bool = False,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     """Search buildings with AI-powered query correction fallback."""
     results = await _run_search(q, sort, verified_only, db)
@@ -204,26 +212,28 @@ async def search(
     return {"results": results, "corrected_query": corrected_query}
 
 
+_BUILDING_DETAIL = (
+    select(Building, Street, Area, City, StreetSegment.start_number, StreetSegment.end_number)
+    .join(Street, Building.street_id == Street.id)
+    .join(Area, Street.area_id == Area.id)
+    .join(City, Area.city_id == City.id)
+    .outerjoin(StreetSegment, Building.segment_id == StreetSegment.id)
+    .where(Building.id == bindparam("building_id"))
+)
+_BUILDING_REVIEWS = select(Review).where(
+    Review.building_id == bindparam("building_id"), Review.status == ReviewStatus.APPROVED
+)
+
+
 @router.get("/buildings/{building_id}")
-async def building_detail(building_id: int, db: AsyncSession = Depends(get_db)) -> dict:
-    row = (
-        await db.execute(
-            select(Building, Street, Area, City, StreetSegment.start_number, StreetSegment.end_number)
-            .join(Street, Building.street_id == Street.id)
-            .join(Area, Street.area_id == Area.id)
-            .join(City, Area.city_id == City.id)
-            .outerjoin(StreetSegment, Building.segment_id == StreetSegment.id)
-            .where(Building.id == building_id)
-        )
-    ).one_or_none()
+async def building_detail(building_id: int, db: AsyncSession = Depends(get_read_db)) -> dict:
+    row = (await db.execute(_BUILDING_DETAIL, {"building_id": building_id})).one_or_none()
     building: Building | None = row[0] if row else None
     if not building:
         return {"error": "Not found"}
 
     _building, street, area, city, seg_start, seg_end = row
-    reviews = (
-        await db.execute(select(Review).where(Review.building_id == building_id, Review.status == ReviewStatus.APPROVED))
-    ).scalars().all()
+    reviews = (await db.execute(_BUILDING_REVIEWS, {"building_id": building_id})).scalars().all()
     return {
         "id": building.id,
         "street": street.name,
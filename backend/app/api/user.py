@@ -1,9 +1,11 @@
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_user
+from app.auth.session_cache import session_cache
 from app.core.database import get_db
 from app.models.entities import User
 from app.models.enums import UserRole
@@ -24,6 +26,7 @@ async def delete_me(db: AsyncSession = Depends(get_db), current_user: User = Dep
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin accounts are managed by environment variables and cannot be self-deleted",
         )
-    current_user.deleted_at = datetime.now(UTC)
+    await db.execute(update(User).where(User.id == current_user.id).values(deleted_at=datetime.now(UTC)))
     await db.commit()
+    session_cache.invalidate_user(current_user.id)
     return {"ok": True}
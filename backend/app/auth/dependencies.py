@@ -1,14 +1,27 @@
 from fastapi import Cookie, Depends, HTTPException, status
 from jose import JWTError
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.auth.session_cache import session_cache
 from app.core.database import get_db
 from app.core.security import decode_jwt, hash_token, utcnow
 from app.models.entities import Session, User
 from app.models.enums import UserRole
 
+# Built once: every request runs this, so only the bind values change.
+_SESSION_USER = (
+    select(User, Session.expires_at)
+    .join(Session, Session.user_id == User.id)
+    .where(
+        Session.token_hash == bindparam("token_hash"),
+        Session.expires_at > bindparam("now"),
+        User.id == bindparam("user_id"),
+        User.deleted_at.is_(None),
+    )
+)
+
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
@@ -30,15 +43,22 @@ async def get_current_user(
     except ValueError:
         return None
 
-    stmt = select(Session).where(Session.token_hash == token_hash, Session.expires_at > utcnow())
-    session_obj = (await db.execute(stmt)).scalar_one_or_none()
-    if not session_obj:
-        return None
-    if session_obj.user_id != user_uuid:
-        return None
+    cached = session_cache.get(token_hash)
+    if cached is not None:
+        if cached.user_id != user_uuid:
+            return None
+        # Transient: not attached to ``db``. Handlers that change the user
+        # write with explicit UPDATE statements.
+        return User(id=cached.user_id, email=cached.email, role=cached.role)
 
-    user_stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
-    return (await db.execute(user_stmt)).scalar_one_or_none()
+    row = (
+        await db.execute(_SESSION_USER, {"token_hash": token_hash, "now": utcnow(), "user_id": user_uuid})
+    ).one_or_none()
+    if row is None:
+        return None
+    user, expires_at = row
+    session_cache.put(token_hash, user.id, user.email, user.role, expires_at)
+    return user
 
 
 async def require_user(current_user: User | None = Depends(get_current_user)) -> User:
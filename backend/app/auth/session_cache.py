@@ -0,0 +1,89 @@
+"""Per-process cache of validated sessions for ``get_current_user``.
+
+Entries are keyed by the session token hash and hold just what request
+handlers read from the user, so a cookie seen within the TTL costs no query.
+Logout, account deletion and role changes invalidate entries in this
+process; other workers see the change once their entry ages out, which is
+what keeps the TTL short.  An invalidation also leaves a tombstone for one
+TTL, so a request that read the session row just before it cannot cache the
+revoked session again.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import utcnow
+from app.models.enums import UserRole
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    user_id: uuid.UUID
+    email: str
+    role: UserRole
+    expires_at: datetime
+    cached_at: float
+
+
+class SessionCache:
+    def __init__(self, max_entries: int = 10_000, ttl: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedSession] = OrderedDict()
+        # Invalidated token hashes / user ids -> monotonic time of invalidation.
+        self._revoked: dict[str | uuid.UUID, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token_hash: str) -> CachedSession | None:
+        entry = self._entries.get(token_hash)
+        if entry is not None and (time.monotonic() - entry.cached_at > self.ttl or entry.expires_at <= utcnow()):
+            del self._entries[token_hash]
+            entry = None
+        metrics.counter("auth.session_cache.hit" if entry else "auth.session_cache.miss").inc()
+        if entry is not None:
+            self._entries.move_to_end(token_hash)
+        return entry
+
+    def put(self, token_hash: str, user_id: uuid.UUID, email: str, role: UserRole, expires_at: datetime) -> None:
+        if self.ttl <= 0 or self._is_revoked(token_hash) or self._is_revoked(user_id):
+            return
+        self._entries[token_hash] = CachedSession(user_id, email, role, expires_at, time.monotonic())
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token_hash: str) -> None:
+        self._entries.pop(token_hash, None)
+        self._revoke(token_hash)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        for token_hash in [key for key, entry in self._entries.items() if entry.user_id == user_id]:
+            del self._entries[token_hash]
+        self._revoke(user_id)
+
+    def _revoke(self, key: str | uuid.UUID) -> None:
+        now = time.monotonic()
+        # Insertion order is time order: drop tombstones older than one TTL.
+        while self._revoked:
+            oldest, revoked_at = next(iter(self._revoked.items()))
+            if now - revoked_at <= self.ttl:
+                break
+            del self._revoked[oldest]
+        self._revoked.pop(key, None)
+        self._revoked[key] = now
+
+    def _is_revoked(self, key: str | uuid.UUID) -> bool:
+        revoked_at = self._revoked.get(key)
+        return revoked_at is not None and time.monotonic() - revoked_at <= self.ttl
+
+
+session_cache = SessionCache(max_entries=settings.session_cache_max_entries, ttl=settings.session_cache_ttl_seconds)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,10 +13,24 @@ class Settings(BaseSettings):
     app_url: str = Field(default="http://localhost:80", alias="APP_URL")
 
     database_url: str = Field(alias="DATABASE_URL")
+    database_read_url: str | None = Field(default=None, alias="DATABASE_READ_URL")
+    read_your_writes_seconds: int = Field(default=10, alias="READ_YOUR_WRITES_SECONDS")
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(default=1800, alias="DB_POOL_RECYCLE_SECONDS")
+    # "pre_ping": SELECT 1 on every checkout; "background": ping idle connections periodically.
+    db_pool_liveness: Literal["pre_ping", "background"] = Field(default="pre_ping", alias="DB_POOL_LIVENESS")
+    db_pool_ping_interval_seconds: float = Field(default=60.0, alias="DB_POOL_PING_INTERVAL_SECONDS")
+    # SQLAlchemy compiled-SQL cache entries per engine / asyncpg prepared statements per connection.
+    db_compiled_cache_size: int = Field(default=500, alias="DB_COMPILED_CACHE_SIZE")
+    db_prepared_statement_cache_size: int = Field(default=100, alias="DB_PREPARED_STATEMENT_CACHE_SIZE")
 
     jwt_secret: str = Field(default="replace_me_with_a_long_secret", alias="JWT_SECRET")
     jwt_algorithm: str = "HS256"
     session_ttl_minutes: int = 60 * 24 * 7
+    session_cache_ttl_seconds: float = Field(default=30.0, alias="SESSION_CACHE_TTL_SECONDS")
+    session_cache_max_entries: int = Field(default=10000, alias="SESSION_CACHE_MAX_ENTRIES")
 
     send_real_email: bool = Field(default=False, alias="SEND_REAL_EMAIL")
     email_host: str = Field(default="", alias="EMAIL_HOST")
@@ -22,6 +38,10 @@ class Settings(BaseSettings):
     email_user: str = Field(default="", alias="EMAIL_USER")
     email_pass: str = Field(default="", alias="EMAIL_PASS")
     email_from: str = Field(default="noreply@livedhere.local", alias="EMAIL_FROM")
+    email_outbox_batch_size: int = Field(default=20, alias="EMAIL_OUTBOX_BATCH_SIZE")
+    email_outbox_poll_seconds: float = Field(default=5.0, alias="EMAIL_OUTBOX_POLL_SECONDS")
+    email_smtp_idle_seconds: float = Field(default=120.0, alias="EMAIL_SMTP_IDLE_SECONDS")
+    magic_link_dedupe_seconds: int = Field(default=60, alias="MAGIC_LINK_DEDUPE_SECONDS")
 
     admin_emails_raw: str = Field(default="admin@example.com", alias="ADMIN_EMAILS")
     admin_email_legacy: str = Field(default="", alias="ADMIN_EMAIL")
@@ -31,7 +51,45 @@ class Settings(BaseSettings):
 
     cors_origins: str = Field(default="http://localhost:80", alias="CORS_ORIGINS")
 
+    rate_limit_window_hours: int = Field(default=24, alias="RATE_LIMIT_WINDOW_HOURS")
+    rate_limit_ip_max: int | None = Field(default=None, alias="RATE_LIMIT_IP_MAX")
+    rate_limit_building_max: int | None = Field(default=None, alias="RATE_LIMIT_BUILDING_MAX")
+    rate_limit_fp_max: int | None = Field(default=None, alias="RATE_LIMIT_FP_MAX")
+
+    # "memory" (per worker) or "database" (shared, one primary write per limited request).
+    rate_limit_backend: str = Field(default="memory", alias="RATE_LIMIT_BACKEND")
+    rate_limit_search_per_minute: int = Field(default=60, alias="RATE_LIMIT_SEARCH_PER_MINUTE")
+    rate_limit_map_per_minute: int = Field(default=20, alias="RATE_LIMIT_MAP_PER_MINUTE")
+    rate_limit_geocode_per_minute: int = Field(default=20, alias="RATE_LIMIT_GEOCODE_PER_MINUTE")
+    rate_limit_assistant_per_hour: int = Field(default=30, alias="RATE_LIMIT_ASSISTANT_PER_HOUR")
+    rate_limit_pii_check_per_minute: int = Field(default=120, alias="RATE_LIMIT_PII_CHECK_PER_MINUTE")
+    pii_check_max_sessions: int = Field(default=10000, alias="PII_CHECK_MAX_SESSIONS")
+
+    maintenance_enabled: bool = Field(default=True, alias="MAINTENANCE_ENABLED")
+    maintenance_interval_minutes: int = Field(default=60, alias="MAINTENANCE_INTERVAL_MINUTES")
+    maintenance_batch_size: int = Field(default=5000, alias="MAINTENANCE_BATCH_SIZE")
+    rate_limit_event_retention_days: int = Field(default=30, alias="RATE_LIMIT_EVENT_RETENTION_DAYS")
+
+    review_group_commit: bool = Field(default=False, alias="REVIEW_GROUP_COMMIT")
+    review_group_commit_window_ms: int = Field(default=5, alias="REVIEW_GROUP_COMMIT_WINDOW_MS")
+    review_group_commit_max_batch: int = Field(default=64, alias="REVIEW_GROUP_COMMIT_MAX_BATCH")
+
+    job_workers: int = Field(default=2, alias="JOB_WORKERS")
+    job_poll_interval_seconds: float = Field(default=1.0, alias="JOB_POLL_INTERVAL_SECONDS")
+    # Idle workers double their poll interval up to this; an enqueue in the same process wakes them at once.
+    job_idle_poll_max_seconds: float = Field(default=30.0, alias="JOB_IDLE_POLL_MAX_SECONDS")
+    failed_job_retention_days: int = Field(default=30, alias="FAILED_JOB_RETENTION_DAYS")
+
+    moderation_lease_seconds: int = Field(default=600, alias="MODERATION_LEASE_SECONDS")
+
+    near_duplicate_detection: bool = Field(default=True, alias="NEAR_DUPLICATE_DETECTION")
+    near_duplicate_threshold: float = Field(default=0.8, alias="NEAR_DUPLICATE_THRESHOLD")
+
     gemini_api_key: str = Field(default="", alias="GEMINI_API_KEY")
+    gemini_assistant_concurrency: int = Field(default=8, alias="GEMINI_ASSISTANT_CONCURRENCY")
+    gemini_search_concurrency: int = Field(default=4, alias="GEMINI_SEARCH_CONCURRENCY")
+    search_correction_batch_window_ms: int = Field(default=50, alias="SEARCH_CORRECTION_BATCH_WINDOW_MS")
+    search_correction_batch_max: int = Field(default=8, alias="SEARCH_CORRECTION_BATCH_MAX")
 
     @property
     def admin_emails(self) -> set[str]:
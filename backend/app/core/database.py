@@ -1,19 +1,79 @@
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.pool import InstrumentedPool, register_pool_gauges
+from app.core.statement_cache import track_compile_cache
+
+# Set for READ_YOUR_WRITES_SECONDS after a successful write so the client's
+# next reads see it even while the replica lags.
+PRIMARY_STICKY_COOKIE = "lh_primary"
+_STICKY_STATE = "stick_to_primary"
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+def engine_options() -> dict:
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_liveness == "pre_ping",
+        "query_cache_size": settings.db_compiled_cache_size,
+        "connect_args": {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size},
+    }
+
+
+engine = create_async_engine(settings.database_url, **engine_options())
+register_pool_gauges("primary", engine)
+track_compile_cache("primary", engine)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Without DATABASE_READ_URL, reads simply share the primary engine.
+read_engine = engine
+if settings.database_read_url:
+    read_engine = create_async_engine(settings.database_read_url, **engine_options())
+    register_pool_gauges("replica", read_engine)
+    track_compile_cache("replica", read_engine)
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def has_read_replica() -> bool:
+    return read_engine is not engine
+
+
+def stick_to_primary(request: Request) -> None:
+    """Route dependency for writes that later public reads must observe.
+
+    Only these routes set ``PRIMARY_STICKY_COOKIE``; other POSTs (PII checks,
+    the assistant, magic links) leave the client's reads on the replica.
+    """
+    setattr(request.state, _STICKY_STATE, True)
+
+
+def wants_primary_stickiness(request: Request) -> bool:
+    return getattr(request.state, _STICKY_STATE, False)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers: the replica, unless the client just wrote."""
+    factory = ReadSessionLocal
+    if has_read_replica():
+        if request.cookies.get(PRIMARY_STICKY_COOKIE):
+            factory = AsyncSessionLocal
+        metrics.counter("db.reads.primary" if factory is AsyncSessionLocal else "db.reads.replica").inc()
+    async with factory() as session:
+        yield session
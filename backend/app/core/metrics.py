@@ -0,0 +1,110 @@
+"""Minimal in-process metrics registry.
+
+Counters, gauges and fixed-bucket histograms are kept per worker and
+exposed as a JSON snapshot through ``GET /admin/metrics``.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing the ``q`` quantile (``inf`` past the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {str(bound): n for bound, n in zip((*self.buckets, "+Inf"), self.counts, strict=True)},
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class Gauge:
+    """A value read from a callback at snapshot time."""
+
+    def __init__(self, read: Callable[[], float | int | None]) -> None:
+        self.read = read
+
+    def snapshot(self) -> float | int | None:
+        try:
+            return self.read()
+        except Exception:
+            return None
+
+
+_registry: dict[str, Counter | Histogram | Gauge] = {}
+
+
+def counter(name: str) -> Counter:
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = Counter()
+    assert isinstance(metric, Counter)
+    return metric
+
+
+def histogram(name: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = Histogram(buckets)
+    assert isinstance(metric, Histogram)
+    return metric
+
+
+def gauge(name: str, read: Callable[[], float | int | None]) -> Gauge:
+    metric = _registry[name] = Gauge(read)
+    return metric
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Observe the wall-clock duration of the block into histogram ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram(name).observe(time.perf_counter() - started)
+
+
+def snapshot() -> dict:
+    return {name: metric.snapshot() for name, metric in sorted(_registry.items())}
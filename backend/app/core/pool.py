@@ -0,0 +1,82 @@
+"""Connection pool instrumentation and background liveness checks.
+
+``InstrumentedPool`` records how long each checkout waited for a connection
+(including connecting a new one), and ``register_pool_gauges`` exports pool
+occupancy through ``app.core.metrics``.
+
+With ``DB_POOL_LIVENESS=background`` the engines are created without
+``pool_pre_ping``: instead of a ``SELECT 1`` round trip on every checkout,
+``pool_keepalive_loop`` periodically cycles through the idle connections and
+pings each one.  The pool is FIFO, so checking out as many connections as are
+idle touches every one of them once.  A dead connection is invalidated by
+SQLAlchemy when its ping fails and replaced on the next checkout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Set per engine after creation, e.g. "primary" or "replica".
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.histogram(f"db.pool.{self.metrics_name}.wait_seconds", WAIT_BUCKETS).observe(
+                time.perf_counter() - started
+            )
+
+
+def register_pool_gauges(name: str, engine: AsyncEngine) -> None:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPool):
+        pool.metrics_name = name
+    metrics.gauge(f"db.pool.{name}.size", pool.size)
+    metrics.gauge(f"db.pool.{name}.checked_out", pool.checkedout)
+    metrics.gauge(f"db.pool.{name}.idle", pool.checkedin)
+    # QueuePool counts overflow from -pool_size; negative means spare capacity.
+    metrics.gauge(f"db.pool.{name}.overflow", lambda: max(0, pool.overflow()))
+
+
+async def ping_idle_connections(engine: AsyncEngine) -> int:
+    """Ping every currently idle connection once; returns how many failed."""
+    failed = 0
+    for _ in range(engine.pool.checkedin()):
+        # Connections checked out meanwhile are in use, hence alive.
+        if engine.pool.checkedin() == 0:
+            break
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+        except Exception:
+            failed += 1
+            logger.info("Idle connection ping failed; connection discarded", exc_info=True)
+    metrics.counter("db.pool.ping_failures").inc(failed)
+    return failed
+
+
+async def pool_keepalive_loop(engines: list[AsyncEngine], interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        for engine in engines:
+            try:
+                await ping_idle_connections(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Pool keepalive iteration failed", exc_info=True)
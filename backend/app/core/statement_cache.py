@@ -0,0 +1,35 @@
+"""Compiled-statement cache instrumentation.
+
+SQLAlchemy caches the compiled SQL of a statement under its cache key, and
+asyncpg prepares each distinct SQL string once per connection.  Both only
+help when hot paths produce a small, fixed set of SQL strings, so the query
+builders bind every value (arrays included) instead of inlining literals.
+``track_compile_cache`` counts per engine how often execution found the
+compiled form in the cache; a steadily growing ``miss`` count points at a
+statement whose shape still depends on its input.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import metrics
+
+
+def record_cache_outcome(name: str, context) -> None:
+    outcome = getattr(context, "cache_hit", None)
+    if outcome is CACHE_HIT:
+        metrics.counter(f"db.compile_cache.{name}.hit").inc()
+    elif outcome is CACHE_MISS:
+        metrics.counter(f"db.compile_cache.{name}.miss").inc()
+    else:
+        # Driver-level SQL, statements without a cache key, or caching disabled.
+        metrics.counter(f"db.compile_cache.{name}.uncached").inc()
+
+
+def track_compile_cache(name: str, engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        record_cache_outcome(name, context)
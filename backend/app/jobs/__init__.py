@@ -0,0 +1,4 @@
+from app.jobs.queue import enqueue, register, worker_loop
+from app.jobs.review_enrichment import enqueue_review_enrichment, review_enricher
+
+__all__ = ["enqueue", "register", "worker_loop", "enqueue_review_enrichment", "review_enricher"]
@@ -0,0 +1,187 @@
+"""Durable in-process job queue backed by the ``jobs`` table.
+
+Jobs are enqueued in the caller's transaction, so they exist if and only if
+the work that produced them was committed.  Each API worker runs a small
+pool of coroutines that claim due jobs with ``FOR UPDATE SKIP LOCKED``, run
+the registered handler in a fresh session, and retry failures with
+exponential backoff until ``max_attempts`` is reached.
+
+Idle workers back off from ``JOB_POLL_INTERVAL_SECONDS`` to
+``JOB_IDLE_POLL_MAX_SECONDS`` so an empty queue costs a few queries a minute
+per worker.  Committing a session that enqueued a job wakes this process's
+workers immediately; other processes pick it up within their current interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.database import AsyncSessionLocal
+from app.models.entities import Job
+from app.models.enums import JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, dict], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+# One event per idle worker coroutine; set by ``wake_workers``.
+_idle_workers: set[asyncio.Event] = set()
+_WAKE_ON_COMMIT = "jobs.wake_on_commit"
+
+# A job left RUNNING this long belongs to a worker that died mid-run.
+STALE_AFTER = timedelta(minutes=10)
+
+# Stale jobs are retried like failures; one that has used up its attempts
+# (e.g. it kills its worker every time) is marked FAILED instead of retried
+# forever.
+_CLAIM = text(
+    """
+    WITH exhausted AS (
+      UPDATE jobs
+      SET status = 'FAILED', locked_at = NULL, run_after = now(),
+          last_error = 'Worker stopped while running the last attempt'
+      WHERE status = 'RUNNING'
+        AND locked_at < now() - make_interval(secs => :stale_seconds)
+        AND attempts >= max_attempts
+    )
+    UPDATE jobs
+    SET status = 'RUNNING', attempts = attempts + 1, locked_at = now()
+    WHERE id = (
+      SELECT id FROM jobs
+      WHERE (status = 'QUEUED' AND run_after <= now())
+         OR (
+           status = 'RUNNING'
+           AND locked_at < now() - make_interval(secs => :stale_seconds)
+           AND attempts < max_attempts
+         )
+      ORDER BY run_after
+      LIMIT 1
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, max_attempts
+    """
+)
+
+
+def register(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+
+    return decorator
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, *, max_attempts: int = 5, delay: float = 0.0) -> Job:
+    """Add a job to the current transaction; it becomes visible on commit."""
+    job = Job(
+        kind=kind,
+        payload=payload,
+        max_attempts=max_attempts,
+        run_after=datetime.now(UTC) + timedelta(seconds=delay),
+    )
+    db.add(job)
+    session = db.sync_session
+    if not session.info.get(_WAKE_ON_COMMIT):
+        session.info[_WAKE_ON_COMMIT] = True
+        event.listen(session, "after_commit", _wake_after_commit, once=True)
+    return job
+
+
+def _wake_after_commit(session) -> None:
+    session.info.pop(_WAKE_ON_COMMIT, None)
+    wake_workers()
+
+
+def wake_workers() -> None:
+    """Make this process's idle workers poll now."""
+    for idle in _idle_workers:
+        idle.set()
+
+
+def next_poll_interval(current: float, base: float, maximum: float) -> float:
+    return min(maximum, max(base, current * 2))
+
+
+def backoff_seconds(attempts: int, base: float = 5.0, cap: float = 3600.0) -> float:
+    return min(cap, base * (2 ** max(0, attempts - 1)))
+
+
+async def run_one() -> bool:
+    """Claim and run one due job.  Returns ``False`` when the queue is idle."""
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(_CLAIM, {"stale_seconds": STALE_AFTER.total_seconds()})).one_or_none()
+        await db.commit()
+    if row is None:
+        return False
+
+    handler = _handlers.get(row.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind {row.kind!r}")
+        with metrics.timer(f"jobs.{row.kind}.seconds"):
+            async with AsyncSessionLocal() as db:
+                await handler(db, row.payload or {})
+                await db.commit()
+    except Exception as exc:
+        logger.warning("Job %s (%s) attempt %s failed", row.id, row.kind, row.attempts, exc_info=True)
+        metrics.counter(f"jobs.{row.kind}.failures").inc()
+        final = row.attempts >= row.max_attempts
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text(
+                    "UPDATE jobs SET status = :status, last_error = :error, locked_at = NULL, "
+                    "run_after = now() + make_interval(secs => :delay) WHERE id = :id"
+                ),
+                {
+                    "id": row.id,
+                    "status": JobStatus.FAILED.value if final else JobStatus.QUEUED.value,
+                    "error": repr(exc)[:2000],
+                    "delay": backoff_seconds(row.attempts),
+                },
+            )
+            await db.commit()
+        return True
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text("UPDATE jobs SET status = 'DONE', locked_at = NULL, finished_at = now() WHERE id = :id"),
+            {"id": row.id},
+        )
+        await db.commit()
+    return True
+
+
+async def worker_loop(poll_interval: float, max_poll_interval: float | None = None) -> None:
+    max_poll_interval = max(poll_interval, max_poll_interval or poll_interval)
+    idle = asyncio.Event()
+    _idle_workers.add(idle)
+    delay = poll_interval
+    try:
+        while True:
+            try:
+                busy = await run_one()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Job worker iteration failed", exc_info=True)
+                busy = False
+            if busy:
+                delay = poll_interval
+                continue
+            try:
+                await asyncio.wait_for(idle.wait(), timeout=delay)
+                delay = poll_interval
+            except TimeoutError:
+                delay = next_poll_interval(delay, poll_interval, max_poll_interval)
+            idle.clear()
+    finally:
+        _idle_workers.discard(idle)
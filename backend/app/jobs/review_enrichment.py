@@ -0,0 +1,40 @@
+"""Post-commit enrichment of newly submitted reviews.
+
+Checks that are too slow for the submit request (LLM moderation, duplicate
+detection, notifications, ...) register themselves as enrichers and run in
+a ``review.enrich`` job against the committed ``Review`` row.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.queue import enqueue, register
+from app.models.entities import Review
+
+ReviewEnricher = Callable[[AsyncSession, Review], Awaitable[None]]
+
+_enrichers: list[ReviewEnricher] = []
+
+
+def review_enricher(func: ReviewEnricher) -> ReviewEnricher:
+    _enrichers.append(func)
+    return func
+
+
+def enqueue_review_enrichment(db: AsyncSession, review_id: int) -> None:
+    # Skip the extra insert entirely while no enrichers are registered.
+    if _enrichers:
+        enqueue(db, "review.enrich", {"review_id": review_id})
+
+
+@register("review.enrich")
+async def enrich_review(db: AsyncSession, payload: dict) -> None:
+    review = (await db.execute(select(Review).where(Review.id == payload["review_id"]))).scalar_one_or_none()
+    if review is None:
+        return
+    for enricher in _enrichers:
+        await enricher(db, review)
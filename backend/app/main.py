@@ -1,15 +1,59 @@
 ' A comment'
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 
 from urllib.parse import urlparse
 
 from app.api import router as api_router
 from app.api.review_status import router as review_status_router
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import (
+    PRIMARY_STICKY_COOKIE,
+    AsyncSessionLocal,
+    engine,
+    has_read_replica,
+    read_engine,
+    wants_primary_stickiness,
+)
+from app.core.pool import pool_keepalive_loop
+from app.jobs import worker_loop
+from app.maintenance.retention import retention_loop
+from app.rate_limit.gcra import public_limiter
+from app.services import near_duplicates  # noqa: F401  (registers the review enricher)
+from app.services.admin_events import admin_events
+from app.services.email_outbox import email_dispatcher
+from app.services.review_writer import review_writer
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    tasks: list[asyncio.Task] = []
+    if settings.maintenance_enabled:
+        tasks.append(asyncio.create_task(retention_loop(settings.maintenance_interval_minutes)))
+    for _ in range(settings.job_workers):
+        tasks.append(asyncio.create_task(worker_loop(settings.job_poll_interval_seconds, settings.job_idle_poll_max_seconds)))
+    if settings.db_pool_liveness == "background":
+        engines = [engine, read_engine] if has_read_replica() else [engine]
+        tasks.append(asyncio.create_task(pool_keepalive_loop(engines, settings.db_pool_ping_interval_seconds)))
+    tasks.append(
+        asyncio.create_task(email_dispatcher.run(settings.email_outbox_poll_seconds, settings.email_outbox_batch_size))
+    )
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await review_writer.stop()
+        await admin_events.stop()
+        await email_dispatcher.close()
+
 
 app = FastAPI(
     title=settings.app_name,
@@ -17,16 +61,10 @@ app = FastAPI(
     version="1.1.0",
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 trusted_hosts = {"localhost", "127.0.0.1", "*"}
 parsed_app_url = urlparse(settings.app_url)
@@ -45,6 +83,36 @@ async def redirect_root_domain(request: Request, call_next):
     return await call_next(request)
 
 
+@app.middleware("http")
+async def rate_limit_public_routes(request: Request, call_next):
+    client_ip = request.client.host if request.client else "unknown"
+    decision = await public_limiter.check(request.method, request.url.path, client_ip)
+    if decision is not None and not decision.allowed:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests. Please wait a moment."},
+            headers={"Retry-After": str(max(1, int(decision.retry_after + 0.999)))},
+        )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def stick_to_primary_after_writes(request: Request, call_next):
+    response = await call_next(request)
+    # Read-your-writes: replica reads resume once the replica has caught up.
+    if has_read_replica() and wants_primary_stickiness(request) and response.status_code < 400:
+        response.set_cookie(
+            key=PRIMARY_STICKY_COOKIE,
+            value="1",
+            max_age=settings.read_your_writes_seconds,
+            httponly=True,
+            secure=settings.environment == "production",
+            samesite="lax",
+            path="/",
+        )
+    return response
+
+
 @app.middleware("http")
 async def security_headers(request: Request, call_next):
     response = await call_next(request)
@@ -68,6 +136,18 @@ async def security_headers(request: Request, call_next):
     return response
 
 
+
+# Added last so it is the outermost layer: responses produced by the other
+# middleware (the public rate limiter's 429s, redirects) carry CORS headers
+# too, or browsers would report a CORS error instead.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 from sqlalchemy import text
 
 
@@ -0,0 +1,3 @@
+from app.maintenance.retention import run_retention
+
+__all__ = ["run_retention"]
@@ -0,0 +1,250 @@
+"""Retention jobs for append-only tables.
+
+- ``rate_limit_events`` is range-partitioned by UTC day: upcoming partitions
+  are created ahead of time and partitions past the retention window are
+  dropped whole, which reclaims space without bloating indexes.  Rows that
+  landed in the default partition are moved into a day's partition when it is
+  created, or purged once they are past the window.
+- Expired ``sessions`` / ``magic_link_tokens`` and stale rate-limit counters
+  are deleted in bounded batches so no single transaction holds locks long.
+
+Each step runs on its own: a failure (say, a partition that cannot be
+created) is logged and listed in the report while the other steps still run.
+
+Run once with ``python -m app.maintenance.retention``; the API also runs it
+periodically from the app lifespan (one worker at a time, via an advisory lock).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from functools import partial
+from typing import TypeVar
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(r"^rate_limit_events_p(\d{8})$")
+
+# Arbitrary application-wide key for pg_try_advisory_lock.
+_ADVISORY_LOCK_KEY = 727_001
+
+T = TypeVar("T")
+
+
+@dataclass
+class RetentionReport:
+    rows_deleted: dict[str, int] = field(default_factory=dict)
+    partitions_created: list[str] = field(default_factory=list)
+    partitions_dropped: list[str] = field(default_factory=list)
+    failed_steps: list[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> str:
+        deleted = ", ".join(f"{table}={count}" for table, count in self.rows_deleted.items())
+        summary = (
+            f"deleted [{deleted}] created={len(self.partitions_created)} "
+            f"dropped={len(self.partitions_dropped)} in {self.elapsed_seconds:.2f}s"
+        )
+        if self.failed_steps:
+            summary += f" failed [{', '.join(self.failed_steps)}]"
+        return summary
+
+
+def partition_name(day: date) -> str:
+    return f"rate_limit_events_p{day:%Y%m%d}"
+
+
+def _utc_bound(day: date) -> str:
+    # An explicit offset: a bare date would be read in the session TimeZone.
+    return f"{day.isoformat()} 00:00:00+00"
+
+
+async def ensure_partitions(today: date, days_ahead: int) -> list[str]:
+    """Create the daily partitions from ``today`` on.
+
+    A plain ``PARTITION OF`` fails while the default partition holds rows for
+    that day, so the partition is filled with those rows first and attached
+    after, all in one transaction.
+    """
+    created: list[str] = []
+    async with AsyncSessionLocal() as db:
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            name = partition_name(day)
+            exists = await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+            if exists:
+                continue
+            lower, upper = _utc_bound(day), _utc_bound(day + timedelta(days=1))
+            await db.execute(text(f"CREATE TABLE {name} (LIKE rate_limit_events INCLUDING DEFAULTS)"))
+            await db.execute(
+                text(
+                    f"""
+                    WITH moved AS (
+                      DELETE FROM rate_limit_events_default
+                      WHERE created_at >= CAST(:lower AS TIMESTAMPTZ) AND created_at < CAST(:upper AS TIMESTAMPTZ)
+                      RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                    """
+                ),
+                {"lower": lower, "upper": upper},
+            )
+            await db.execute(
+                text(f"ALTER TABLE rate_limit_events ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')")
+            )
+            created.append(name)
+        await db.commit()
+    return created
+
+async def drop_expired_partitions(today: date, keep_days: int) -> list[str]:
+    cutoff = today - timedelta(days=keep_days)
+    dropped: list[str] = []
+    async with AsyncSessionLocal() as db:
+        children = (
+            await db.execute(
+                text(
+                    """
+                    SELECT c.relname
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = 'rate_limit_events'::regclass
+                    """
+                )
+            )
+        ).scalars().all()
+        for name in children:
+            match = _PARTITION_NAME.match(name)
+            if not match:
+                continue
+            day = datetime.strptime(match.group(1), "%Y%m%d").date()
+            if day < cutoff:
+                await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        await db.commit()
+    return dropped
+
+
+async def delete_in_batches(table: str, key: str, condition: str, params: dict, batch_size: int) -> int:
+    """Delete matching rows ``batch_size`` at a time, committing between chunks."""
+    stmt = text(
+        f"DELETE FROM {table} WHERE {key} IN "
+        f"(SELECT {key} FROM {table} WHERE {condition} LIMIT :batch_size)"
+    )
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(stmt, {**params, "batch_size": batch_size})
+            await db.commit()
+        deleted = result.rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            return total
+        # Yield between chunks so the job never monopolises the event loop.
+        await asyncio.sleep(0)
+
+
+async def _run_step(report: RetentionReport, name: str, action: Callable[[], Awaitable[T]]) -> T | None:
+    """Run one retention step; a failure is logged and recorded, never fatal to the others."""
+    try:
+        return await action()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.warning("Retention step %s failed", name, exc_info=True)
+        report.failed_steps.append(name)
+        return None
+
+
+async def run_retention() -> RetentionReport:
+    started = time.monotonic()
+    report = RetentionReport()
+    now = datetime.now(UTC)
+    batch = settings.maintenance_batch_size
+
+    report.partitions_created = await _run_step(
+        report, "ensure_partitions", lambda: ensure_partitions(now.date(), days_ahead=3)
+    ) or []
+    report.partitions_dropped = await _run_step(
+        report,
+        "drop_expired_partitions",
+        lambda: drop_expired_partitions(now.date(), settings.rate_limit_event_retention_days),
+    ) or []
+
+    counter_cutoff = now - timedelta(hours=settings.rate_limit_window_hours + 1)
+    week_ago = now - timedelta(days=7)
+    purges: list[tuple[str, str, str, dict]] = [
+        (
+            "rate_limit_events_default",
+            "id",
+            "created_at < :cutoff",
+            {"cutoff": now - timedelta(days=settings.rate_limit_event_retention_days)},
+        ),
+        ("sessions", "id", "expires_at < :now", {"now": now}),
+        ("magic_link_tokens", "id", "expires_at < :cutoff", {"cutoff": now - timedelta(days=1)}),
+        ("rate_limit_counters", "ctid", "bucket_start < :cutoff", {"cutoff": counter_cutoff}),
+        ("rate_limit_buckets", "ctid", "tat < :now", {"now": now.timestamp()}),
+        ("idempotency_keys", "key_hash", "expires_at < :now", {"now": now}),
+        (
+            "jobs",
+            "id",
+            # A failed job's run_after is when it failed for good.
+            "(status = 'DONE' AND finished_at < :cutoff) OR (status = 'FAILED' AND run_after < :failed_cutoff)",
+            {"cutoff": week_ago, "failed_cutoff": now - timedelta(days=settings.failed_job_retention_days)},
+        ),
+        (
+            "email_outbox",
+            "id",
+            "(status = 'DONE' AND sent_at < :cutoff) OR (status = 'FAILED' AND created_at < :cutoff)",
+            {"cutoff": week_ago},
+        ),
+    ]
+    for table, key, condition, params in purges:
+        deleted = await _run_step(report, table, partial(delete_in_batches, table, key, condition, params, batch))
+        if deleted is not None:
+            report.rows_deleted[table] = deleted
+
+    report.elapsed_seconds = time.monotonic() - started
+    return report
+
+
+async def run_retention_locked() -> RetentionReport | None:
+    """Run the job unless another worker already holds the maintenance lock."""
+    async with engine.connect() as conn:
+        acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        await conn.commit()
+        if not acquired:
+            return None
+        try:
+            return await run_retention()
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            await conn.commit()
+
+
+async def retention_loop(interval_minutes: int) -> None:
+    while True:
+        try:
+            report = await run_retention_locked()
+            if report is not None:
+                logger.info("Retention: %s", report.summary())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Retention job failed", exc_info=True)
+        await asyncio.sleep(interval_minutes * 60)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(run_retention()).summary())
@@ -3,11 +3,22 @@ from app.models.entities import (
     Building,
     City,
     Country,
+    DashboardRollupDaily,
+    DashboardRollupHourly,
+    EmailOutbox,
+    IdempotencyKey,
+    Job,
     MagicLinkToken,
+    RateLimitBucket,
+    RateLimitCounter,
     RateLimitEvent,
     Report,
+    ReportReviewStats,
     Review,
     ReviewEditHistory,
+    ReviewLshBand,
+    ReviewSignature,
+    ReviewStatusCount,
     Session,
     Street,
     StreetSegment,
@@ -27,5 +38,16 @@ __all__ = [
     "Review",
     "ReviewEditHistory",
     "Report",
+    "ReportReviewStats",
+    "DashboardRollupHourly",
+    "DashboardRollupDaily",
+    "ReviewStatusCount",
     "RateLimitEvent",
+    "RateLimitBucket",
+    "RateLimitCounter",
+    "Job",
+    "EmailOutbox",
+    "IdempotencyKey",
+    "ReviewSignature",
+    "ReviewLshBand",
 ]
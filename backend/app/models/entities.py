@@ -1,23 +1,29 @@
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
+    Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     Numeric,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.models.enums import AuthorBadge, AuthorType, EditorType, ReportReason, ReviewStatus, UserRole
+from app.models.enums import AuthorBadge, AuthorType, EditorType, JobStatus, ReportReason, ReviewStatus, UserRole
 
 
 class User(Base):
@@ -113,6 +119,8 @@ class Review(Base):
         UniqueConstraint("tracking_code", name="uq_review_tracking_code"),
         Index("ix_review_status_building", "status", "building_id"),
         Index("ix_review_created_at", "created_at"),
+        Index("ix_review_pii_ruleset_version", "pii_ruleset_version", "id"),
+        Index("ix_review_status_created_at", "status", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -146,11 +154,14 @@ class Review(Base):
 
     pii_flagged: Mapped[bool] = mapped_column(default=False)
     pii_reasons: Mapped[dict] = mapped_column(JSON, default=list)
+    pii_ruleset_version: Mapped[int] = mapped_column(Integer, default=0)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
     approved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     moderation_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     moderated_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    claimed_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    claim_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     building = relationship("Building")
 
@@ -168,6 +179,7 @@ class ReviewEditHistory(Base):
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (Index("ix_reports_resolved_at_review_id", "resolved_at", "review_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     review_id: Mapped[int] = mapped_column(ForeignKey("reviews.id", ondelete="CASCADE"), index=True)
@@ -180,12 +192,179 @@ class Report(Base):
     resolved_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
 
+class ReportReviewStats(Base):
+    """Maintained per-review report counters; reason counts cover open reports only."""
+
+    __tablename__ = "report_review_stats"
+    __table_args__ = (
+        Index(
+            "ix_report_review_stats_open",
+            text("open_count DESC"),
+            text("last_reported_at DESC"),
+            text("review_id DESC"),
+            postgresql_where=text("open_count > 0"),
+        ),
+        Index(
+            "ix_report_review_stats_resolved",
+            text("last_reported_at DESC"),
+            text("review_id DESC"),
+            postgresql_where=text("open_count = 0"),
+        ),
+    )
+
+    review_id: Mapped[int] = mapped_column(ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    open_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_count: Mapped[int] = mapped_column(Integer, default=0)
+    pii_count: Mapped[int] = mapped_column(Integer, default=0)
+    harassment_count: Mapped[int] = mapped_column(Integer, default=0)
+    false_info_count: Mapped[int] = mapped_column(Integer, default=0)
+    spam_count: Mapped[int] = mapped_column(Integer, default=0)
+    other_count: Mapped[int] = mapped_column(Integer, default=0)
+    first_reported_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_reported_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class _RollupCounters:
+    submitted: Mapped[int] = mapped_column(BigInteger, default=0)
+    pii_flagged: Mapped[int] = mapped_column(BigInteger, default=0)
+    approved: Mapped[int] = mapped_column(BigInteger, default=0)
+    rejected: Mapped[int] = mapped_column(BigInteger, default=0)
+    changes_requested: Mapped[int] = mapped_column(BigInteger, default=0)
+    removed: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Sum over approvals in the bucket; divide by ``approved`` for the mean.
+    approval_seconds: Mapped[float] = mapped_column(Float, default=0)
+    reports_created: Mapped[int] = mapped_column(BigInteger, default=0)
+    reports_resolved: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class DashboardRollupHourly(_RollupCounters, Base):
+    """Per-UTC-hour dashboard counters, maintained by triggers on reviews and reports.
+
+    Each hour is split over a few ``shard`` rows (one per writing backend) so
+    concurrent writers rarely wait on each other; readers sum the shards.
+    """
+
+    __tablename__ = "dashboard_rollup_hourly"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+
+
+class DashboardRollupDaily(_RollupCounters, Base):
+    """Per-UTC-day dashboard counters, sharded like ``DashboardRollupHourly``."""
+
+    __tablename__ = "dashboard_rollup_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+
+
+class ReviewStatusCount(Base):
+    __tablename__ = "review_status_counts"
+
+    status: Mapped[ReviewStatus] = mapped_column(Enum(ReviewStatus), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    review_count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
 class RateLimitEvent(Base):
+    """Audit log of review submissions, range-partitioned by day on ``created_at``."""
+
     __tablename__ = "rate_limit_events"
+    __table_args__ = ({"postgresql_partition_by": "RANGE (created_at)"},)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ip: Mapped[str] = mapped_column(String(64), index=True)
     fingerprint: Mapped[str] = mapped_column(String(64), index=True)
     building_id: Mapped[int] = mapped_column(Integer, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(UTC), index=True
+    )
     type: Mapped[str] = mapped_column(String(40), index=True)
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    tat: Mapped[float] = mapped_column(Float, index=True)
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.QUEUED)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class EmailOutbox(Base):
+    """Outgoing email, committed with the work that produced it and sent by ``app.services.email_outbox``."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_run_after", "status", "run_after"),
+        Index(
+            "ix_email_outbox_dedupe_key_created_at",
+            "dedupe_key",
+            "created_at",
+            postgresql_where=text("dedupe_key IS NOT NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    recipient: Mapped[str] = mapped_column(String(320))
+    subject: Mapped[str] = mapped_column(String(255))
+    body: Mapped[str] = mapped_column(Text)
+    dedupe_key: Mapped[str | None] = mapped_column(String(400), nullable=True)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.QUEUED)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=6)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64))
+    response_body: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class ReviewSignature(Base):
+    __tablename__ = "review_signatures"
+
+    review_id: Mapped[int] = mapped_column(ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    signature: Mapped[bytes] = mapped_column(LargeBinary)
+
+
+class ReviewLshBand(Base):
+    __tablename__ = "review_lsh_bands"
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    band_hash: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    review_id: Mapped[int] = mapped_column(ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True, index=True)
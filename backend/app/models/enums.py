@@ -36,3 +36,10 @@ class ReportReason(StrEnum):
     FALSE_INFO = "FalseInfo"
     SPAM = "Spam"
     OTHER = "Other"
+
+
+class JobStatus(StrEnum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
@@ -1,3 +1,3 @@
-from app.moderation.state import can_transition
+from app.moderation.state import can_transition, sources_for
 
-__all__ = ["can_transition"]
+__all__ = ["can_transition", "sources_for"]
@@ -0,0 +1,157 @@
+"""Moderation queue queries: keyset pagination, leases and bulk transitions.
+
+Reviews are listed oldest first on ``(created_at, id)``.  The cursor is the
+position of the last row returned, so each page is an index range scan on
+``(status, created_at, id)``, for any status, instead of an OFFSET that
+grows with the queue.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import JSON, Select, and_, func, select, text, tuple_, update
+
+from app.models.entities import Review
+from app.models.enums import AuthorBadge, ReviewStatus
+from app.moderation.state import sources_for
+
+COMMENT_PREVIEW_CHARS = 280
+
+
+@dataclass(frozen=True)
+class QueueFilters:
+    status: ReviewStatus = ReviewStatus.PENDING
+    pii_flagged: bool | None = None
+    verified: bool | None = None
+    language: str | None = None
+    building_id: int | None = None
+
+
+def encode_cursor(created_at: datetime, review_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{review_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raise ``ValueError`` for anything that is not a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, review_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(review_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def queue_query(filters: QueueFilters, after: tuple[datetime, int] | None, limit: int) -> Select:
+    query = select(
+        Review.id,
+        Review.status,
+        Review.tracking_code,
+        Review.building_id,
+        Review.language_tag,
+        Review.author_badge,
+        Review.overall_score,
+        Review.pii_flagged,
+        Review.pii_reasons,
+        Review.created_at,
+        func.substr(Review.comment, 1, COMMENT_PREVIEW_CHARS).label("comment_preview"),
+    ).where(Review.status == filters.status)
+
+    if filters.pii_flagged is not None:
+        query = query.where(Review.pii_flagged.is_(filters.pii_flagged))
+    if filters.verified is not None:
+        badge = Review.author_badge == AuthorBadge.VERIFIED_ACCOUNT
+        query = query.where(badge if filters.verified else ~badge)
+    if filters.language:
+        query = query.where(Review.language_tag == filters.language)
+    if filters.building_id is not None:
+        query = query.where(Review.building_id == filters.building_id)
+    if after is not None:
+        created_at, review_id = after
+        # A row comparison is a single index range condition; the equivalent
+        # OR of two predicates is only applied as a filter.
+        query = query.where(tuple_(Review.created_at, Review.id) > tuple_(created_at, review_id))
+    return query.order_by(Review.created_at, Review.id).limit(limit)
+
+
+# Hands out the next unclaimed (or expired, or already ours) reviews. SKIP
+# LOCKED lets concurrent moderators claim disjoint batches without waiting
+# on each other's row locks.
+CLAIM_STATEMENT = text(
+    f"""
+    UPDATE reviews
+    SET claimed_by = :admin_id, claim_expires_at = now() + make_interval(secs => :lease_seconds)
+    WHERE id IN (
+      SELECT id FROM reviews
+      WHERE status = CAST(:status AS reviewstatus)
+        AND (claimed_by IS NULL OR claim_expires_at < now() OR claimed_by = :admin_id)
+      ORDER BY created_at, id
+      LIMIT :limit
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, status, tracking_code, building_id, language_tag, author_badge, overall_score,
+              pii_flagged, pii_reasons, created_at, claim_expires_at,
+              substr(comment, 1, {COMMENT_PREVIEW_CHARS}) AS comment_preview
+    """
+).columns(pii_reasons=JSON)
+
+RELEASE_STATEMENT = text(
+    """
+    UPDATE reviews SET claimed_by = NULL, claim_expires_at = NULL
+    WHERE id = ANY(:review_ids) AND claimed_by = :admin_id
+    RETURNING id
+    """
+)
+
+
+def claim_blocks(claimed_by, claim_expires_at, admin_id) -> bool:
+    """True when another moderator holds a live lease on the review."""
+    return claimed_by is not None and claimed_by != admin_id and claim_expires_at is not None and claim_expires_at > datetime.now(UTC)
+
+
+def bulk_transition_statement(review_ids: list[int], target: ReviewStatus, admin_id, message: str | None):
+    """One statement that locks the rows, applies valid transitions and reports every row.
+
+    Yields ``(id, status, claimed, applied)`` for each existing id, where
+    ``status`` is the status before the update and ``claimed`` means another
+    moderator holds a live lease (such rows are left alone).
+    """
+    claimed = and_(
+        Review.claimed_by.is_not(None),
+        Review.claimed_by != admin_id,
+        Review.claim_expires_at > func.now(),
+    )
+    targets = (
+        select(Review.id, Review.status, claimed.label("claimed"))
+        .where(Review.id.in_(review_ids))
+        .with_for_update()
+        .cte("targets")
+    )
+    values = {
+        "status": target,
+        "moderated_by": admin_id,
+        "moderation_message": message,
+        "claimed_by": None,
+        "claim_expires_at": None,
+    }
+    if target == ReviewStatus.APPROVED:
+        values["approved_at"] = func.now()
+    applied = (
+        update(Review)
+        .where(
+            Review.id == targets.c.id,
+            targets.c.status.in_(sorted(sources_for(target))),
+            targets.c.claimed.is_not(True),
+        )
+        .values(**values)
+        .returning(Review.id)
+        .cte("applied")
+    )
+    return (
+        select(targets.c.id, targets.c.status, targets.c.claimed, applied.c.id.is_not(None).label("applied"))
+        .outerjoin(applied, applied.c.id == targets.c.id)
+        .order_by(targets.c.id)
+    )
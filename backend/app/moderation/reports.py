@@ -0,0 +1,123 @@
+"""Report triage: per-review counters and the grouped, keyset-paginated view.
+
+``report_review_stats`` is maintained in the same transaction as the report
+writes, so triage reads one small row per review instead of aggregating the
+``reports`` table.  Open reviews are ordered hottest first, on
+``(open_count, last_reported_at, review_id)`` descending; resolved ones by
+``(last_reported_at, review_id)`` descending.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import Select, and_, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entities import ReportReviewStats, Review
+from app.models.enums import ReportReason
+
+REASON_COLUMNS = {
+    ReportReason.PII: "pii_count",
+    ReportReason.HARASSMENT: "harassment_count",
+    ReportReason.FALSE_INFO: "false_info_count",
+    ReportReason.SPAM: "spam_count",
+    ReportReason.OTHER: "other_count",
+}
+
+_BUMP = {
+    reason: text(
+        f"""
+        INSERT INTO report_review_stats AS s
+          (review_id, open_count, total_count, {column}, first_reported_at, last_reported_at)
+        VALUES (:review_id, 1, 1, 1, :at, :at)
+        ON CONFLICT (review_id) DO UPDATE SET
+          open_count = s.open_count + 1,
+          total_count = s.total_count + 1,
+          {column} = s.{column} + 1,
+          first_reported_at = COALESCE(s.first_reported_at, EXCLUDED.first_reported_at),
+          last_reported_at = GREATEST(s.last_reported_at, EXCLUDED.last_reported_at)
+        """
+    )
+    for reason, column in REASON_COLUMNS.items()
+}
+
+_LOCK_STATS = text("SELECT review_id FROM report_review_stats WHERE review_id = :review_id FOR UPDATE")
+_RESOLVE_REPORTS = text(
+    """
+    UPDATE reports SET resolved_at = now(), resolved_by = :admin_id
+    WHERE review_id = :review_id AND resolved_at IS NULL
+    """
+)
+_RESET_STATS = text(
+    f"""
+    UPDATE report_review_stats
+    SET open_count = 0, first_reported_at = NULL, {", ".join(f"{c} = 0" for c in REASON_COLUMNS.values())}
+    WHERE review_id = :review_id
+    """
+)
+
+
+async def record_report(db: AsyncSession, review_id: int, reason: ReportReason, at: datetime) -> None:
+    await db.execute(_BUMP[reason], {"review_id": review_id, "at": at})
+
+
+async def resolve_review_reports(db: AsyncSession, review_id: int, admin_id) -> int:
+    """Resolve every open report of a review; returns how many were resolved."""
+    # Lock the counter row first so a report filed concurrently is either
+    # resolved here or counted after the reset, never lost in between.
+    await db.execute(_LOCK_STATS, {"review_id": review_id})
+    resolved = (await db.execute(_RESOLVE_REPORTS, {"review_id": review_id, "admin_id": admin_id})).rowcount
+    await db.execute(_RESET_STATS, {"review_id": review_id})
+    return resolved
+
+
+TriageKey = tuple[int, datetime, int]
+
+
+def encode_triage_cursor(key: TriageKey) -> str:
+    open_count, last_reported_at, review_id = key
+    raw = f"{open_count}|{last_reported_at.isoformat()}|{review_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_triage_cursor(cursor: str) -> TriageKey:
+    """Raise ``ValueError`` for anything that is not a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        open_count, last_reported_at, review_id = raw.split("|")
+        return int(open_count), datetime.fromisoformat(last_reported_at), int(review_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def triage_query(resolved: bool, after: TriageKey | None, limit: int) -> Select:
+    stats = ReportReviewStats
+    query = (
+        select(
+            *stats.__table__.columns,
+            Review.status.label("review_status"),
+            func.substr(Review.comment, 1, 280).label("comment_preview"),
+        )
+        .join(Review, Review.id == stats.review_id)
+        .where(stats.open_count == 0 if resolved else stats.open_count > 0)
+    )
+    if resolved:
+        if after is not None:
+            query = query.where(tuple_(stats.last_reported_at, stats.review_id) < tuple_(after[1], after[2]))
+        order = (stats.last_reported_at.desc(), stats.review_id.desc())
+    else:
+        if after is not None:
+            open_count, last_reported_at, review_id = after
+            query = query.where(
+                or_(
+                    stats.open_count < open_count,
+                    and_(
+                        stats.open_count == open_count,
+                        tuple_(stats.last_reported_at, stats.review_id) < tuple_(last_reported_at, review_id),
+                    ),
+                )
+            )
+        order = (stats.open_count.desc(), stats.last_reported_at.desc(), stats.review_id.desc())
+    return query.order_by(*order).limit(limit)
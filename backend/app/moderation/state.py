@@ -12,3 +12,8 @@ TRANSITIONS = {
 
 def can_transition(current: ReviewStatus, target: ReviewStatus) -> bool:
     return target in TRANSITIONS[current]
+
+
+def sources_for(target: ReviewStatus) -> set[ReviewStatus]:
+    """Statuses a review may be in for ``target`` to be a valid next status."""
+    return {current for current, targets in TRANSITIONS.items() if target in targets}
@@ -1,3 +1,3 @@
-from app.pii.scanner import scan_pii
+from app.pii.scanner import PiiMatch, PiiRule, RULES, RULESET_VERSION, find_pii, scan_pii
 
-__all__ = ["scan_pii"]
+__all__ = ["PiiMatch", "PiiRule", "RULES", "RULESET_VERSION", "find_pii", "scan_pii"]
@@ -0,0 +1,126 @@
+"""Incremental PII scanning for text that is edited in small steps.
+
+An edit only changes matches near it.  The region that has to be re-scanned
+is widened to *cut points*: a position right after whitespace whose previous
+non-space character is punctuation (or the start of the text).  The only
+rules that span whitespace join letters or digits, and the phone patterns
+allow a single separator, so a match should not cross a cut.  The edit
+changes the characters before the region's end, so that end must be a cut in
+the old text as well as the new one; it is pushed right until it is.
+
+Matches before the region are kept as-is, matches after it are shifted by
+the edit's length delta, and only the region itself is scanned again.  If an
+old match still crosses a region boundary, or a fresh match runs up to the
+region's end (and so may have been cut short), the whole text is scanned
+instead: a missed blocking match is worse than a slow check.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+from app.pii.scanner import RULES, PiiMatch, find_pii
+
+_RULE_ORDER = {category: index for index, category in reversed(list(enumerate(rule.category for rule in RULES)))}
+
+
+def _is_cut(text: str, pos: int) -> bool:
+    if pos <= 0:
+        return True
+    if not text[pos - 1].isspace():
+        return False
+    i = pos - 1
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i < 0 or not text[i].isalnum()
+
+
+def cut_before(text: str, pos: int) -> int:
+    pos = min(pos, len(text))
+    while not _is_cut(text, pos):
+        pos -= 1
+    return pos
+
+
+def cut_after(text: str, pos: int) -> int:
+    pos = max(pos, 0)
+    while pos < len(text) and not _is_cut(text, pos):
+        pos += 1
+    return pos
+
+
+def apply_edit(
+    text: str, matches: list[PiiMatch], start: int, end: int, insert: str
+) -> tuple[str, list[PiiMatch]]:
+    """Replace ``text[start:end]`` with ``insert`` and update ``matches``."""
+    if not 0 <= start <= end <= len(text):
+        raise ValueError("Edit range is outside the text")
+    new_text = text[:start] + insert + text[end:]
+    delta = len(insert) - (end - start)
+
+    # Ending one character past the edit keeps the character before the
+    # unchanged suffix unchanged too, so lookbehinds there behave as before.
+    region_start = cut_before(new_text, start)
+    region_end = cut_after(new_text, min(len(new_text), start + len(insert) + 1))
+    while region_end < len(new_text) and not _is_cut(text, region_end - delta):
+        region_end = cut_after(new_text, region_end + 1)
+    old_region_end = region_end - delta
+
+    if any(m.start < region_start < m.end or m.start < old_region_end < m.end for m in matches):
+        return new_text, _ordered(find_pii(new_text))
+    fresh = [
+        replace(m, start=m.start + region_start, end=m.end + region_start)
+        for m in find_pii(new_text[region_start:region_end])
+    ]
+    if region_end < len(new_text) and any(m.end == region_end for m in fresh):
+        return new_text, _ordered(find_pii(new_text))
+
+    kept = [m for m in matches if m.end <= region_start]
+    shifted = [replace(m, start=m.start + delta, end=m.end + delta) for m in matches if m.start >= old_region_end]
+    return new_text, _ordered(kept + fresh + shifted)
+
+
+def _ordered(matches: list[PiiMatch]) -> list[PiiMatch]:
+    return sorted(matches, key=lambda m: (m.start, m.end, m.category))
+
+def summarize(matches: list[PiiMatch]) -> tuple[bool, list[str], bool]:
+    """``scan_pii``-compatible ``(flagged, reasons, blocked)`` for a match list."""
+    reasons = sorted({m.category for m in matches}, key=_RULE_ORDER.__getitem__)
+    return bool(reasons), reasons, any(m.blocking for m in matches)
+
+
+@dataclass
+class _Session:
+    text: str
+    matches: list[PiiMatch]
+    touched: float
+
+
+class PiiSessionStore:
+    """Per-process LRU of the last scanned text per editing session."""
+
+    def __init__(self, max_sessions: int = 10_000, ttl: float = 1800.0) -> None:
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, key: str) -> _Session | None:
+        now = time.monotonic()
+        session = self._sessions.get(key)
+        if session is None or now - session.touched > self.ttl:
+            self._sessions.pop(key, None)
+            return None
+        session.touched = now
+        self._sessions.move_to_end(key)
+        return session
+
+    def put(self, key: str, text: str, matches: list[PiiMatch]) -> None:
+        self._sessions[key] = _Session(text, matches, time.monotonic())
+        self._sessions.move_to_end(key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
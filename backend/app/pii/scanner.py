@@ -1,7 +1,21 @@
+"""PII detection for review comments.
+
+Each rule is registered once with its category, whether it blocks the
+submission, and the cheap "trigger" features it needs.  ``find_pii`` computes
+those features with a cheap linear pre-pass and only runs rules whose triggers
+are present, so a typical comment (no ``@``, no URL, few digits) touches a
+fraction of the patterns.  Patterns are anchored with look-behinds so a
+failed match is not retried from every position inside the same token,
+which keeps adversarial inputs linear.
+"""
+
 import re
+from dataclasses import dataclass
 
-EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_PATTERN = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\d[\s.-]?){8,}")
+# Local part anchored at its first character: without the look-behind a long
+# run of word characters is rescanned from every offset (quadratic).
+EMAIL_PATTERN = re.compile(r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<!\d)(?:\+?\d{1,3}[\s.-]?)?(?:\d[\s.-]?){8,}")
 HANDLE_PATTERN = re.compile(r"(?<!\w)@[A-Za-z0-9_\.]{2,}")
 LOCATION_DETAIL_PATTERN = re.compile(
     r"\b(?:apt|door|andar|unit|fração|fracao|esq|dir|\d+º|\d+[A-Za-z])\b", re.IGNORECASE
@@ -29,6 +43,73 @@ URL_PATTERN = re.compile(
 # Full names pattern — two or more capitalized words in a row (heuristic, flagged not blocked)
 FULL_NAME_PATTERN = re.compile(r"\b[A-ZÀ-Ü][a-zà-ü]{2,}\s+[A-ZÀ-Ü][a-zà-ü]{2,}(?:\s+[A-ZÀ-Ü][a-zà-ü]{2,})+\b")
 
+# Bump whenever a rule or pattern changes; ``app.tools.rescan_pii`` re-scans
+# every review stamped with an older version.
+RULESET_VERSION = 2
+
+_DIGIT = re.compile(r"\d")
+_UPPER = re.compile(r"[A-ZÀ-Ü]")
+_URL_HINT = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PiiRule:
+    category: str
+    pattern: re.Pattern[str]
+    blocking: bool = False
+    # Features that must all be present for the rule to possibly match.
+    triggers: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class PiiMatch:
+    category: str
+    start: int
+    end: int
+    blocking: bool
+
+
+# Order matters: it is the order categories are reported in ``scan_pii``.
+RULES: tuple[PiiRule, ...] = (
+    PiiRule("email", EMAIL_PATTERN, blocking=True, triggers=frozenset({"at"})),
+    PiiRule("phone", PHONE_PATTERN, blocking=True, triggers=frozenset({"digit"})),
+    PiiRule("phone", PT_PHONE_PATTERN, blocking=True, triggers=frozenset({"digit"})),
+    PiiRule("handle", HANDLE_PATTERN, triggers=frozenset({"at"})),
+    PiiRule("exact_location", LOCATION_DETAIL_PATTERN),
+    PiiRule("nif", NIF_PATTERN, blocking=True, triggers=frozenset({"digit"})),
+    PiiRule("citizen_card", CC_PATTERN, blocking=True, triggers=frozenset({"digit"})),
+    PiiRule("iban", IBAN_PATTERN, blocking=True, triggers=frozenset({"digit", "upper"})),
+    PiiRule("url", URL_PATTERN, triggers=frozenset({"url"})),
+    PiiRule("possible_full_name", FULL_NAME_PATTERN, triggers=frozenset({"upper"})),
+)
+
+BLOCKING_CATEGORIES = frozenset(rule.category for rule in RULES if rule.blocking)
+SCANNER_CATEGORIES = frozenset(rule.category for rule in RULES)
+
+
+def _features(text: str) -> set[str]:
+    features: set[str] = set()
+    if "@" in text:
+        features.add("at")
+    if _DIGIT.search(text):
+        features.add("digit")
+    if _UPPER.search(text):
+        features.add("upper")
+    if _URL_HINT.search(text):
+        features.add("url")
+    return features
+
+
+def find_pii(text: str) -> list[PiiMatch]:
+    """Return every PII match in ``text`` as typed spans, in rule order."""
+    features = _features(text)
+    matches: list[PiiMatch] = []
+    for rule in RULES:
+        if not rule.triggers <= features:
+            continue
+        matches.extend(PiiMatch(rule.category, m.start(), m.end(), rule.blocking) for m in rule.pattern.finditer(text))
+    return matches
+
 
 def scan_pii(text: str) -> tuple[bool, list[str], bool]:
     """Scan text for personally identifiable information.
@@ -38,29 +119,7 @@ def scan_pii(text: str) -> tuple[bool, list[str], bool]:
       - reasons: list of matched PII category strings
       - blocked: True if hard-blocking PII was found (submission should be rejected)
     """
-    reasons: list[str] = []
-    if EMAIL_PATTERN.search(text):
-        reasons.append("email")
-    if PHONE_PATTERN.search(text):
-        reasons.append("phone")
-    if PT_PHONE_PATTERN.search(text):
-        if "phone" not in reasons:
-            reasons.append("phone")
-    if HANDLE_PATTERN.search(text):
-        reasons.append("handle")
-    if LOCATION_DETAIL_PATTERN.search(text):
-        reasons.append("exact_location")
-    if NIF_PATTERN.search(text):
-        reasons.append("nif")
-    if CC_PATTERN.search(text):
-        reasons.append("citizen_card")
-    if IBAN_PATTERN.search(text):
-        reasons.append("iban")
-    if URL_PATTERN.search(text):
-        reasons.append("url")
-    if FULL_NAME_PATTERN.search(text):
-        reasons.append("possible_full_name")
-
+    reasons = list(dict.fromkeys(match.category for match in find_pii(text)))
     flagged = len(reasons) > 0
-    blocked = any(reason in {"email", "phone", "nif", "citizen_card", "iban"} for reason in reasons)
+    blocked = any(reason in BLOCKING_CATEGORIES for reason in reasons)
     return flagged, reasons, blocked
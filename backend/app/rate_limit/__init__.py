@@ -1,3 +1,4 @@
+from app.rate_limit.gcra import public_limiter
 from app.rate_limit.service import evaluate_rate_limit
 
-__all__ = ["evaluate_rate_limit"]
+__all__ = ["evaluate_rate_limit", "public_limiter"]
@@ -0,0 +1,209 @@
+"""GCRA (generic cell rate algorithm) limiter for public endpoints.
+
+Each key stores a single number — its theoretical arrival time (TAT) —
+so memory is O(1) per client regardless of request volume.  A request is
+allowed when pushing the TAT forward by one emission interval keeps it
+within ``burst`` intervals of now.  Keys whose TAT is in the past are
+indistinguishable from new keys and can be evicted freely.
+
+Two backends are provided: a per-worker in-memory map (the default), and a
+Postgres table so limits hold across all uvicorn workers.  The latter costs
+every limited request a round trip and commit on the primary, even a GET
+whose handler reads from the replica.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GcraLimit:
+    """Allow ``count`` requests per ``period`` seconds, bursting up to ``burst``."""
+
+    count: int
+    period: float
+    burst: int | None = None
+
+    @property
+    def interval(self) -> float:
+        return self.period / max(1, self.count)
+
+    @property
+    def tolerance(self) -> float:
+        return self.interval * max(1, self.burst or self.count)
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+def gcra_step(tat: float | None, now: float, limit: GcraLimit) -> tuple[bool, float, float]:
+    """Return ``(allowed, new_tat, retry_after)`` for one request."""
+    base = max(tat or now, now)
+    # Compare offsets from ``now`` rather than ``base + interval - now``: with
+    # large clock values that difference picks up rounding error and can deny
+    # a key's very first request.
+    excess = (base - now) - (limit.tolerance - limit.interval)
+    if excess > 0:
+        return False, base, excess
+    return True, base + limit.interval, 0.0
+
+
+class LimiterBackend(Protocol):
+    async def hit(self, key: str, limit: GcraLimit) -> Decision: ...
+
+
+class MemoryBackend:
+    """Per-process TAT map with LRU order and idle eviction."""
+
+    def __init__(self, max_keys: int = 50_000) -> None:
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    async def hit(self, key: str, limit: GcraLimit) -> Decision:
+        now = time.monotonic()
+        self._evict_idle(now)
+        allowed, new_tat, retry_after = gcra_step(self._tats.get(key), now, limit)
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return Decision(allowed, retry_after)
+
+    def _evict_idle(self, now: float, budget: int = 8) -> None:
+        # Least recently touched keys sit at the front; a key whose TAT has
+        # passed carries no state, so dropping it is lossless.
+        for _ in range(budget):
+            if not self._tats:
+                return
+            key, tat = next(iter(self._tats.items()))
+            if tat > now:
+                return
+            del self._tats[key]
+
+
+class DatabaseBackend:
+    """TAT rows in ``rate_limit_buckets``, updated with one atomic upsert.
+
+    Fails open when the database is unreachable: the limiter protects the
+    database, it must not become the reason requests fail.  Each hit is a
+    write on the primary, so only choose this backend when per-worker limits
+    are too loose.
+    """
+
+    _UPSERT = text(
+        """
+        INSERT INTO rate_limit_buckets AS b (key, tat)
+        VALUES (:key, :now + :interval)
+        ON CONFLICT (key) DO UPDATE
+          SET tat = GREATEST(b.tat, :now) + :interval
+          WHERE GREATEST(b.tat, :now) - :now <= :tolerance - :interval
+        RETURNING tat
+        """
+    )
+    _CURRENT = text("SELECT tat FROM rate_limit_buckets WHERE key = :key")
+
+    async def hit(self, key: str, limit: GcraLimit) -> Decision:
+        now = time.time()
+        params = {"key": key, "now": now, "interval": limit.interval, "tolerance": limit.tolerance}
+        try:
+            async with AsyncSessionLocal() as db:
+                new_tat = await db.scalar(self._UPSERT, params)
+                if new_tat is not None:
+                    await db.commit()
+                    return Decision(True)
+                tat = await db.scalar(self._CURRENT, {"key": key})
+        except Exception:
+            logger.warning("Shared rate limiter unavailable, allowing request", exc_info=True)
+            return Decision(True)
+        _allowed, _tat, retry_after = gcra_step(tat, now, limit)
+        return Decision(False, retry_after)
+
+
+@dataclass(frozen=True)
+class RouteGroup:
+    name: str
+    prefixes: tuple[str, ...]
+    limit: GcraLimit
+    methods: frozenset[str] = frozenset({"GET", "POST"})
+
+
+def _build_groups() -> list[RouteGroup]:
+    prefix = settings.api_prefix
+    return [
+        RouteGroup(
+            "assistant",
+            (f"{prefix}/assistant",),
+            GcraLimit(settings.rate_limit_assistant_per_hour, 3600),
+            frozenset({"POST"}),
+        ),
+        RouteGroup(
+            "search",
+            (f"{prefix}/search", f"{prefix}/buildings/"),
+            GcraLimit(settings.rate_limit_search_per_minute, 60),
+            frozenset({"GET"}),
+        ),
+        RouteGroup(
+            "map",
+            (f"{prefix}/map/buildings",),
+            GcraLimit(settings.rate_limit_map_per_minute, 60),
+            frozenset({"GET"}),
+        ),
+        RouteGroup(
+            "geocode",
+            (f"{prefix}/geocode",),
+            GcraLimit(settings.rate_limit_geocode_per_minute, 60),
+            frozenset({"GET"}),
+        ),
+        RouteGroup(
+            "pii_check",
+            (f"{prefix}/pii/check",),
+            GcraLimit(settings.rate_limit_pii_check_per_minute, 60),
+            frozenset({"POST"}),
+        ),
+    ]
+
+
+class PublicRateLimiter:
+    def __init__(self, groups: list[RouteGroup], backend: LimiterBackend) -> None:
+        self.groups = groups
+        self.backend = backend
+
+    def match(self, method: str, path: str) -> RouteGroup | None:
+        for group in self.groups:
+            if method in group.methods and path.startswith(group.prefixes):
+                return group
+        return None
+
+    async def check(self, method: str, path: str, client_ip: str) -> Decision | None:
+        """Return the decision for a limited route, or ``None`` if the route is unlimited."""
+        group = self.match(method, path)
+        if group is None or group.limit.count <= 0:
+            return None
+        return await self.backend.hit(f"{group.name}:{client_ip}", group.limit)
+
+
+def _build_backend() -> LimiterBackend:
+    if settings.rate_limit_backend == "database":
+        return DatabaseBackend()
+    return MemoryBackend()
+
+
+public_limiter = PublicRateLimiter(_build_groups(), _build_backend())
@@ -1,9 +1,12 @@
+from collections import Counter
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-import os
+from functools import lru_cache
 
-from sqlalchemy import func, select
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.entities import RateLimitEvent
 
 
@@ -11,46 +14,186 @@ class RateLimitExceeded(Exception):
     pass
 
 
-def _env_int(name: str, default: int) -> int:
-    raw = os.getenv(name)
-    if raw is None or raw.strip() == "":
-        return default
-    try:
-        value = int(raw)
-    except ValueError:
-        return default
-    return value
+@dataclass(frozen=True)
+class RateLimitConfig:
+    window_hours: int
+    ip_max: int
+    building_max: int
+    fp_max: int
 
 
-async def evaluate_rate_limit(db: AsyncSession, ip: str, fingerprint: str, building_id: int) -> None:
-    env = (os.getenv("ENVIRONMENT") or "development").strip().lower()
-    is_dev = env in {"dev", "development", "local"}
-
-    window_hours = _env_int("RATE_LIMIT_WINDOW_HOURS", 24)
-    if window_hours <= 0:
-        window_hours = 24
+@lru_cache(maxsize=1)
+def get_config() -> RateLimitConfig:
+    is_dev = settings.environment.strip().lower() in {"dev", "development", "local"}
+    window_hours = settings.rate_limit_window_hours if settings.rate_limit_window_hours > 0 else 24
 
     # Defaults: strict in production, relaxed in development to avoid blocking local testing.
-    ip_max = _env_int("RATE_LIMIT_IP_MAX", 200 if is_dev else 5)
-    building_max = _env_int("RATE_LIMIT_BUILDING_MAX", 200 if is_dev else 5)
-    fp_max = _env_int("RATE_LIMIT_FP_MAX", 200 if is_dev else 3)
+    def _pick(value: int | None, dev_default: int, prod_default: int) -> int:
+        if value is not None:
+            return value
+        return dev_default if is_dev else prod_default
 
-    since = datetime.now(UTC) - timedelta(hours=window_hours)
+    return RateLimitConfig(
+        window_hours=window_hours,
+        ip_max=_pick(settings.rate_limit_ip_max, 200, 5),
+        building_max=_pick(settings.rate_limit_building_max, 200, 5),
+        fp_max=_pick(settings.rate_limit_fp_max, 200, 3),
+    )
 
-    ip_count = await db.scalar(select(func.count()).select_from(RateLimitEvent).where(RateLimitEvent.ip == ip, RateLimitEvent.created_at > since))
-    if ip_count and ip_count >= ip_max:
-        raise RateLimitExceeded("IP limit exceeded")
 
-    building_count = await db.scalar(
-        select(func.count()).select_from(RateLimitEvent).where(RateLimitEvent.building_id == building_id, RateLimitEvent.created_at > since)
-    )
-    if building_count and building_count >= building_max:
-        raise RateLimitExceeded("Building limit exceeded")
+def exceeded_limit(ip_count: int, building_count: int, fp_count: int, config: RateLimitConfig) -> str | None:
+    """Return the message for the first exceeded limit (IP, building, fingerprint order)."""
+    if ip_count >= config.ip_max:
+        return "IP limit exceeded"
+    if building_count >= config.building_max:
+        return "Building limit exceeded"
+    if fp_count >= config.fp_max:
+        return "Fingerprint limit exceeded"
+    return None
+
+
+_WINDOW_SUMS = """
+    SELECT
+      COALESCE(SUM(count) FILTER (WHERE scope = 'ip' AND key = :ip), 0) AS ip_count,
+      COALESCE(SUM(count) FILTER (WHERE scope = 'building' AND key = :building), 0) AS building_count,
+      COALESCE(SUM(count) FILTER (WHERE scope = 'fp' AND key = :fp), 0) AS fp_count
+    FROM rate_limit_counters
+    WHERE bucket_start > :since
+      AND (
+        (scope = 'ip' AND key = :ip)
+        OR (scope = 'building' AND key = :building)
+        OR (scope = 'fp' AND key = :fp)
+      )
+"""
+
+# Serializes check-and-bump per key: each transaction reads ``sums`` from its
+# own snapshot, so without the locks N concurrent requests could all see room
+# left and all bump.  Held until commit; under READ COMMITTED the next
+# statement's snapshot then includes the previous holder's bump.  Keys are
+# locked in hash order so two requests sharing keys cannot deadlock.
+_LOCK_KEYS = text(
+    """
+    SELECT pg_advisory_xact_lock(lock_key)
+    FROM (
+      SELECT DISTINCT hashtext('rate_limit:' || k) AS lock_key
+      FROM unnest(CAST(:keys AS TEXT[])) AS k
+      ORDER BY 1
+    ) AS ordered
+    """
+)
 
-    fp_count = await db.scalar(
-        select(func.count()).select_from(RateLimitEvent).where(RateLimitEvent.fingerprint == fingerprint, RateLimitEvent.created_at > since)
+# Reads the three window sums from hourly counter buckets and, only when every
+# limit still has room, bumps the current bucket for all three scopes in one
+# round trip (after ``_LOCK_KEYS``).
+_CHECK_AND_BUMP = text(
+    f"""
+    WITH sums AS ({_WINDOW_SUMS}),
+    bump AS (
+      INSERT INTO rate_limit_counters AS c (scope, key, bucket_start, count)
+      SELECT v.scope, v.key, :bucket, 1
+      FROM (VALUES ('ip', :ip), ('building', :building), ('fp', :fp)) AS v(scope, key), sums
+      WHERE sums.ip_count < :ip_max AND sums.building_count < :building_max AND sums.fp_count < :fp_max
+      ON CONFLICT (scope, key, bucket_start) DO UPDATE SET count = c.count + 1
     )
-    if fp_count and fp_count >= fp_max:
-        raise RateLimitExceeded("Fingerprint limit exceeded")
+    SELECT ip_count, building_count, fp_count FROM sums
+    """
+)
+
+_CHECK_ONLY = text(_WINDOW_SUMS)
+
+_BUMP_MANY = text(
+    """
+    INSERT INTO rate_limit_counters AS c (scope, key, bucket_start, count)
+    VALUES (:scope, :key, :bucket, :count)
+    ON CONFLICT (scope, key, bucket_start) DO UPDATE SET count = c.count + EXCLUDED.count
+    """
+)
+
+
+@dataclass(frozen=True)
+class RateLimitHit:
+    ip: str
+    fingerprint: str
+    building_id: int
+
+
+def rate_limit_lock_keys(ip: str, fingerprint: str, building_id: int) -> list[str]:
+    return [f"ip:{ip}", f"building:{building_id}", f"fp:{fingerprint}"]
 
-    db.add(RateLimitEvent(ip=ip, fingerprint=fingerprint, building_id=building_id, type="review_submit"))
+
+def _current_bucket() -> datetime:
+    return datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+async def evaluate_rate_limit(
+    db: AsyncSession,
+    ip: str,
+    fingerprint: str,
+    building_id: int,
+    *,
+    record: bool = True,
+) -> None:
+    """Raise ``RateLimitExceeded`` if any window is full.
+
+    With ``record`` (the default) the hit is counted in the same statement and
+    an audit event is added to the session; the keys stay locked until the
+    caller's transaction ends, so concurrent hits on a key cannot overshoot.
+    Every other hit on those keys waits for that, so call it just before the
+    insert it guards and commit right after.  With ``record=False`` the check
+    takes no locks and counts nothing: either re-check with ``record`` later
+    or count the hit via ``record_rate_limit_hits``, where hits still in
+    flight are not seen by the check and a key can overshoot its limit by
+    that many.
+    """
+    config = get_config()
+    bucket = _current_bucket()
+    since = bucket - timedelta(hours=config.window_hours)
+
+    if record:
+        await db.execute(_LOCK_KEYS, {"keys": rate_limit_lock_keys(ip, fingerprint, building_id)})
+    row = (
+        await db.execute(
+            _CHECK_AND_BUMP if record else _CHECK_ONLY,
+            {
+                "ip": ip,
+                "building": str(building_id),
+                "fp": fingerprint,
+                "since": since,
+                "bucket": bucket,
+                "ip_max": config.ip_max,
+                "building_max": config.building_max,
+                "fp_max": config.fp_max,
+            },
+        )
+    ).one()
+
+    message = exceeded_limit(int(row.ip_count), int(row.building_count), int(row.fp_count), config)
+    if message:
+        raise RateLimitExceeded(message)
+
+    if record:
+        # The raw event log is kept for auditing only; limits are read from the counters.
+        db.add(RateLimitEvent(ip=ip, fingerprint=fingerprint, building_id=building_id, type="review_submit"))
+
+
+async def record_rate_limit_hits(db: AsyncSession, hits: list[RateLimitHit]) -> None:
+    """Count several already-checked hits with one upsert and one event insert."""
+    if not hits:
+        return
+    bucket = _current_bucket()
+    counts: Counter[tuple[str, str]] = Counter()
+    for hit in hits:
+        counts[("ip", hit.ip)] += 1
+        counts[("building", str(hit.building_id))] += 1
+        counts[("fp", hit.fingerprint)] += 1
+    await db.execute(
+        _BUMP_MANY,
+        [{"scope": scope, "key": key, "bucket": bucket, "count": n} for (scope, key), n in counts.items()],
+    )
+    await db.execute(
+        insert(RateLimitEvent),
+        [
+            {"ip": hit.ip, "fingerprint": hit.fingerprint, "building_id": hit.building_id, "type": "review_submit"}
+            for hit in hits
+        ],
+    )
@@ -80,6 +80,31 @@ class AdminModerationPayload(BaseModel):
     }
 
 
+class BulkModerationPayload(BaseModel):
+    review_ids: list[int] = Field(min_length=1, max_length=500)
+    status: str = Field(description="Target status: APPROVED, REJECTED, CHANGES_REQUESTED or REMOVED")
+    message: str | None = Field(default=None, max_length=1000)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "review_ids": [12, 13, 17],
+                "status": "APPROVED",
+                "message": None,
+            }
+        }
+    }
+
+
+class ClaimPayload(BaseModel):
+    limit: int = Field(default=10, ge=1, le=50)
+    status: str = Field(default="PENDING", description="Queue to claim from: PENDING or CHANGES_REQUESTED")
+
+
+class ReleasePayload(BaseModel):
+    review_ids: list[int] = Field(min_length=1, max_length=500)
+
+
 class ReportPayload(BaseModel):
     review_id: int
     reason: str
@@ -94,3 +119,26 @@ class ReportPayload(BaseModel):
             }
         }
     }
+
+
+class PiiEdit(BaseModel):
+    start: int = Field(ge=0, description="Start offset of the replaced range in the previous text")
+    end: int = Field(ge=0, description="End offset (exclusive) of the replaced range in the previous text")
+    insert: str = Field(default="", max_length=4000, description="Replacement text")
+
+
+class PiiCheckPayload(BaseModel):
+    text: str | None = Field(default=None, max_length=4000, description="Full comment text")
+    session_key: str | None = Field(default=None, min_length=8, max_length=64, description="Client-chosen editing session key")
+    edit: PiiEdit | None = Field(default=None, description="Change against the previous text of this session")
+    base_length: int | None = Field(default=None, ge=0, description="Length of the previous text, for sanity checking")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "session_key": "b6f1c1d2-review-form",
+                "edit": {"start": 42, "end": 42, "insert": "me@example.com"},
+                "base_length": 42,
+            }
+        }
+    }
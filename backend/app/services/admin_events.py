@@ -0,0 +1,99 @@
+"""Push of moderation events to admin dashboards.
+
+Row-level triggers on ``reviews`` and ``reports`` ``pg_notify`` small JSON
+payloads on the ``admin_events`` channel.  Each worker holds one dedicated
+asyncpg connection that LISTENs on it (opened with the first subscriber,
+re-opened with backoff if it drops) and fans every event out to the
+subscribed SSE streams.  Slow subscribers lose their oldest events rather
+than stalling the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "admin_events"
+QUEUE_SIZE = 256
+
+
+def _dsn() -> str:
+    url = make_url(settings.database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class AdminEventHub:
+    def __init__(self, *, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0) -> None:
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._subscribers: set[asyncio.Queue[dict]] = set()
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self) -> asyncio.Queue[dict]:
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[dict]) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, event: dict) -> None:
+        metrics.counter("admin_events.received").inc()
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                metrics.counter("admin_events.dropped").inc()
+            queue.put_nowait(event)
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed admin event payload %r", payload[:200])
+
+    async def _listen(self) -> None:
+        delay = self.reconnect_delay
+        while self._subscribers:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_dsn())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                delay = self.reconnect_delay
+                # Tell open streams they may have missed events while disconnected.
+                self.publish({"type": "stream.connected"})
+                while self._subscribers and not connection.is_closed():
+                    await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Admin event listener failed, retrying in %.0fs", delay, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+    async def stop(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+admin_events = AdminEventHub()
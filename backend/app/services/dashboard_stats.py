@@ -0,0 +1,90 @@
+"""Admin dashboard time series read from the trigger-maintained rollups.
+
+``dashboard_rollup_hourly``/``dashboard_rollup_daily`` hold additive counters
+per UTC bucket and ``review_status_counts`` the current number of reviews per
+status, so the dashboard reads at most a few thousand small rows however
+large ``reviews`` and ``reports`` grow.  Each bucket and status is spread over
+a few shard rows so concurrent writers do not queue on one hot row; the
+queries here sum the shards back together.  Rates and means are derived
+after the sums, so they stay exact when buckets are merged.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+from sqlalchemy import BigInteger, Select, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entities import DashboardRollupDaily, DashboardRollupHourly, ReviewStatusCount
+from app.models.enums import ReviewStatus
+
+Granularity = Literal["hour", "day"]
+
+COUNTERS = (
+    "submitted",
+    "pii_flagged",
+    "approved",
+    "rejected",
+    "changes_requested",
+    "removed",
+    "reports_created",
+    "reports_resolved",
+)
+
+
+def bucket_range(granularity: Granularity, points: int, now: datetime | None = None) -> list[datetime | date]:
+    """The last ``points`` buckets up to and including the current one, oldest first."""
+    now = (now or datetime.now(UTC)).astimezone(UTC)
+    if granularity == "hour":
+        current = now.replace(minute=0, second=0, microsecond=0)
+        return [current - timedelta(hours=offset) for offset in range(points - 1, -1, -1)]
+    today = now.date()
+    return [today - timedelta(days=offset) for offset in range(points - 1, -1, -1)]
+
+
+def series_query(granularity: Granularity, start: datetime | date) -> Select:
+    """Per-bucket counters from ``start`` on, summed over shards."""
+    model = DashboardRollupHourly if granularity == "hour" else DashboardRollupDaily
+    key = model.bucket if granularity == "hour" else model.day
+    sums = [cast(func.sum(getattr(model, name)), BigInteger).label(name) for name in COUNTERS]
+    return (
+        select(key, *sums, func.sum(model.approval_seconds).label("approval_seconds"))
+        .where(key >= start)
+        .group_by(key)
+    )
+
+
+def build_series(granularity: Granularity, buckets: list[datetime | date], rows: list) -> list[dict]:
+    """One entry per bucket, zero-filled where nothing happened."""
+    key = "bucket" if granularity == "hour" else "day"
+    by_bucket = {getattr(row, key): row for row in rows}
+    series = []
+    for bucket in buckets:
+        row = by_bucket.get(bucket)
+        point = {"bucket": bucket.isoformat(), **{name: getattr(row, name) if row else 0 for name in COUNTERS}}
+        point["pii_flag_rate"] = point["pii_flagged"] / point["submitted"] if point["submitted"] else None
+        point["avg_approval_seconds"] = row.approval_seconds / row.approved if row and row.approved else None
+        series.append(point)
+    return series
+
+
+async def status_counts(db: AsyncSession) -> dict[str, int]:
+    counts = {status.value: 0 for status in ReviewStatus}
+    rows = await db.execute(
+        select(ReviewStatusCount.status, func.sum(ReviewStatusCount.review_count)).group_by(ReviewStatusCount.status)
+    )
+    for status, review_count in rows.all():
+        counts[status.value] = int(review_count)
+    return counts
+
+
+async def dashboard_stats(db: AsyncSession, granularity: Granularity, points: int) -> dict:
+    buckets = bucket_range(granularity, points)
+    rows = (await db.execute(series_query(granularity, buckets[0]))).all()
+    return {
+        "granularity": granularity,
+        "status_counts": await status_counts(db),
+        "series": build_series(granularity, buckets, list(rows)),
+    }
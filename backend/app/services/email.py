@@ -7,30 +7,44 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+MAGIC_LINK_SUBJECT = "Your LivedHere magic sign-in link"
 
-async def send_magic_link_email(email: str, link: str) -> None:
-    subject = "Your LivedHere magic sign-in link"
-    body = (
+
+def magic_link_body(link: str) -> str:
+    return (
         f"Click to sign in:\n\n{link}\n\n"
         "This link expires in 15 minutes.\n\n"
         "If you did not request this, you can safely ignore this email."
     )
 
-    if not settings.send_real_email:
-        logger.info("DEV_MAGIC_LINK %s -> %s", email, link)
-        return
 
+def build_message(recipient: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = settings.email_from
-    msg["To"] = email
+    msg["To"] = recipient
     msg["Subject"] = subject
     msg.set_content(body)
+    return msg
 
-    await aiosmtplib.send(
-        msg,
-        hostname=settings.email_host,
-        port=settings.email_port,
-        username=settings.email_user or None,
-        password=settings.email_pass or None,
-        start_tls=True,
-    )
+
+def smtp_options() -> dict:
+    return {
+        "hostname": settings.email_host,
+        "port": settings.email_port,
+        "username": settings.email_user or None,
+        "password": settings.email_pass or None,
+        "start_tls": True,
+    }
+
+
+async def send_magic_link_email(email: str, link: str) -> None:
+    """Send one magic link over a dedicated connection.
+
+    The sign-in flow queues links through ``app.services.email_outbox``
+    instead; this stays for one-off sends.
+    """
+    if not settings.send_real_email:
+        logger.info("DEV_MAGIC_LINK %s -> %s", email, link)
+        return
+
+    await aiosmtplib.send(build_message(email, MAGIC_LINK_SUBJECT, magic_link_body(link)), **smtp_options())
@@ -0,0 +1,234 @@
+"""Email outbox and its SMTP dispatcher.
+
+Request handlers add an ``email_outbox`` row in their own transaction and
+return once it is committed.  Each API worker runs one dispatcher that
+claims due rows in batches with ``FOR UPDATE SKIP LOCKED`` and sends them
+over a single authenticated SMTP connection, kept open across batches and
+closed after ``EMAIL_SMTP_IDLE_SECONDS`` without mail.  Failures are
+retried with the job queue's exponential backoff.  When the connection
+fails, only the message being sent is charged an attempt; the rest of the
+batch goes back to the queue untouched, so an SMTP outage does not use up
+the attempts of mail that was never tried.
+
+Bodies can carry sign-in links, so they are blanked once delivered or once
+they have failed for good.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import aiosmtplib
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.jobs.queue import STALE_AFTER, backoff_seconds
+from app.models.entities import EmailOutbox
+from app.models.enums import JobStatus
+from app.services.email import build_message, smtp_options
+
+logger = logging.getLogger(__name__)
+
+# Errors that say nothing about the message itself: the connection is
+# dropped and the rest of the batch is requeued.
+_CONNECTION_ERRORS = (
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPAuthenticationError,
+    aiosmtplib.SMTPTimeoutError,
+    OSError,
+)
+
+# Like the job queue: stale rows are retried until their attempts run out,
+# then marked FAILED (with the body blanked, as in ``_MARK_FAILED``).
+_CLAIM = text(
+    """
+    WITH exhausted AS (
+      UPDATE email_outbox
+      SET status = 'FAILED', body = '', locked_at = NULL, run_after = now(),
+          last_error = 'Sender stopped while delivering the last attempt'
+      WHERE status = 'RUNNING'
+        AND locked_at < now() - make_interval(secs => :stale_seconds)
+        AND attempts >= max_attempts
+    )
+    UPDATE email_outbox
+    SET status = 'RUNNING', attempts = attempts + 1, locked_at = now()
+    WHERE id IN (
+      SELECT id FROM email_outbox
+      WHERE (status = 'QUEUED' AND run_after <= now())
+         OR (
+           status = 'RUNNING'
+           AND locked_at < now() - make_interval(secs => :stale_seconds)
+           AND attempts < max_attempts
+         )
+      ORDER BY run_after
+      LIMIT :limit
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, recipient, subject, body, attempts, max_attempts
+    """
+)
+_MARK_SENT = text(
+    "UPDATE email_outbox SET status = 'DONE', body = '', locked_at = NULL, sent_at = now() WHERE id = ANY(:ids)"
+)
+_MARK_FAILED = text(
+    "UPDATE email_outbox SET status = :status, last_error = :error, locked_at = NULL, "
+    "body = CASE WHEN :status = 'FAILED' THEN '' ELSE body END, "
+    "run_after = now() + make_interval(secs => :delay) WHERE id = :id"
+)
+# Claimed but never attempted: give back the attempt taken at claim time.
+_REQUEUE = text(
+    "UPDATE email_outbox SET status = 'QUEUED', attempts = attempts - 1, locked_at = NULL, "
+    "run_after = now() + make_interval(secs => :delay) WHERE id = ANY(:ids)"
+)
+_DEDUPE_LOCK = text("SELECT pg_advisory_xact_lock(hashtext(:key))")
+_RECENT = text(
+    "SELECT EXISTS (SELECT 1 FROM email_outbox "
+    "WHERE dedupe_key = :key AND created_at > now() - make_interval(secs => :window))"
+)
+
+
+def enqueue_email(
+    db: AsyncSession, recipient: str, subject: str, body: str, *, dedupe_key: str | None = None
+) -> EmailOutbox:
+    """Add an email to the current transaction; it is sent after commit."""
+    row = EmailOutbox(recipient=recipient, subject=subject, body=body, dedupe_key=dedupe_key)
+    db.add(row)
+    return row
+
+
+async def recently_enqueued(db: AsyncSession, dedupe_key: str, window_seconds: float) -> bool:
+    """Whether an email with ``dedupe_key`` was queued within the window.
+
+    Takes a transaction-scoped advisory lock on the key first, so concurrent
+    requests for the same key serialise and only one of them enqueues.
+    """
+    await db.execute(_DEDUPE_LOCK, {"key": dedupe_key})
+    return bool(await db.scalar(_RECENT, {"key": dedupe_key, "window": window_seconds}))
+
+
+class EmailDispatcher:
+    def __init__(self) -> None:
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._wake = asyncio.Event()
+
+    def wake(self) -> None:
+        """Dispatch now instead of at the next poll (same worker only)."""
+        self._wake.set()
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is None or not self._smtp.is_connected:
+            smtp = aiosmtplib.SMTP(**smtp_options())
+            with metrics.timer("email.smtp_connect.seconds"):
+                await smtp.connect()
+            self._smtp = smtp
+        return self._smtp
+
+    async def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                smtp.close()
+
+    async def deliver(self, recipient: str, subject: str, body: str) -> None:
+        if not settings.send_real_email:
+            logger.info("DEV_EMAIL %s [%s]\n%s", recipient, subject, body)
+            return
+        message = build_message(recipient, subject, body)
+        reused = self._smtp is not None and self._smtp.is_connected
+        smtp = await self._connection()
+        try:
+            with metrics.timer("email.send.seconds"):
+                await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            if not reused:
+                raise
+            # The server dropped the kept-alive connection while idle: one
+            # retry on a fresh connection before treating it as an outage.
+            metrics.counter("email.smtp_reconnects").inc()
+            await self.close()
+            smtp = await self._connection()
+            with metrics.timer("email.send.seconds"):
+                await smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    async def dispatch_once(self, limit: int) -> int:
+        """Send one batch of due emails; returns how many were claimed."""
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(_CLAIM, {"limit": limit, "stale_seconds": STALE_AFTER.total_seconds()})).all()
+            await db.commit()
+        if not rows:
+            return 0
+
+        sent: list[int] = []
+        failed: list[dict] = []
+        requeued: list[int] = []
+        for index, row in enumerate(rows):
+            connection_lost = False
+            try:
+                await self.deliver(row.recipient, row.subject, row.body)
+                sent.append(row.id)
+                continue
+            except _CONNECTION_ERRORS as exc:
+                logger.warning("SMTP connection failed", exc_info=True)
+                await self.close()
+                error: Exception = exc
+                connection_lost = True
+            except aiosmtplib.SMTPException as exc:
+                logger.warning("Email %s was not accepted", row.id, exc_info=True)
+                error = exc
+            final = row.attempts >= row.max_attempts
+            failed.append(
+                {
+                    "id": row.id,
+                    "status": JobStatus.FAILED.value if final else JobStatus.QUEUED.value,
+                    "error": repr(error)[:2000],
+                    "delay": backoff_seconds(row.attempts),
+                }
+            )
+            if connection_lost:
+                requeued = [later.id for later in rows[index + 1 :]]
+                break
+
+        async with AsyncSessionLocal() as db:
+            if sent:
+                await db.execute(_MARK_SENT, {"ids": sent})
+            if failed:
+                await db.execute(_MARK_FAILED, failed)
+            if requeued:
+                # Retried together with the message that hit the outage.
+                await db.execute(_REQUEUE, {"ids": requeued, "delay": failed[-1]["delay"]})
+            await db.commit()
+        metrics.counter("email.sent").inc(len(sent))
+        metrics.counter("email.failures").inc(len(failed))
+        return len(rows)
+
+    async def run(self, poll_interval: float, batch_size: int) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_once(batch_size)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Email dispatch iteration failed", exc_info=True)
+                claimed = 0
+            if claimed == batch_size:
+                continue
+            if self._smtp is not None and time.monotonic() - self._last_used > settings.email_smtp_idle_seconds:
+                await self.close()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=poll_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+
+email_dispatcher = EmailDispatcher()
@@ -6,11 +6,14 @@ frontend and usage is centralised for logging / caching.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import Any
 
 import httpx
 
+from app.core import metrics
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,28 @@ logger = logging.getLogger(__name__)
 _BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 
 
+class _Bulkhead:
+    """Concurrency limit and latency accounting for one call purpose.
+
+    Each purpose (assistant chat, search correction) gets its own
+    semaphore so a Gemini slowdown in one path cannot starve the other.
+    """
+
+    def __init__(self, purpose: str, limit: int) -> None:
+        self.purpose = purpose
+        self.semaphore = asyncio.Semaphore(max(1, limit))
+        self.latency = metrics.histogram(f"gemini.{purpose}.latency_seconds")
+        self.queue_wait = metrics.histogram(f"gemini.{purpose}.queue_wait_seconds")
+        self.rejected = metrics.counter(f"gemini.{purpose}.rejected")
+        self.timeouts = metrics.counter(f"gemini.{purpose}.timeouts")
+
+
+_bulkheads = {
+    "assistant": _Bulkhead("assistant", settings.gemini_assistant_concurrency),
+    "search": _Bulkhead("search", settings.gemini_search_concurrency),
+}
+
+
 async def generate_text(
     prompt: str,
     *,
@@ -26,11 +51,16 @@ async def generate_text(
     temperature: float = 0.1,
     system: str | None = None,
     json_mode: bool = False,
+    purpose: str = "search",
+    queue_timeout: float = 0.5,
+    deadline: float = 5.0,
 ) -> str | None:
     """Send a single-turn prompt and return the text response.
 
-    Returns ``None`` when the API key is missing, the request fails, or the
-    response cannot be parsed — callers should always fall back gracefully.
+    Returns ``None`` when the API key is missing, the request fails, the
+    ``purpose`` bulkhead is saturated for longer than ``queue_timeout``, the
+    call exceeds ``deadline`` seconds in total, or the response cannot be
+    parsed — callers should always fall back gracefully.
     """
     if not settings.gemini_api_key:
         return None
@@ -59,7 +89,7 @@ async def generate_text(
     if json_mode and not model.startswith("gemma"):
         body["generationConfig"]["responseMimeType"] = "application/json"
 
-    return await _call_api(url, body)
+    return await _call_api(url, body, purpose=purpose, queue_timeout=queue_timeout, deadline=deadline)
 
 
 async def generate_chat(
@@ -69,11 +99,15 @@ async def generate_chat(
     max_tokens: int = 256,
     temperature: float = 0.3,
     system: str | None = None,
+    purpose: str = "assistant",
+    queue_timeout: float = 2.0,
+    deadline: float = 15.0,
 ) -> str | None:
     """Send a multi-turn conversation and return the model's reply.
 
     ``messages`` is a list of dicts with ``role`` ("user" | "model") and
-    ``text`` keys.  The system instruction is passed separately.
+    ``text`` keys.  The system instruction is passed separately.  Budgets
+    behave as in :func:`generate_text`.
     """
     if not settings.gemini_api_key:
         return None
@@ -104,13 +138,49 @@ async def generate_chat(
         else:
             body["systemInstruction"] = {"parts": [{"text": system}]}
 
-    return await _call_api(url, body)
+    return await _call_api(url, body, purpose=purpose, queue_timeout=queue_timeout, deadline=deadline)
 
 
-async def _call_api(url: str, body: dict[str, Any]) -> str | None:
-    """Shared HTTP call logic."""
+async def _call_api(
+    url: str,
+    body: dict[str, Any],
+    *,
+    purpose: str,
+    queue_timeout: float,
+    deadline: float,
+) -> str | None:
+    """Shared HTTP call logic, run inside the purpose's bulkhead."""
+    bulkhead = _bulkheads[purpose]
+    started = time.monotonic()
+    # Not wait_for: on 3.11 it can cancel after acquire() succeeded and leak
+    # the permit.  ``acquired`` makes the release exact on every exit path,
+    # cancellation included.
+    acquired = False
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
+        try:
+            async with asyncio.timeout(min(queue_timeout, deadline)):
+                await bulkhead.semaphore.acquire()
+                acquired = True
+        except TimeoutError:
+            bulkhead.rejected.inc()
+            logger.warning("Gemini %s bulkhead full, rejecting call after %.2fs", purpose, queue_timeout)
+            return None
+
+        waited = time.monotonic() - started
+        bulkhead.queue_wait.observe(waited)
+        return await _post(url, body, timeout=max(0.1, deadline - waited), bulkhead=bulkhead)
+    finally:
+        if acquired:
+            bulkhead.semaphore.release()
+            bulkhead.latency.observe(time.monotonic() - started)
+
+
+async def _post(url: str, body: dict[str, Any], *, timeout: float, bulkhead: _Bulkhead) -> str | None:
+    try:
+        # httpx.Timeout bounds each phase (connect, write, every read) on its
+        # own; asyncio.timeout makes ``timeout`` the total, so a server that
+        # trickles bytes cannot hold the bulkhead slot past the deadline.
+        async with asyncio.timeout(timeout), httpx.AsyncClient(timeout=httpx.Timeout(timeout)) as client:
             resp = await client.post(
                 url,
                 params={"key": settings.gemini_api_key},
@@ -120,6 +190,10 @@ async def _call_api(url: str, body: dict[str, Any]) -> str | None:
                 logger.warning("Gemini API %s: %s", resp.status_code, resp.text[:300])
                 return None
             data = resp.json()
+    except (TimeoutError, httpx.TimeoutException):
+        bulkhead.timeouts.inc()
+        logger.warning("Gemini API call exceeded %.2fs deadline", timeout)
+        return None
     except Exception:
         logger.warning("Gemini API call failed", exc_info=True)
         return None
@@ -0,0 +1,187 @@
+"""``Idempotency-Key`` support for retry-prone POST endpoints.
+
+The first request with a given key reserves a row in ``idempotency_keys``
+(committed immediately, outside the request transaction), runs the handler
+and stores its response.  Replays of the same key return the stored
+response without re-running captcha, PII scanning or rate limiting;
+concurrent duplicates wait for the first request to finish.  If the
+handler fails, the reservation is released so the client can retry; if its
+holder died instead, another request may take the reservation over once it
+is ``RESERVATION_LEASE`` old.  The reservation time fences the two: the
+late holder can no longer store or release a response under it.
+
+Keys are scoped to the caller (``caller_identity``): the same key sent by a
+different user or fingerprint is a different key.  Anonymous callers
+without a fingerprint cookie cannot use keys at all, since an address is
+shared by everyone behind the same NAT.  Responses can
+carry credentials (a review's ``edit_token``), so they are stored sealed
+with AES-GCM under a key derived from the raw ``Idempotency-Key`` and
+``JWT_SECRET``; the table only holds a hash of the former, so a database
+dump alone cannot recover them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from uuid import UUID
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from fastapi import HTTPException, status
+from sqlalchemy import text
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import hash_token, utcnow
+
+KEY_TTL = timedelta(hours=24)
+# Longer than any handler runs (the captcha call alone may take 8s).
+RESERVATION_LEASE = timedelta(seconds=60)
+MAX_KEY_LENGTH = 255
+
+_RESERVE = text(
+    """
+    INSERT INTO idempotency_keys (key_hash, request_hash, created_at, expires_at)
+    VALUES (:key_hash, :request_hash, :now, :expires_at)
+    ON CONFLICT (key_hash) DO UPDATE
+      SET request_hash = EXCLUDED.request_hash, response_body = NULL,
+          created_at = EXCLUDED.created_at, expires_at = EXCLUDED.expires_at
+      WHERE idempotency_keys.expires_at < :now
+         OR (idempotency_keys.response_body IS NULL AND idempotency_keys.created_at < :lease_cutoff)
+    RETURNING key_hash
+    """
+)
+_LOOKUP = text("SELECT request_hash, response_body FROM idempotency_keys WHERE key_hash = :key_hash")
+_COMPLETE = text(
+    "UPDATE idempotency_keys SET response_body = CAST(:body AS JSONB) "
+    "WHERE key_hash = :key_hash AND created_at = :reserved_at"
+)
+_RELEASE = text(
+    "DELETE FROM idempotency_keys WHERE key_hash = :key_hash AND created_at = :reserved_at AND response_body IS NULL"
+)
+
+
+def request_hash(body: dict) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def caller_identity(user_id: UUID | None = None, fingerprint: str | None = None) -> str:
+    """Who a key belongs to: the signed-in user, else the fingerprint cookie."""
+    if user_id is not None:
+        return f"user:{user_id}"
+    if fingerprint:
+        return f"fp:{fingerprint}"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Idempotency-Key needs a signed-in user or the lh_fp cookie; retry without the header",
+    )
+
+
+def _sealing_key(scoped_key: str) -> bytes:
+    return hmac.new(settings.jwt_secret.encode("utf-8"), scoped_key.encode("utf-8"), hashlib.sha256).digest()
+
+
+def seal_response(scoped_key: str, result: dict) -> dict:
+    nonce = os.urandom(12)
+    sealed = AESGCM(_sealing_key(scoped_key)).encrypt(nonce, json.dumps(result, default=str).encode("utf-8"), None)
+    return {"sealed": base64.b64encode(nonce + sealed).decode("ascii")}
+
+
+def open_response(scoped_key: str, stored: dict) -> dict:
+    data = base64.b64decode(stored["sealed"])
+    return json.loads(AESGCM(_sealing_key(scoped_key)).decrypt(data[:12], data[12:], None))
+
+
+async def run_idempotent(
+    scope: str,
+    key: str,
+    body: dict,
+    handler: Callable[[], Awaitable[dict]],
+    *,
+    caller: str,
+    wait_timeout: float = 15.0,
+) -> dict:
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key header")
+
+    scoped_key = f"{scope}:{caller}:{key}"
+    key_hash = hash_token(scoped_key)
+    body_hash = request_hash(body)
+    now = utcnow()
+
+    async with AsyncSessionLocal() as db:
+        reserved = await db.scalar(
+            _RESERVE,
+            {
+                "key_hash": key_hash,
+                "request_hash": body_hash,
+                "now": now,
+                "expires_at": now + KEY_TTL,
+                "lease_cutoff": now - RESERVATION_LEASE,
+            },
+        )
+        await db.commit()
+
+    if reserved is None:
+        metrics.counter(f"idempotency.{scope}.replays").inc()
+        return await _await_stored(scoped_key, key_hash, body_hash, wait_timeout)
+
+    try:
+        result = await handler()
+    except BaseException:
+        async with AsyncSessionLocal() as db:
+            await db.execute(_RELEASE, {"key_hash": key_hash, "reserved_at": now})
+            await db.commit()
+        raise
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            _COMPLETE,
+            {"key_hash": key_hash, "reserved_at": now, "body": json.dumps(seal_response(scoped_key, result))},
+        )
+        await db.commit()
+    return result
+
+
+async def _await_stored(scoped_key: str, key_hash: str, body_hash: str, wait_timeout: float) -> dict:
+    deadline = time.monotonic() + wait_timeout
+    delay = 0.05
+    while True:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(_LOOKUP, {"key_hash": key_hash})).one_or_none()
+        if row is None:
+            # The first request failed and released the key; tell the client to retry.
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The original request with this Idempotency-Key failed. Please retry.",
+            )
+        if row.request_hash != body_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request body",
+            )
+        if row.response_body is not None:
+            try:
+                return open_response(scoped_key, row.response_body)
+            except (InvalidTag, KeyError, ValueError):
+                # Sealed under another JWT_SECRET (rotated since); the original result is gone.
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The stored response for this Idempotency-Key can no longer be read",
+                ) from None
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
@@ -0,0 +1,144 @@
+"""Near-duplicate review detection with MinHash and LSH banding.
+
+Each comment is normalized, cut into character 5-gram shingles and reduced
+to a 64-value MinHash signature.  The signature is split into 16 bands of 4
+values; each band is hashed to a BIGINT and stored in ``review_lsh_bands``.
+Two comments share at least one band hash with high probability once their
+Jaccard similarity passes roughly 0.5, so candidates come from a handful of
+primary-key lookups regardless of table size.  Candidates are then confirmed
+by comparing the stored signatures against ``NEAR_DUPLICATE_THRESHOLD``.
+
+Matches flag the new review with a ``near_duplicate`` reason, next to the
+PII reasons moderators already see.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import struct
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.jobs import review_enricher
+from app.models.entities import Review, ReviewLshBand, ReviewSignature
+from app.services.text import normalize_name
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUPLICATE_REASON = "near_duplicate"
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 50
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x11FE)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def shingles(text: str) -> set[str]:
+    normalized = " ".join(_NON_WORD.sub(" ", normalize_name(text)).split())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little")
+
+
+def minhash(text: str) -> list[int]:
+    hashes = [_hash64(s.encode("utf-8")) for s in shingles(text)]
+    # Values are truncated to 32 bits after taking the minimum: enough to
+    # compare signatures, half the storage.
+    return [min((a * h + b) % _PRIME for h in hashes) & 0xFFFFFFFF for a, b in _PERMS]
+
+
+def band_hashes(signature: list[int]) -> list[tuple[int, int]]:
+    bands = []
+    for band in range(BANDS):
+        rows = struct.pack(f"<{ROWS}I", *signature[band * ROWS : (band + 1) * ROWS])
+        bands.append((band, int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "little", signed=True)))
+    return bands
+
+
+def pack_signature(signature: list[int]) -> bytes:
+    return struct.pack(f"<{NUM_PERM}I", *signature)
+
+
+def unpack_signature(data: bytes) -> list[int]:
+    return list(struct.unpack(f"<{NUM_PERM}I", data))
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / NUM_PERM
+
+
+async def find_near_duplicates(
+    db: AsyncSession, signature: list[int], *, exclude_id: int | None = None, threshold: float | None = None
+) -> list[tuple[int, float]]:
+    """Return ``(review_id, similarity)`` pairs above ``threshold``, most similar first."""
+    threshold = settings.near_duplicate_threshold if threshold is None else threshold
+    query = (
+        select(ReviewLshBand.review_id)
+        .where(tuple_(ReviewLshBand.band, ReviewLshBand.band_hash).in_(band_hashes(signature)))
+        .distinct()
+        .limit(MAX_CANDIDATES)
+    )
+    if exclude_id is not None:
+        query = query.where(ReviewLshBand.review_id != exclude_id)
+    candidates = list((await db.execute(query)).scalars())
+    metrics.histogram("near_duplicates.candidates", (0, 1, 2, 5, 10, 25, 50)).observe(len(candidates))
+    if not candidates:
+        return []
+
+    rows = await db.execute(
+        select(ReviewSignature.review_id, ReviewSignature.signature).where(ReviewSignature.review_id.in_(candidates))
+    )
+    scored = [(review_id, similarity(signature, unpack_signature(data))) for review_id, data in rows.all()]
+    return sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+
+
+async def index_signature(db: AsyncSession, review_id: int, signature: list[int]) -> None:
+    await db.execute(
+        pg_insert(ReviewSignature)
+        .values(review_id=review_id, signature=pack_signature(signature))
+        .on_conflict_do_nothing(index_elements=["review_id"])
+    )
+    await db.execute(
+        pg_insert(ReviewLshBand).on_conflict_do_nothing(),
+        [{"band": band, "band_hash": band_hash, "review_id": review_id} for band, band_hash in band_hashes(signature)],
+    )
+
+
+async def flag_near_duplicates(db: AsyncSession, review: Review) -> None:
+    # Signing a long comment takes tens of milliseconds of CPU; off the event
+    # loop, the interpreter's switch interval keeps request handling going.
+    signature = await asyncio.to_thread(minhash, review.comment)
+    matches = await find_near_duplicates(db, signature, exclude_id=review.id)
+    await index_signature(db, review.id, signature)
+    if not matches:
+        return
+    metrics.counter("near_duplicates.flagged").inc()
+    logger.info("Review %s is a near duplicate of %s", review.id, [review_id for review_id, _ in matches[:5]])
+    reasons = list(review.pii_reasons or [])
+    if NEAR_DUPLICATE_REASON not in reasons:
+        # Assign a new list so the JSON column is marked dirty.
+        review.pii_reasons = [*reasons, NEAR_DUPLICATE_REASON]
+    review.pii_flagged = True
+
+
+if settings.near_duplicate_detection:
+    review_enricher(flag_near_duplicates)
@@ -0,0 +1,178 @@
+"""Micro-batched AI correction of address search queries.
+
+Zero-result searches tend to arrive in bursts.  Instead of issuing one
+Gemini call per query, concurrent corrections are collected for a short
+window and sent as a single numbered-list prompt.  Items the batch call
+cannot answer fall back to an individual ``generate_text`` call with
+whatever is left of the caller's budget; a caller whose budget runs out gets
+``None`` (no correction), so a correction never costs more than its budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+
+from app.core.config import settings
+from app.services.gemini import generate_text
+
+logger = logging.getLogger(__name__)
+
+_SINGLE_PROMPT = (
+    "Fix this Portuguese address search. Add missing prepositions "
+    "(de, do, da, dos, das), articles, or fix typos. "
+    "Return ONLY the corrected text, nothing else.\n\n"
+)
+
+_BATCH_PROMPT = (
+    "Fix each of these Portuguese address searches. Add missing prepositions "
+    "(de, do, da, dos, das), articles, or fix typos. "
+    "Answer with the same numbered list, one corrected search per line, "
+    "in the form '<number>. <corrected text>', and nothing else.\n\n"
+)
+
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.):-]\s*(.*?)\s*$")
+
+# Resolved into a caller's future when the batch produced no usable answer
+# for that item, so the caller retries it on its own.
+_UNANSWERED = object()
+
+# Share of the budget (after the collection window) the batch call may use;
+# the rest is left for individual fallbacks.
+_BATCH_SHARE = 0.8
+# Less budget than this left is not worth a fallback call.
+_MIN_FALLBACK_SECONDS = 0.1
+
+
+async def correct_single(q: str, deadline: float = 5.0) -> str | None:
+    """Correct one query with its own Gemini call."""
+    return await generate_text(
+        prompt=_SINGLE_PROMPT + q,
+        max_tokens=60,
+        temperature=0.0,
+        purpose="search",
+        queue_timeout=0.5,
+        deadline=deadline,
+    )
+
+
+def build_batch_prompt(queries: list[str]) -> str:
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(queries, start=1))
+    return _BATCH_PROMPT + numbered
+
+
+def parse_batch_answer(raw: str | None, size: int) -> list[str | None]:
+    """Map a numbered-list answer back onto ``size`` slots.
+
+    Lines that are missing, out of range or empty leave their slot as
+    ``None`` so the caller can retry that item on its own.
+    """
+    answers: list[str | None] = [None] * size
+    if not raw:
+        return answers
+    for line in raw.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        text = match.group(2).strip().strip('"').strip()
+        if 0 <= index < size and text and answers[index] is None:
+            answers[index] = text
+    return answers
+
+
+class CorrectionBatcher:
+    """Collect concurrent correction requests into one LLM call.
+
+    A batch is flushed when ``max_items`` distinct queries are pending or
+    ``window`` seconds after the first one arrived, whichever comes first.
+    Callers wait at most ``budget`` seconds in total, fallback included.
+    """
+
+    def __init__(self, *, window: float = 0.05, max_items: int = 8, budget: float = 5.0) -> None:
+        self.window = window
+        self.max_items = max(1, max_items)
+        self.budget = budget
+        # Ends before the first caller's budget does, so its answer is not lost
+        # to a race and unanswered items still have time for a fallback.
+        self.batch_deadline = max(0.0, budget - window) * _BATCH_SHARE
+        self._pending: dict[str, tuple[str, asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def correct(self, q: str, key: str | None = None) -> str | None:
+        key = key or q
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        entry = self._pending.get(key)
+        if entry is None:
+            future = loop.create_future()
+            self._pending[key] = (q, future)
+            if len(self._pending) >= self.max_items:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        else:
+            future = entry[1]
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=self.budget)
+        except TimeoutError:
+            logger.info("Batched correction exceeded %.2fs budget", self.budget)
+            return None
+        if result is _UNANSWERED:
+            remaining = self.budget - (loop.time() - started)
+            if remaining < _MIN_FALLBACK_SECONDS:
+                return None
+            return await correct_single(q, deadline=remaining)
+        return result
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = list(self._pending.values())
+        self._pending = {}
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        queries = [q for q, _ in batch]
+        answers: list[object]
+        try:
+            if len(queries) == 1:
+                # No point wrapping a lone query in the list prompt.
+                answers = [await correct_single(queries[0], deadline=self.batch_deadline)]
+            else:
+                raw = await generate_text(
+                    prompt=build_batch_prompt(queries),
+                    max_tokens=40 * len(queries),
+                    temperature=0.0,
+                    purpose="search",
+                    queue_timeout=0.5,
+                    deadline=self.batch_deadline,
+                )
+                if raw is None:
+                    # The API itself is unavailable; retrying each item would only
+                    # multiply the failing calls.
+                    answers = [None] * len(queries)
+                else:
+                    answers = [a if a is not None else _UNANSWERED for a in parse_batch_answer(raw, len(queries))]
+        except Exception:
+            logger.warning("Batched query correction failed", exc_info=True)
+            answers = [_UNANSWERED] * len(queries)
+
+        for (_q, future), answer in zip(batch, answers, strict=True):
+            if not future.done():
+                future.set_result(answer)
+
+
+correction_batcher = CorrectionBatcher(
+    window=settings.search_correction_batch_window_ms / 1000,
+    max_items=settings.search_correction_batch_max,
+)
@@ -0,0 +1,130 @@
+"""Group-commit writer for review submissions.
+
+When ``REVIEW_GROUP_COMMIT`` is enabled, validated reviews are handed to a
+single writer task instead of each request committing on its own.  The
+writer gathers submissions for a few milliseconds and commits them in one
+transaction: a multi-row ``INSERT ... RETURNING`` for the reviews, batched
+rate-limit counters/events and any enrichment jobs.  Each caller awaits its
+own future and still receives its own review id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.jobs import enqueue_review_enrichment
+from app.models.entities import Review
+from app.rate_limit.service import RateLimitHit, record_rate_limit_hits
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingReview:
+    values: dict
+    hit: RateLimitHit
+    future: asyncio.Future = field(repr=False)
+
+
+class GroupCommitWriter:
+    def __init__(self, *, window: float = 0.005, max_batch: int = 64) -> None:
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._queue: asyncio.Queue[_PendingReview] | None = None
+        self._task: asyncio.Task | None = None
+        # Taken off the queue but not resolved yet; failed by ``stop`` if cancelled.
+        self._batch: list[_PendingReview] = []
+
+    async def submit(self, values: dict, hit: RateLimitHit) -> int:
+        """Queue one review insert and wait for its id."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        assert self._queue is not None
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingReview(values, hit, future))
+        return await future
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Commit what is already queued, then stop; callers never hang on shutdown.
+
+        Submissions still unresolved after ``drain_timeout`` (or queued behind
+        a stuck commit) fail with ``RuntimeError`` instead of waiting forever.
+        """
+        if self._task is None:
+            return
+        if self._queue is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+            except TimeoutError:
+                logger.warning("Review writer did not drain within %.1fs", drain_timeout)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        pending = list(self._batch)
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._batch = []
+        for item in pending:
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Review writer stopped before the review was saved"))
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+            metrics.histogram("reviews.group_commit.batch_size", (1, 2, 4, 8, 16, 32, 64, 128)).observe(len(batch))
+            try:
+                await self._commit(batch)
+            except Exception:
+                # One bad row must not fail its neighbours: retry individually.
+                logger.warning("Group commit of %d reviews failed, retrying singly", len(batch), exc_info=True)
+                for item in batch:
+                    try:
+                        await self._commit([item])
+                    except Exception as exc:
+                        if not item.future.done():
+                            item.future.set_exception(exc)
+            self._batch = []
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _commit(self, batch: list[_PendingReview]) -> None:
+        async with AsyncSessionLocal() as db:
+            ids = (
+                await db.execute(
+                    insert(Review).returning(Review.id, sort_by_parameter_order=True),
+                    [item.values for item in batch],
+                )
+            ).scalars().all()
+            await record_rate_limit_hits(db, [item.hit for item in batch])
+            for review_id in ids:
+                enqueue_review_enrichment(db, review_id)
+            await db.commit()
+        for item, review_id in zip(batch, ids, strict=True):
+            if not item.future.done():
+                item.future.set_result(review_id)
+
+
+review_writer = GroupCommitWriter(
+    window=settings.review_group_commit_window_ms / 1000,
+    max_batch=settings.review_group_commit_max_batch,
+)
@@ -0,0 +1,97 @@
+"""Rebuild the admin dashboard rollups from ``reviews`` and ``reports``.
+
+Usage::
+
+    python -m app.tools.backfill_rollups
+
+The rollup tables are kept current by triggers; this recomputes them from
+history, e.g. right after the migration or if they are ever suspected to
+have drifted.  It runs in one transaction holding SHARE locks on ``reviews``
+and ``reports``, so writers wait for it and no trigger update can interleave
+with the rebuild.  The rebuilt counters all land in one shard, which
+readers sum with the others like any other.
+
+History only records when a review was created and approved and when a
+report was filed or resolved, so only those counters (and the status
+counts) are zeroed and rebuilt.  ``rejected``, ``changes_requested`` and
+``removed`` have no timestamp outside the rollups: what the triggers
+recorded is kept as-is, and moderation before the rollups existed is not
+back-filled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+
+BACKFILL_STATEMENTS = (
+    text("LOCK TABLE reviews, reports IN SHARE MODE"),
+    *(
+        text(
+            f"UPDATE {table} SET submitted = 0, pii_flagged = 0, approved = 0, approval_seconds = 0, "
+            "reports_created = 0, reports_resolved = 0"
+        )
+        for table in ("dashboard_rollup_hourly", "dashboard_rollup_daily")
+    ),
+    text("DELETE FROM review_status_counts"),
+    text(
+        """
+        SELECT bump_dashboard_rollups(g.hour, submitted => g.n, pii_flagged => g.flagged)
+        FROM (
+          SELECT rollup_hour(created_at) AS hour, count(*) AS n, count(*) FILTER (WHERE pii_flagged) AS flagged
+          FROM reviews GROUP BY 1
+        ) g
+        """
+    ),
+    text(
+        """
+        SELECT bump_dashboard_rollups(g.hour, approved => g.n, approval_seconds => g.seconds)
+        FROM (
+          SELECT rollup_hour(approved_at) AS hour, count(*) AS n,
+                 sum(extract(epoch FROM approved_at - created_at))::double precision AS seconds
+          FROM reviews WHERE approved_at IS NOT NULL GROUP BY 1
+        ) g
+        """
+    ),
+    text(
+        """
+        SELECT bump_dashboard_rollups(g.hour, reports_created => g.n)
+        FROM (SELECT rollup_hour(created_at) AS hour, count(*) AS n FROM reports GROUP BY 1) g
+        """
+    ),
+    text(
+        """
+        SELECT bump_dashboard_rollups(g.hour, reports_resolved => g.n)
+        FROM (
+          SELECT rollup_hour(resolved_at) AS hour, count(*) AS n
+          FROM reports WHERE resolved_at IS NOT NULL GROUP BY 1
+        ) g
+        """
+    ),
+    text("INSERT INTO review_status_counts (status, review_count) SELECT status, count(*) FROM reviews GROUP BY status"),
+)
+
+
+async def run_backfill() -> None:
+    async with AsyncSessionLocal() as db:
+        for statement in BACKFILL_STATEMENTS:
+            await db.execute(statement)
+        await db.commit()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the admin dashboard rollup tables.")
+    parser.parse_args(argv)
+
+    started = time.monotonic()
+    asyncio.run(run_backfill())
+    print(f"done: rollups rebuilt in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Bulk import of reviews from CSV or JSONL.
+
+Usage::
+
+    python -m app.tools.import_reviews partner.csv --status APPROVED
+    python -m app.tools.import_reviews survey.jsonl --chunk-size 10000 --workers 8
+
+Rows are streamed in chunks.  Validation, PII scanning and scoring run in a
+process pool; buildings are resolved through the places hierarchy with one
+lookup (and at most one insert) per level per chunk; reviews are written
+with Postgres ``COPY``.  Rows with blocking PII or invalid fields are
+skipped and counted, exactly as ``POST /reviews`` would reject them.
+
+Each row carries either ``building_id`` or a place (``country_code``,
+``city_name``, ``area_name``, ``street_name``, ``street_number``, ``lat``,
+``lng``) plus the usual review fields.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import secrets
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.security import hash_token, random_token
+from app.models.entities import Area, Building, City, Country, Street
+from app.models.enums import AuthorBadge, AuthorType, ReviewStatus
+from app.pii.scanner import RULESET_VERSION, scan_pii
+from app.schemas.reviews import ReviewBase
+from app.services.text import normalize_name
+
+REVIEW_COLUMNS = [
+    "building_id",
+    "author_type",
+    "author_badge",
+    "status",
+    "tracking_code",
+    "edit_token_hash",
+    "edit_token_expires_at",
+    "language_tag",
+    "lived_from_year",
+    "lived_to_year",
+    "lived_duration_months",
+    "people_noise",
+    "animal_noise",
+    "insulation",
+    "pest_issues",
+    "area_safety",
+    "neighbourhood_vibe",
+    "outdoor_spaces",
+    "parking",
+    "building_maintenance",
+    "construction_quality",
+    "overall_score",
+    "overall_score_rounded",
+    "comment",
+    "pii_flagged",
+    "pii_reasons",
+    "pii_ruleset_version",
+    "created_at",
+    "approved_at",
+]
+
+PlaceKey = tuple[str, str, str, str, int]
+
+
+class ImportRow(ReviewBase):
+    building_id: int | None = None
+    country_code: str = "PT"
+    city_name: str | None = None
+    area_name: str | None = None
+    street_name: str | None = None
+    street_number: int | None = None
+    lat: float | None = None
+    lng: float | None = None
+    created_at: datetime | None = None
+
+
+@dataclass
+class PreparedRow:
+    values: dict
+    building_id: int | None
+    place: PlaceKey | None
+    lat: float | None
+    lng: float | None
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    imported: int = 0
+    invalid: int = 0
+    blocked_pii: int = 0
+    unresolved: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"read={self.read} imported={self.imported} invalid={self.invalid} "
+            f"blocked_pii={self.blocked_pii} unresolved={self.unresolved} "
+            f"elapsed={elapsed:.1f}s rate={self.read / elapsed:.0f} rows/s"
+        )
+
+
+def _read_rows(path: Path, fmt: str) -> Iterator[dict]:
+    with path.open(encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            for row in csv.DictReader(handle):
+                yield {k: (v if v != "" else None) for k, v in row.items()}
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prepare_rows(raw_rows: list[dict], status: str) -> list[PreparedRow | str]:
+    """Validate, PII-scan and score rows (runs in a worker process).
+
+    Returns a ``PreparedRow`` per accepted row, or ``"invalid"`` /
+    ``"blocked_pii"`` for rejected ones.
+    """
+    from app.api.reviews import _score
+
+    now = datetime.now(UTC)
+    review_status = ReviewStatus(status)
+    results: list[PreparedRow | str] = []
+    for raw in raw_rows:
+        try:
+            row = ImportRow.model_validate(raw)
+        except ValidationError:
+            results.append("invalid")
+            continue
+
+        place: PlaceKey | None = None
+        if row.building_id is None:
+            if not (row.city_name and row.street_name and row.street_number and row.lat is not None and row.lng is not None):
+                results.append("invalid")
+                continue
+            place = (
+                row.country_code.upper(),
+                row.city_name.strip(),
+                (row.area_name or row.city_name).strip(),
+                row.street_name.strip(),
+                row.street_number,
+            )
+
+        flagged, reasons, blocked = scan_pii(row.comment)
+        if blocked:
+            results.append("blocked_pii")
+            continue
+
+        overall, rounded = _score(row)
+        created_at = row.created_at or now
+        results.append(
+            PreparedRow(
+                values={
+                    "author_type": AuthorType.ANONYMOUS.value,
+                    "author_badge": AuthorBadge.NONE.value,
+                    "status": review_status.value,
+                    "tracking_code": random_token(8)[:12].upper(),
+                    # Imported reviews have no author to hand an edit token to.
+                    "edit_token_hash": hash_token(secrets.token_hex(16)),
+                    "edit_token_expires_at": now,
+                    "language_tag": row.language_tag,
+                    "lived_from_year": row.lived_from_year,
+                    "lived_to_year": row.lived_to_year,
+                    "lived_duration_months": max(1, (row.lived_to_year - row.lived_from_year) * 12),
+                    "people_noise": row.people_noise,
+                    "animal_noise": row.animal_noise,
+                    "insulation": row.insulation,
+                    "pest_issues": row.pest_issues,
+                    "area_safety": row.area_safety,
+                    "neighbourhood_vibe": row.neighbourhood_vibe,
+                    "outdoor_spaces": row.outdoor_spaces,
+                    "parking": row.parking,
+                    "building_maintenance": row.building_maintenance,
+                    "construction_quality": row.construction_quality,
+                    "overall_score": Decimal(f"{overall:.2f}"),
+                    "overall_score_rounded": rounded,
+                    "comment": row.comment,
+                    "pii_flagged": flagged,
+                    "pii_reasons": json.dumps(reasons),
+                    "pii_ruleset_version": RULESET_VERSION,
+                    "created_at": created_at,
+                    "approved_at": created_at if review_status == ReviewStatus.APPROVED else None,
+                },
+                building_id=row.building_id,
+                place=place,
+                lat=row.lat,
+                lng=row.lng,
+            )
+        )
+    return results
+
+
+class BuildingResolver:
+    """Resolve place keys to building ids, one query per hierarchy level per batch.
+
+    Resolved ids are cached for the lifetime of the import, so repeated
+    addresses across chunks cost nothing.
+    """
+
+    def __init__(self) -> None:
+        self.countries: dict[str, int] = {}
+        self.cities: dict[tuple[int, str], int] = {}
+        self.areas: dict[tuple[int, str], int] = {}
+        self.streets: dict[tuple[int, str], int] = {}
+        self.buildings: dict[tuple[int, int], int] = {}
+
+    async def resolve(self, db: AsyncSession, rows: list[PreparedRow]) -> dict[PlaceKey, int]:
+        places = {row.place: row for row in rows if row.place is not None}
+        if not places:
+            return {}
+
+        codes = {p[0] for p in places}
+        await self._level(
+            db, self.countries, codes, Country,
+            select(Country.code, Country.id).where(Country.code.in_(codes - self.countries.keys())),
+            lambda c: {"code": c, "name_en": c, "name_pt": c},
+        )
+
+        city_keys = {(self.countries[p[0]], normalize_name(p[1])): p[1] for p in places}
+        await self._level(
+            db, self.cities, city_keys, City,
+            select(City.country_id, City.normalized_name, City.id).where(
+                tuple_(City.country_id, City.normalized_name).in_(list(city_keys.keys() - self.cities.keys()))
+            ),
+            lambda k: {"country_id": k[0], "name": city_keys[k], "normalized_name": k[1]},
+        )
+
+        def city_id(p: PlaceKey) -> int:
+            return self.cities[(self.countries[p[0]], normalize_name(p[1]))]
+
+        area_keys = {(city_id(p), normalize_name(p[2])): p[2] for p in places}
+        await self._level(
+            db, self.areas, area_keys, Area,
+            select(Area.city_id, Area.normalized_name, Area.id).where(
+                tuple_(Area.city_id, Area.normalized_name).in_(list(area_keys.keys() - self.areas.keys()))
+            ),
+            lambda k: {"city_id": k[0], "name": area_keys[k], "normalized_name": k[1]},
+        )
+
+        def area_id(p: PlaceKey) -> int:
+            return self.areas[(city_id(p), normalize_name(p[2]))]
+
+        street_keys = {(area_id(p), normalize_name(p[3])): p[3] for p in places}
+        await self._level(
+            db, self.streets, street_keys, Street,
+            select(Street.area_id, Street.normalized_name, Street.id).where(
+                tuple_(Street.area_id, Street.normalized_name).in_(list(street_keys.keys() - self.streets.keys()))
+            ),
+            lambda k: {"area_id": k[0], "name": street_keys[k], "normalized_name": k[1]},
+        )
+
+        def street_id(p: PlaceKey) -> int:
+            return self.streets[(area_id(p), normalize_name(p[3]))]
+
+        building_keys = {(street_id(p), p[4]): row for p, row in places.items()}
+        await self._level(
+            db, self.buildings, building_keys, Building,
+            select(Building.street_id, Building.street_number, Building.id).where(
+                Building.segment_id.is_(None),
+                tuple_(Building.street_id, Building.street_number).in_(list(building_keys.keys() - self.buildings.keys())),
+            ),
+            lambda k: {
+                "street_id": k[0],
+                "segment_id": None,
+                "street_number": k[1],
+                "lat": building_keys[k].lat,
+                "lng": building_keys[k].lng,
+            },
+        )
+
+        return {p: self.buildings[(street_id(p), p[4])] for p in places}
+
+    async def _level(self, db, cache, wanted, model, lookup, new_values) -> None:
+        missing = set(wanted) - cache.keys()
+        if not missing:
+            return
+        for *key, ident in (await db.execute(lookup)).all():
+            cache[key[0] if len(key) == 1 else tuple(key)] = ident
+        to_create = [k for k in missing if k not in cache]
+        if to_create:
+            result = await db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [new_values(k) for k in to_create],
+            )
+            for key, ident in zip(to_create, result.scalars().all(), strict=True):
+                cache[key] = ident
+
+
+async def _copy_reviews(db: AsyncSession, records: list[tuple]) -> None:
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table("reviews", records=records, columns=REVIEW_COLUMNS)
+
+
+async def run_import(path: Path, fmt: str, status: str, chunk_size: int, workers: int) -> ImportStats:
+    stats = ImportStats()
+    resolver = BuildingResolver()
+    loop = asyncio.get_running_loop()
+    sub_size = max(1, chunk_size // max(1, workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _chunks(_read_rows(path, fmt), chunk_size):
+            stats.read += len(chunk)
+            parts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, prepare_rows, chunk[i : i + sub_size], status)
+                    for i in range(0, len(chunk), sub_size)
+                )
+            )
+            prepared: list[PreparedRow] = []
+            for outcome in (item for part in parts for item in part):
+                if outcome == "invalid":
+                    stats.invalid += 1
+                elif outcome == "blocked_pii":
+                    stats.blocked_pii += 1
+                else:
+                    prepared.append(outcome)
+
+            async with AsyncSessionLocal() as db:
+                by_place = await resolver.resolve(db, prepared)
+                known_ids = {row.building_id for row in prepared if row.building_id is not None}
+                if known_ids:
+                    existing = set((await db.execute(select(Building.id).where(Building.id.in_(known_ids)))).scalars())
+                else:
+                    existing = set()
+
+                records = []
+                for row in prepared:
+                    building_id = by_place.get(row.place) if row.place else row.building_id
+                    if building_id is None or (row.place is None and building_id not in existing):
+                        stats.unresolved += 1
+                        continue
+                    values = {**row.values, "building_id": building_id}
+                    records.append(tuple(values[col] for col in REVIEW_COLUMNS))
+
+                if records:
+                    await _copy_reviews(db, records)
+                await db.commit()
+            stats.imported += len(records)
+            print(stats.line(), file=sys.stderr, flush=True)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import reviews from CSV or JSONL.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="defaults to the file extension")
+    parser.add_argument("--status", choices=[ReviewStatus.PENDING.value, ReviewStatus.APPROVED.value], default=ReviewStatus.PENDING.value)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.path.suffix.lower() in {".jsonl", ".ndjson"} else "csv")
+    stats = asyncio.run(run_import(args.path, fmt, args.status, args.chunk_size, args.workers))
+    print(f"done: {stats.line()}")
+
+
+if __name__ == "__main__":
+    main()
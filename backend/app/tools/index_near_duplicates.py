@@ -0,0 +1,89 @@
+"""Build MinHash signatures and LSH bands for reviews that have none.
+
+Usage::
+
+    python -m app.tools.index_near_duplicates --batch-size 2000 --workers 4
+
+New reviews are indexed by the ``review.enrich`` job; this backfills rows
+that existed before near-duplicate detection or were bulk imported.  It only
+indexes — existing reviews are not flagged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.database import AsyncSessionLocal
+from app.models.entities import Review, ReviewLshBand, ReviewSignature
+from app.services.near_duplicates import band_hashes, minhash, pack_signature
+
+
+def signatures(rows: list[tuple[int, str]]) -> list[tuple[int, list[int]]]:
+    return [(review_id, minhash(comment)) for review_id, comment in rows]
+
+
+async def run_backfill(batch_size: int, workers: int) -> int:
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    indexed = 0
+    last_id = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            async with AsyncSessionLocal() as db:
+                rows = (
+                    await db.execute(
+                        select(Review.id, Review.comment)
+                        .outerjoin(ReviewSignature, ReviewSignature.review_id == Review.id)
+                        .where(ReviewSignature.review_id.is_(None), Review.id > last_id)
+                        .order_by(Review.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+            if not rows:
+                return indexed
+            last_id = rows[-1].id
+
+            step = max(1, len(rows) // workers)
+            parts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, signatures, [tuple(row) for row in rows[i : i + step]])
+                    for i in range(0, len(rows), step)
+                )
+            )
+            computed = [item for part in parts for item in part]
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    pg_insert(ReviewSignature).on_conflict_do_nothing(),
+                    [{"review_id": review_id, "signature": pack_signature(sig)} for review_id, sig in computed],
+                )
+                await db.execute(
+                    pg_insert(ReviewLshBand).on_conflict_do_nothing(),
+                    [
+                        {"band": band, "band_hash": band_hash, "review_id": review_id}
+                        for review_id, sig in computed
+                        for band, band_hash in band_hashes(sig)
+                    ],
+                )
+                await db.commit()
+            indexed += len(computed)
+            elapsed = max(time.monotonic() - started, 1e-9)
+            print(f"indexed={indexed} rate={indexed / elapsed:.0f} rows/s", file=sys.stderr, flush=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill near-duplicate signatures for existing reviews.")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+    print(f"done: indexed={asyncio.run(run_backfill(args.batch_size, args.workers))}")
+
+
+if __name__ == "__main__":
+    main()
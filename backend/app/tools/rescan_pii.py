@@ -0,0 +1,178 @@
+"""Re-scan stored reviews after the PII rules change.
+
+Usage::
+
+    python -m app.tools.rescan_pii
+    python -m app.tools.rescan_pii --batch-size 5000 --workers 8
+
+Reviews stamped with an older ``pii_ruleset_version`` are streamed through a
+server-side cursor, scanned in a process pool and written back in batches:
+rows whose flags changed get one UPDATE each (pipelined with executemany),
+unchanged rows only have their version bumped with a single set-based
+UPDATE.  Progress is committed per batch, so an interrupted run resumes
+where it stopped.
+
+Both UPDATEs only touch a row whose version, comment (by md5) and reasons are
+still what the scan read.  A review edited meanwhile was already re-scanned
+by the edit; one whose reasons changed (e.g. a ``near_duplicate`` flag from
+the enrichment job) keeps its old version and is picked up by the next run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from sqlalchemy import select, text
+
+from app.core.database import AsyncSessionLocal
+from app.models.entities import Review
+from app.pii.scanner import BLOCKING_CATEGORIES, RULESET_VERSION, SCANNER_CATEGORIES, scan_pii
+
+_UPDATE_FLAGS = text(
+    """
+    UPDATE reviews
+    SET pii_flagged = :flagged, pii_reasons = CAST(:reasons AS JSON), pii_ruleset_version = :version
+    WHERE id = :id
+      AND pii_ruleset_version < :version
+      AND md5(comment) = :comment_md5
+      AND pii_reasons::jsonb IS NOT DISTINCT FROM CAST(:old_reasons AS JSONB)
+    """
+)
+_STAMP_VERSION = text(
+    """
+    UPDATE reviews AS r
+    SET pii_ruleset_version = :version
+    FROM unnest(CAST(:ids AS INTEGER[]), CAST(:comment_md5s AS TEXT[]), CAST(:old_reasons AS TEXT[]))
+      AS s(id, comment_md5, old_reasons)
+    WHERE r.id = s.id
+      AND r.pii_ruleset_version < :version
+      AND md5(r.comment) = s.comment_md5
+      AND r.pii_reasons::jsonb IS NOT DISTINCT FROM CAST(s.old_reasons AS JSONB)
+    """
+)
+
+@dataclass
+class RescanStats:
+    scanned: int = 0
+    changed: int = 0
+    newly_blocked: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"scanned={self.scanned} changed={self.changed} newly_blocked={self.newly_blocked} "
+            f"elapsed={elapsed:.1f}s rate={self.scanned / elapsed:.0f} rows/s"
+        )
+
+
+@dataclass
+class BatchResult:
+    changed: list[dict]
+    unchanged: list[int]
+    newly_blocked: int
+    # What each scan read: ``(md5(comment), pii_reasons as JSON)`` by review id.
+    read_as: dict[int, tuple[str, str | None]] = field(default_factory=dict)
+
+
+def rescan_batch(rows: list[tuple[int, str, bool, list]]) -> BatchResult:
+    """Scan ``(id, comment, pii_flagged, pii_reasons)`` rows (runs in a worker process)."""
+    result = BatchResult(changed=[], unchanged=[], newly_blocked=0)
+    for review_id, comment, old_flagged, old_reasons in rows:
+        result.read_as[review_id] = (
+            hashlib.md5(comment.encode()).hexdigest(),
+            None if old_reasons is None else json.dumps(old_reasons),
+        )
+        flagged, reasons, blocked = scan_pii(comment)
+        # Reasons added outside the scanner (e.g. near_duplicate) are kept.
+        extra = [reason for reason in old_reasons or [] if reason not in SCANNER_CATEGORIES]
+        reasons += [reason for reason in extra if reason not in reasons]
+        flagged = flagged or bool(extra)
+        if flagged == old_flagged and reasons == list(old_reasons or []):
+            result.unchanged.append(review_id)
+            continue
+        if blocked and not BLOCKING_CATEGORIES.intersection(old_reasons or []):
+            result.newly_blocked += 1
+        result.changed.append({"id": review_id, "flagged": flagged, "reasons": reasons})
+    return result
+
+
+async def _write_back(result: BatchResult, version: int) -> None:
+    async with AsyncSessionLocal() as db:
+        if result.changed:
+            await db.execute(
+                _UPDATE_FLAGS,
+                [
+                    {
+                        "id": row["id"],
+                        "flagged": row["flagged"],
+                        "reasons": json.dumps(row["reasons"]),
+                        "version": version,
+                        "comment_md5": result.read_as[row["id"]][0],
+                        "old_reasons": result.read_as[row["id"]][1],
+                    }
+                    for row in result.changed
+                ],
+            )
+        if result.unchanged:
+            await db.execute(
+                _STAMP_VERSION,
+                {
+                    "ids": result.unchanged,
+                    "comment_md5s": [result.read_as[review_id][0] for review_id in result.unchanged],
+                    "old_reasons": [result.read_as[review_id][1] for review_id in result.unchanged],
+                    "version": version,
+                },
+            )
+        await db.commit()
+
+async def run_rescan(batch_size: int, workers: int, version: int = RULESET_VERSION) -> RescanStats:
+    stats = RescanStats()
+    loop = asyncio.get_running_loop()
+    in_flight: list[asyncio.Future[BatchResult]] = []
+
+    async def drain(limit: int) -> None:
+        while len(in_flight) > limit:
+            result = await in_flight.pop(0)
+            await _write_back(result, version)
+            stats.scanned += len(result.changed) + len(result.unchanged)
+            stats.changed += len(result.changed)
+            stats.newly_blocked += result.newly_blocked
+            print(stats.line(), file=sys.stderr, flush=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with AsyncSessionLocal() as reader:
+            stream = await reader.stream(
+                select(Review.id, Review.comment, Review.pii_flagged, Review.pii_reasons)
+                .where(Review.pii_ruleset_version < version)
+                .order_by(Review.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for partition in stream.partitions(batch_size):
+                rows = [tuple(row) for row in partition]
+                in_flight.append(loop.run_in_executor(pool, rescan_batch, rows))
+                # Keep every worker busy while bounding memory to a few batches.
+                await drain(workers * 2)
+        await drain(0)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-scan stored reviews with the current PII rules.")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run_rescan(args.batch_size, args.workers))
+    print(f"done (ruleset v{RULESET_VERSION}): {stats.line()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Shared test setup.
+
+Settings need a ``DATABASE_URL`` to initialize; none of these tests connect
+to it.  ``fake_db`` stands in for an ``AsyncSession`` in handler tests.
+"""
+
+import os
+
+# Ensure settings can initialize in test context
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://x:x@localhost/x")
+
+import pytest
+
+
+class FakeResult:
+    """A query result holding a single ``value``, whatever accessor reads it."""
+
+    def __init__(self, value=None) -> None:
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def one_or_none(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class FakeDb:
+    """Records executed statements and added objects; every query returns ``result``."""
+
+    def __init__(self, result=None) -> None:
+        self.result = result
+        self.statements: list[tuple[object, dict | None]] = []
+        self.added: list = []
+        self.committed = False
+
+    async def execute(self, statement, params=None) -> FakeResult:
+        self.statements.append((statement, params))
+        return FakeResult(self.result)
+
+    def add(self, obj) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        for index, obj in enumerate(self.added, start=1):
+            if getattr(obj, "id", None) is None:
+                obj.id = index
+
+    async def commit(self) -> None:
+        self.committed = True
+
+
+@pytest.fixture
+def fake_db() -> type[FakeDb]:
+    return FakeDb
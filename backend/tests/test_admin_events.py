@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from app.services import admin_events as module
+from app.services.admin_events import QUEUE_SIZE, AdminEventHub, format_sse
+
+
+@pytest.fixture
+def hub(monkeypatch) -> AdminEventHub:
+    async def no_listen(self) -> None:
+        return None
+
+    monkeypatch.setattr(AdminEventHub, "_listen", no_listen)
+    return AdminEventHub()
+
+
+def test_dsn_drops_the_sqlalchemy_driver() -> None:
+    assert module._dsn() == "postgresql://x:x@localhost/x"
+
+
+def test_format_sse_frames_event() -> None:
+    frame = format_sse({"type": "review.created", "id": 5})
+    assert frame == 'event: review.created\ndata: {"type":"review.created","id":5}\n\n'
+
+
+@pytest.mark.asyncio
+async def test_notifications_fan_out_to_every_subscriber(hub: AdminEventHub) -> None:
+    first, second = hub.subscribe(), hub.subscribe()
+    hub._on_notify(None, 1, "admin_events", json.dumps({"type": "report.created", "id": 9, "review_id": 3}))
+    assert first.get_nowait() == second.get_nowait() == {"type": "report.created", "id": 9, "review_id": 3}
+
+    hub.unsubscribe(second)
+    hub._on_notify(None, 1, "admin_events", "not json")
+    hub._on_notify(None, 1, "admin_events", json.dumps({"type": "review.status_changed", "id": 1}))
+    assert first.get_nowait()["type"] == "review.status_changed"
+    assert second.empty()
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events(hub: AdminEventHub) -> None:
+    queue = hub.subscribe()
+    for i in range(QUEUE_SIZE + 3):
+        hub.publish({"type": "review.created", "id": i})
+    assert queue.qsize() == QUEUE_SIZE
+    assert queue.get_nowait()["id"] == 3
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_subscribes_only_once_streaming(hub: AdminEventHub, monkeypatch) -> None:
+    from app.api import admin
+
+    class _Db:
+        async def close(self) -> None:
+            return None
+
+    class _Request:
+        async def is_disconnected(self) -> bool:
+            return False
+
+    monkeypatch.setattr(admin, "admin_events", hub)
+    response = await admin.admin_event_stream(_Request(), _Db(), None)
+    # Never started (client already gone): nothing to clean up.
+    assert hub._subscribers == set()
+
+    body = response.body_iterator
+    assert await body.__anext__() == "retry: 3000\n\n"
+    assert len(hub._subscribers) == 1
+    await body.aclose()
+    assert hub._subscribers == set()
+    await hub.stop()
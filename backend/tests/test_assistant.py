@@ -1,12 +1,7 @@
 """Tests for the AI assistant endpoint logic."""
 
-import os
-
 import pytest
 
-# Provide a dummy DATABASE_URL so Settings can instantiate outside Docker
-os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://x:x@localhost/x")
-
 from app.api.assistant import (
     _extract_json,
     _looks_like_place_query,
@@ -0,0 +1,79 @@
+from datetime import UTC, date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.entities import DashboardRollupDaily, DashboardRollupHourly, ReviewStatusCount
+from app.services.dashboard_stats import COUNTERS, bucket_range, build_series, series_query
+from app.tools.backfill_rollups import BACKFILL_STATEMENTS
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _row(**values):
+    return SimpleNamespace(**{**dict.fromkeys(COUNTERS, 0), "approval_seconds": 0.0, **values})
+
+
+def test_counters_exist_on_both_rollup_tables() -> None:
+    for model in (DashboardRollupHourly, DashboardRollupDaily):
+        assert set(COUNTERS) | {"approval_seconds"} <= set(model.__table__.columns.keys())
+
+
+def test_hourly_buckets_end_at_the_current_utc_hour() -> None:
+    now = datetime(2026, 10, 19, 14, 37, tzinfo=UTC)
+    buckets = bucket_range("hour", 3, now)
+    assert buckets == [datetime(2026, 10, 19, hour, tzinfo=UTC) for hour in (12, 13, 14)]
+
+
+def test_daily_buckets_use_the_utc_date() -> None:
+    # 23:30 at UTC+1 is still 22:30 on the 18th in UTC.
+    now = datetime(2026, 10, 18, 23, 30, tzinfo=timezone(timedelta(hours=1)))
+    assert bucket_range("day", 2, now) == [date(2026, 10, 17), date(2026, 10, 18)]
+
+
+def test_series_is_zero_filled_and_derives_rates() -> None:
+    buckets = [date(2026, 10, 17), date(2026, 10, 18), date(2026, 10, 19)]
+    rows = [_row(day=date(2026, 10, 18), submitted=4, pii_flagged=1, approved=2, approval_seconds=600.0)]
+    series = build_series("day", buckets, rows)
+    assert [point["bucket"] for point in series] == ["2026-10-17", "2026-10-18", "2026-10-19"]
+    assert series[0]["submitted"] == 0 and series[0]["pii_flag_rate"] is None
+    assert series[1]["pii_flag_rate"] == 0.25
+    assert series[1]["avg_approval_seconds"] == 300.0
+    assert series[2]["avg_approval_seconds"] is None
+
+
+def test_series_query_reads_only_the_requested_window() -> None:
+    sql = _sql(series_query("hour", datetime(2026, 10, 19, tzinfo=UTC)))
+    assert "FROM dashboard_rollup_hourly" in sql
+    assert "dashboard_rollup_hourly.bucket >= '2026-10-19 00:00:00+00:00'" in sql
+    assert "FROM reviews" not in sql
+
+
+def test_backfill_locks_writers_before_resetting() -> None:
+    statements = [str(statement) for statement in BACKFILL_STATEMENTS]
+    assert statements[0].startswith("LOCK TABLE reviews, reports IN SHARE MODE")
+    assert statements[1].startswith("UPDATE dashboard_rollup_hourly SET")
+    assert statements[2].startswith("UPDATE dashboard_rollup_daily SET")
+    assert statements[3] == "DELETE FROM review_status_counts"
+    assert all("bump_dashboard_rollups" in sql for sql in statements[4:-1])
+
+
+def test_backfill_keeps_counters_it_cannot_rebuild() -> None:
+    sql = " ".join(str(statement) for statement in BACKFILL_STATEMENTS)
+    assert "TRUNCATE" not in sql
+    for column in ("rejected", "changes_requested", "removed"):
+        assert column not in sql
+
+
+def test_series_query_sums_shards_per_bucket() -> None:
+    sql = _sql(series_query("day", date(2026, 10, 1)))
+    assert "sum(dashboard_rollup_daily.submitted)" in sql
+    assert "sum(dashboard_rollup_daily.approval_seconds)" in sql
+    assert "GROUP BY dashboard_rollup_daily.day" in sql
+
+
+def test_rollup_tables_are_keyed_by_shard() -> None:
+    for model in (DashboardRollupHourly, DashboardRollupDaily, ReviewStatusCount):
+        assert "shard" in [column.name for column in model.__table__.primary_key.columns]
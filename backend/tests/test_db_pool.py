@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy.pool import QueuePool
+
+from app.core import database, metrics
+from app.core.config import settings
+from app.core.pool import InstrumentedPool, ping_idle_connections, register_pool_gauges
+
+
+class _FakePool:
+    def __init__(self, idle: int) -> None:
+        self.idle = idle
+        self.in_use = 0
+
+    def checkedin(self) -> int:
+        return self.idle
+
+
+class _FakeConnection:
+    def __init__(self, pool: _FakePool, fail: bool) -> None:
+        self.pool = pool
+        self.fail = fail
+
+    async def __aenter__(self):
+        self.pool.idle -= 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.pool.idle += 1
+
+    async def exec_driver_sql(self, sql: str) -> None:
+        if self.fail:
+            raise ConnectionError("server closed the connection")
+
+
+class _FakeEngine:
+    def __init__(self, idle: int, failing: int = 0) -> None:
+        self.pool = _FakePool(idle)
+        self.failing = failing
+        self.connects = 0
+
+    def connect(self) -> _FakeConnection:
+        self.connects += 1
+        return _FakeConnection(self.pool, fail=self.connects <= self.failing)
+
+
+def test_engine_options_follow_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_pool_size", 12)
+    monkeypatch.setattr(settings, "db_max_overflow", 3)
+    monkeypatch.setattr(settings, "db_pool_liveness", "background")
+    options = database.engine_options()
+    assert options["poolclass"] is InstrumentedPool
+    assert (options["pool_size"], options["max_overflow"]) == (12, 3)
+    assert options["pool_pre_ping"] is False
+
+
+def test_primary_engine_uses_the_instrumented_pool() -> None:
+    assert isinstance(database.engine.pool, InstrumentedPool)
+    snapshot = metrics.snapshot()
+    assert snapshot["db.pool.primary.size"] == settings.db_pool_size
+    assert snapshot["db.pool.primary.overflow"] == 0
+
+
+def test_checkout_wait_is_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(QueuePool, "_do_get", lambda self: "entry")
+    pool = InstrumentedPool(lambda: None, pool_size=1)
+    register_pool_gauges("test", type("Engine", (), {"pool": pool})())
+    before = metrics.histogram("db.pool.test.wait_seconds").count
+    assert pool._do_get() == "entry"
+    assert metrics.histogram("db.pool.test.wait_seconds").count == before + 1
+
+
+@pytest.mark.asyncio
+async def test_ping_cycles_through_each_idle_connection_once() -> None:
+    engine = _FakeEngine(idle=3, failing=1)
+    assert await ping_idle_connections(engine) == 1
+    assert engine.connects == 3
+
+
+@pytest.mark.asyncio
+async def test_ping_skips_when_nothing_is_idle() -> None:
+    engine = _FakeEngine(idle=0)
+    assert await ping_idle_connections(engine) == 0
+    assert engine.connects == 0
@@ -0,0 +1,207 @@
+from types import SimpleNamespace
+
+import aiosmtplib
+import pytest
+
+from app.core.config import settings
+from app.services import email_outbox
+from app.services.email_outbox import EmailDispatcher
+
+
+class _Result:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class _FakeSession:
+    def __init__(self, store: dict) -> None:
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, statement, params=None):
+        self.store["statements"].append((str(statement), params))
+        return _Result(self.store.pop("claim", []))
+
+    async def commit(self) -> None:
+        return None
+
+
+class _FakeSmtp:
+    instances: list["_FakeSmtp"] = []
+
+    def __init__(self, **options) -> None:
+        self.options = options
+        self.is_connected = False
+        self.sent: list = []
+        self.refuse: set[str] = set()
+        _FakeSmtp.instances.append(self)
+
+    async def connect(self) -> None:
+        self.is_connected = True
+
+    async def send_message(self, message) -> None:
+        if message["To"] in self.refuse:
+            raise aiosmtplib.SMTPRecipientsRefused([])
+        self.sent.append(message)
+
+    async def quit(self) -> None:
+        self.is_connected = False
+
+
+def _row(id: int, recipient: str, attempts: int = 1, max_attempts: int = 6):
+    return SimpleNamespace(
+        id=id, recipient=recipient, subject="Hello", body="Body", attempts=attempts, max_attempts=max_attempts
+    )
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> dict:
+    store: dict = {"statements": []}
+    _FakeSmtp.instances.clear()
+    monkeypatch.setattr(email_outbox, "AsyncSessionLocal", lambda: _FakeSession(store))
+    monkeypatch.setattr(email_outbox.aiosmtplib, "SMTP", _FakeSmtp)
+    monkeypatch.setattr(settings, "send_real_email", True)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_batches_share_one_smtp_connection(store: dict) -> None:
+    dispatcher = EmailDispatcher()
+    store["claim"] = [_row(1, "a@example.com"), _row(2, "b@example.com")]
+    assert await dispatcher.dispatch_once(10) == 2
+    store["claim"] = [_row(3, "c@example.com")]
+    assert await dispatcher.dispatch_once(10) == 1
+
+    assert len(_FakeSmtp.instances) == 1
+    assert [m["To"] for m in _FakeSmtp.instances[0].sent] == ["a@example.com", "b@example.com", "c@example.com"]
+    assert _FakeSmtp.instances[0].options["start_tls"] is True
+    sent_updates = [params for sql, params in store["statements"] if "status = 'DONE'" in sql]
+    assert sent_updates == [{"ids": [1, 2]}, {"ids": [3]}]
+
+
+@pytest.mark.asyncio
+async def test_refused_message_is_retried_with_backoff_and_others_still_sent(store: dict) -> None:
+    dispatcher = EmailDispatcher()
+    await dispatcher._connection()
+    _FakeSmtp.instances[0].refuse = {"bad@example.com"}
+    store["claim"] = [
+        _row(1, "bad@example.com", attempts=2),
+        _row(2, "ok@example.com"),
+        _row(3, "bad@example.com", attempts=6),
+    ]
+    await dispatcher.dispatch_once(10)
+
+    failed = next(params for sql, params in store["statements"] if "last_error = :error" in sql)
+    assert [(item["id"], item["status"], item["delay"]) for item in failed] == [
+        (1, "QUEUED", 10.0),
+        (3, "FAILED", 160.0),
+    ]
+    assert next(params for sql, params in store["statements"] if "status = 'DONE'" in sql) == {"ids": [2]}
+
+
+@pytest.mark.asyncio
+async def test_connection_loss_requeues_the_rest_of_the_batch(store: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def disconnect(self, message) -> None:
+        raise aiosmtplib.SMTPServerDisconnected("gone")
+
+    monkeypatch.setattr(_FakeSmtp, "send_message", disconnect)
+    dispatcher = EmailDispatcher()
+    store["claim"] = [_row(1, "a@example.com", attempts=3), _row(2, "b@example.com"), _row(3, "c@example.com")]
+    await dispatcher.dispatch_once(10)
+
+    failed = next(params for sql, params in store["statements"] if "last_error = :error" in sql)
+    assert [item["id"] for item in failed] == [1]
+    assert "gone" in failed[0]["error"]
+    # Never attempted: back in the queue without being charged an attempt.
+    sql, requeued = next((sql, params) for sql, params in store["statements"] if "attempts - 1" in sql)
+    assert requeued == {"ids": [2, 3], "delay": failed[0]["delay"]}
+    assert dispatcher._smtp is None
+
+
+@pytest.mark.asyncio
+async def test_dropped_idle_connection_is_reopened_once(store: dict) -> None:
+    dispatcher = EmailDispatcher()
+    stale = await dispatcher._connection()
+
+    async def disconnect(message) -> None:
+        raise aiosmtplib.SMTPServerDisconnected("idle timeout")
+
+    stale.send_message = disconnect
+    store["claim"] = [_row(1, "a@example.com"), _row(2, "b@example.com")]
+    await dispatcher.dispatch_once(10)
+
+    assert len(_FakeSmtp.instances) == 2
+    assert [m["To"] for m in _FakeSmtp.instances[1].sent] == ["a@example.com", "b@example.com"]
+    assert next(params for sql, params in store["statements"] if "status = 'DONE'" in sql) == {"ids": [1, 2]}
+    assert not any("last_error = :error" in sql for sql, _params in store["statements"])
+
+
+def test_final_failure_blanks_the_body() -> None:
+    assert "body = CASE WHEN :status = 'FAILED' THEN ''" in str(email_outbox._MARK_FAILED)
+
+
+@pytest.mark.asyncio
+async def test_dev_mode_logs_instead_of_connecting(store: dict, monkeypatch: pytest.MonkeyPatch, caplog) -> None:
+    monkeypatch.setattr(settings, "send_real_email", False)
+    store["claim"] = [_row(1, "a@example.com")]
+    with caplog.at_level("INFO"):
+        await EmailDispatcher().dispatch_once(10)
+    assert "DEV_EMAIL a@example.com" in caplog.text
+    assert _FakeSmtp.instances == []
+
+
+@pytest.mark.asyncio
+async def test_dedupe_check_locks_the_key_before_looking() -> None:
+    calls: list[str] = []
+
+    class _Db:
+        async def execute(self, statement, params=None):
+            calls.append(str(statement))
+
+        async def scalar(self, statement, params=None):
+            calls.append(str(statement))
+            return True
+
+    assert await email_outbox.recently_enqueued(_Db(), "magic_link:a@example.com", 60) is True
+    assert "pg_advisory_xact_lock" in calls[0]
+    assert "dedupe_key = :key" in calls[1]
+
+
+@pytest.mark.asyncio
+async def test_dev_mode_returns_a_link_for_every_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.api import auth
+    from app.schemas.auth import RequestLinkPayload
+
+    async def recently_enqueued(db, key, window):
+        raise AssertionError("dedupe only applies to real email")
+
+    class _Db:
+        def add(self, obj) -> None:
+            return None
+
+        async def commit(self) -> None:
+            return None
+
+    monkeypatch.setattr(settings, "send_real_email", False)
+    monkeypatch.setattr(auth, "recently_enqueued", recently_enqueued)
+    payload = RequestLinkPayload(email="a@example.com")
+    first = await auth.request_magic_link(payload, _Db())
+    again = await auth.request_magic_link(payload, _Db())
+    assert first["dev_link"] and again["dev_link"]
+    assert first["dev_link"] != again["dev_link"]
+
+
+def test_claim_fails_stale_emails_that_used_up_their_attempts() -> None:
+    sql = " ".join(str(email_outbox._CLAIM).split())
+    exhausted, claim = sql.split(") UPDATE email_outbox", 1)
+    assert "SET status = 'FAILED', body = ''" in exhausted
+    assert "attempts >= max_attempts" in exhausted
+    assert "AND attempts < max_attempts )" in claim
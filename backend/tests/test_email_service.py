@@ -1,12 +1,7 @@
-import os
+from email.message import EmailMessage
 
 import pytest
 
-# Ensure settings can initialize in test context
-os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://x:x@localhost/x")
-
-from email.message import EmailMessage
-
 from app.core.config import settings
 from app.services import email as email_service
 
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from app.rate_limit.gcra import Decision, GcraLimit, MemoryBackend, PublicRateLimiter, RouteGroup, gcra_step
+
+
+def test_gcra_allows_burst_then_blocks() -> None:
+    limit = GcraLimit(count=3, period=60)
+    tat = None
+    results = []
+    for _ in range(4):
+        allowed, tat, retry_after = gcra_step(tat, 1000.0, limit)
+        results.append(allowed)
+    assert results == [True, True, True, False]
+    assert retry_after == pytest.approx(20.0)
+
+
+def test_gcra_refills_at_emission_interval() -> None:
+    limit = GcraLimit(count=3, period=60)
+    tat = None
+    for _ in range(3):
+        _, tat, _ = gcra_step(tat, 1000.0, limit)
+    allowed, _, _ = gcra_step(tat, 1020.0, limit)
+    assert allowed is True
+
+
+def test_gcra_first_request_is_allowed_at_any_clock_value() -> None:
+    limit = GcraLimit(count=1, period=60)
+    # 32708.418493185844 + 60 - 32708.418493185844 > 60 in binary floating point.
+    for now in (0.1, 32708.418493185844, 1.7e9 + 0.3):
+        assert gcra_step(None, now, limit)[0] is True
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_idle_keys(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr("app.rate_limit.gcra.time.monotonic", lambda: clock[0])
+    backend = MemoryBackend()
+    limit = GcraLimit(count=10, period=10)
+
+    await backend.hit("a", limit)
+    await backend.hit("b", limit)
+    assert len(backend) == 2
+
+    clock[0] += 60
+    await backend.hit("c", limit)
+    assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_caps_key_count() -> None:
+    backend = MemoryBackend(max_keys=2)
+    limit = GcraLimit(count=10, period=3600)
+    for key in ("a", "b", "c"):
+        await backend.hit(key, limit)
+    assert len(backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_matches_route_groups() -> None:
+    limiter = PublicRateLimiter(
+        [RouteGroup("search", ("/api/search",), GcraLimit(1, 60), frozenset({"GET"}))],
+        MemoryBackend(),
+    )
+    assert await limiter.check("GET", "/api/reviews", "1.2.3.4") is None
+    assert (await limiter.check("GET", "/api/search", "1.2.3.4")).allowed is True
+    assert (await limiter.check("GET", "/api/search", "1.2.3.4")).allowed is False
+    assert (await limiter.check("GET", "/api/search", "5.6.7.8")).allowed is True
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_response_carries_cors_headers(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app import main
+
+    async def check(method, path, client_ip):
+        return Decision(False, retry_after=2.5)
+
+    monkeypatch.setattr(main.public_limiter, "check", check)
+    origin = main.origins[0]
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        response = await client.get("/api/search", params={"q": "rua"}, headers={"Origin": origin})
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+    assert response.headers["access-control-allow-origin"] == origin
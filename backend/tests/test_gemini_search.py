@@ -1,14 +1,9 @@
 """Tests for the Gemini service wrapper and search normalisation."""
 
 import asyncio
-import os
 
 import pytest
 
-# Provide a dummy DATABASE_URL so Settings can instantiate outside Docker
-os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://x:x@localhost/x")
-
-
 # ---- tests for the gemini service ----
 
 def test_generate_text_returns_none_without_api_key(monkeypatch):
@@ -58,3 +53,111 @@ def test_normalize_name_handles_prepositions():
     assert a != b
     assert "de" in b
     assert "de" not in a
+
+
+# ---- tests for the per-purpose bulkhead ----
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    """Keep throwaway bulkheads' metrics out of the process-wide registry."""
+    from app.core import metrics
+    monkeypatch.setattr(metrics, "_registry", {})
+
+
+@pytest.mark.asyncio
+async def test_saturated_bulkhead_rejects_fast(monkeypatch, fresh_metrics):
+    """When every slot for a purpose is taken, calls fail fast instead of queueing."""
+    import app.core.config as cfg
+    from app.services import gemini
+
+    monkeypatch.setattr(cfg.settings, "gemini_api_key", "KEY")
+    bulkhead = gemini._Bulkhead("test_saturated", 1)
+    monkeypatch.setitem(gemini._bulkheads, "search", bulkhead)
+
+    await bulkhead.semaphore.acquire()
+    try:
+        result = await gemini.generate_text("hello", queue_timeout=0.01, deadline=1.0)
+    finally:
+        bulkhead.semaphore.release()
+
+    assert result is None
+    assert bulkhead.rejected.value == 1
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_records_latency(monkeypatch, fresh_metrics):
+    import app.core.config as cfg
+    from app.services import gemini
+
+    async def fake_post(url, body, *, timeout, bulkhead):
+        assert timeout <= 2.0
+        return "ok"
+
+    monkeypatch.setattr(cfg.settings, "gemini_api_key", "KEY")
+    monkeypatch.setattr(gemini, "_post", fake_post)
+    bulkhead = gemini._Bulkhead("test_latency", 2)
+    monkeypatch.setitem(gemini._bulkheads, "assistant", bulkhead)
+
+    result = await gemini.generate_chat([{"role": "user", "text": "hi"}], deadline=2.0)
+
+    assert result == "ok"
+    assert bulkhead.latency.count == 1
+    assert bulkhead.rejected.value == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_the_whole_call(monkeypatch, fresh_metrics):
+    """A server that keeps the request alive past the deadline is cut off at the deadline."""
+    import time
+
+    import httpx
+
+    import app.core.config as cfg
+    from app.services import gemini
+
+    async def trickle(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(cfg.settings, "gemini_api_key", "KEY")
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kwargs: real_client(transport=httpx.MockTransport(trickle), **kwargs)
+    )
+    bulkhead = gemini._Bulkhead("test_deadline", 1)
+    monkeypatch.setitem(gemini._bulkheads, "search", bulkhead)
+
+    started = time.monotonic()
+    result = await gemini.generate_text("hello", deadline=0.2)
+
+    assert result is None
+    assert time.monotonic() - started < 1.0
+    assert bulkhead.timeouts.value == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_never_leak_a_permit(monkeypatch, fresh_metrics):
+    import app.core.config as cfg
+    from app.services import gemini
+
+    started = asyncio.Event()
+
+    async def hanging_post(url, body, *, timeout, bulkhead):
+        started.set()
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(cfg.settings, "gemini_api_key", "KEY")
+    monkeypatch.setattr(gemini, "_post", hanging_post)
+    bulkhead = gemini._Bulkhead("test_cancel", 1)
+    monkeypatch.setitem(gemini._bulkheads, "search", bulkhead)
+
+    running = asyncio.create_task(gemini.generate_text("one", queue_timeout=1.0, deadline=5.0))
+    await started.wait()
+    queued = asyncio.create_task(gemini.generate_text("two", queue_timeout=1.0, deadline=5.0))
+    await asyncio.sleep(0.01)
+    for task in (queued, running):
+        task.cancel()
+    await asyncio.gather(running, queued, return_exceptions=True)
+
+    assert not bulkhead.semaphore.locked()
+    assert bulkhead.semaphore._value == 1
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import idempotency
+from app.services.idempotency import caller_identity, request_hash, run_idempotent
+
+
+def test_request_hash_ignores_key_order() -> None:
+    assert request_hash({"a": 1, "b": 2}) == request_hash({"b": 2, "a": 1})
+    assert request_hash({"a": 1}) != request_hash({"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_overlong_key_is_rejected_before_touching_the_db() -> None:
+    async def handler() -> dict:
+        raise AssertionError("handler must not run")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await run_idempotent("reviews", "x" * 300, {}, handler, caller="fp:abc")
+    assert exc_info.value.status_code == 400
+
+
+class _Row:
+    def __init__(self, request_hash: str, reserved_at) -> None:
+        self.request_hash = request_hash
+        self.reserved_at = reserved_at
+        self.response_body = None
+
+
+class _Result:
+    def __init__(self, row) -> None:
+        self.row = row
+
+    def one_or_none(self):
+        return self.row
+
+
+class _FakeSession:
+    """Emulates the four idempotency statements against an in-memory table."""
+
+    def __init__(self, rows: dict[str, _Row]) -> None:
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+    async def scalar(self, statement, params):
+        assert statement is idempotency._RESERVE
+        row = self.rows.get(params["key_hash"])
+        if row is not None and not (row.response_body is None and row.reserved_at < params["lease_cutoff"]):
+            return None
+        self.rows[params["key_hash"]] = _Row(params["request_hash"], params["now"])
+        return params["key_hash"]
+
+    async def execute(self, statement, params):
+        key_hash = params["key_hash"]
+        if statement is idempotency._LOOKUP:
+            return _Result(self.rows.get(key_hash))
+        row = self.rows.get(key_hash)
+        if row is None or row.reserved_at != params["reserved_at"]:
+            return _Result(None)
+        if statement is idempotency._COMPLETE:
+            row.response_body = json.loads(params["body"])
+        elif statement is idempotency._RELEASE and row.response_body is None:
+            del self.rows[key_hash]
+        return _Result(None)
+
+
+@pytest.fixture
+def table(monkeypatch: pytest.MonkeyPatch) -> dict[str, _Row]:
+    rows: dict[str, _Row] = {}
+    monkeypatch.setattr(idempotency, "AsyncSessionLocal", lambda: _FakeSession(rows))
+    return rows
+
+
+class _Handler:
+    def __init__(self, result: dict | None = None, error: Exception | None = None) -> None:
+        self.calls = 0
+        self.result = result or {"id": 1, "edit_token": "secret-edit-token"}
+        self.error = error
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_the_stored_response_without_rerunning(table) -> None:
+    handler = _Handler()
+    first = await run_idempotent("reviews", "k1", {"a": 1}, handler, caller="fp:abc")
+    again = await run_idempotent("reviews", "k1", {"a": 1}, handler, caller="fp:abc")
+    assert first == again == handler.result
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stored_response_is_sealed(table) -> None:
+    await run_idempotent("reviews", "k1", {"a": 1}, _Handler(), caller="fp:abc")
+    (row,) = table.values()
+    assert "secret-edit-token" not in json.dumps(row.response_body)
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_the_caller(table) -> None:
+    handler = _Handler()
+    await run_idempotent("reviews", "k1", {"a": 1}, handler, caller="fp:abc")
+    await run_idempotent("reviews", "k1", {"a": 1}, handler, caller="fp:def")
+    assert handler.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_reusing_a_key_with_another_body_is_rejected(table) -> None:
+    await run_idempotent("reviews", "k1", {"a": 1}, _Handler(), caller="fp:abc")
+    with pytest.raises(HTTPException) as exc_info:
+        await run_idempotent("reviews", "k1", {"a": 2}, _Handler(), caller="fp:abc")
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_the_key(table) -> None:
+    with pytest.raises(HTTPException):
+        await run_idempotent("reviews", "k1", {}, _Handler(error=HTTPException(status_code=429)), caller="fp:abc")
+    assert table == {}
+    retry = _Handler()
+    assert await run_idempotent("reviews", "k1", {}, retry, caller="fp:abc") == retry.result
+    assert retry.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_the_first_request(table) -> None:
+    handler = _Handler()
+    handler.release.clear()
+    first = asyncio.create_task(run_idempotent("reviews", "k1", {}, handler, caller="fp:abc"))
+    await asyncio.sleep(0)
+    duplicate = asyncio.create_task(run_idempotent("reviews", "k1", {}, handler, caller="fp:abc"))
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    assert await first == await duplicate == handler.result
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_sees_the_first_request_fail(table) -> None:
+    handler = _Handler(error=RuntimeError("boom"))
+    handler.release.clear()
+    first = asyncio.create_task(run_idempotent("reviews", "k1", {}, handler, caller="fp:abc"))
+    await asyncio.sleep(0)
+    duplicate = asyncio.create_task(run_idempotent("reviews", "k1", {}, handler, caller="fp:abc"))
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    with pytest.raises(RuntimeError):
+        await first
+    with pytest.raises(HTTPException) as exc_info:
+        await duplicate
+    assert exc_info.value.status_code == 409
+
+
+def test_anonymous_callers_need_a_fingerprint() -> None:
+    user_id = uuid.uuid4()
+    assert caller_identity(user_id, "abc") == f"user:{user_id}"
+    assert caller_identity(None, "abc") == "fp:abc"
+    with pytest.raises(HTTPException) as exc_info:
+        caller_identity(None, None)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_abandoned_reservation_is_taken_over_after_its_lease(table) -> None:
+    await run_idempotent("reviews", "k1", {}, _Handler(), caller="fp:abc")
+    (row,) = table.values()
+    # The holder died before storing its response.
+    row.response_body = None
+    row.reserved_at -= idempotency.RESERVATION_LEASE + timedelta(seconds=1)
+
+    retry = _Handler()
+    assert await run_idempotent("reviews", "k1", {}, retry, caller="fp:abc") == retry.result
+    assert retry.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_late_holder_cannot_overwrite_a_taken_over_reservation(table) -> None:
+    slow = _Handler(result={"id": 1})
+    slow.release.clear()
+    first = asyncio.create_task(run_idempotent("reviews", "k1", {}, slow, caller="fp:abc"))
+    await asyncio.sleep(0)
+    (row,) = table.values()
+    row.reserved_at -= idempotency.RESERVATION_LEASE + timedelta(seconds=1)
+
+    retry = _Handler(result={"id": 2})
+    assert await run_idempotent("reviews", "k1", {}, retry, caller="fp:abc") == {"id": 2}
+    slow.release.set()
+    await first
+    assert await run_idempotent("reviews", "k1", {}, _Handler(), caller="fp:abc") == {"id": 2}
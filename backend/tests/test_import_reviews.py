@@ -0,0 +1,67 @@
+import json
+
+from app.tools.import_reviews import REVIEW_COLUMNS, PreparedRow, _read_rows, prepare_rows
+
+_RATINGS = {
+    "people_noise": 3,
+    "animal_noise": 4,
+    "insulation": 4,
+    "pest_issues": 5,
+    "area_safety": 4,
+    "neighbourhood_vibe": 4,
+    "outdoor_spaces": 3,
+    "parking": 2,
+    "building_maintenance": 4,
+    "construction_quality": 4,
+}
+
+
+def _row(**overrides) -> dict:
+    row = {
+        "city_name": "Lisboa",
+        "street_name": "Avenida da República",
+        "street_number": "100",
+        "lat": "38.73",
+        "lng": "-9.14",
+        "lived_from_year": "2020",
+        "lived_to_year": "2023",
+        "comment": "Quiet building with good insulation and friendly neighbours.",
+        **{k: str(v) for k, v in _RATINGS.items()},
+    }
+    row.update(overrides)
+    return row
+
+
+def test_prepare_rows_accepts_valid_row() -> None:
+    [prepared] = prepare_rows([_row()], "APPROVED")
+    assert isinstance(prepared, PreparedRow)
+    assert prepared.place == ("PT", "Lisboa", "Lisboa", "Avenida da República", 100)
+    assert prepared.values["status"] == "APPROVED"
+    assert prepared.values["approved_at"] is not None
+    assert float(prepared.values["overall_score"]) == 3.7
+    assert set(prepared.values) | {"building_id"} == set(REVIEW_COLUMNS)
+
+
+def test_prepare_rows_rejects_invalid_and_blocked_rows() -> None:
+    results = prepare_rows(
+        [
+            _row(people_noise="9"),
+            _row(street_name=None),
+            _row(comment="Call the landlord on +351 912345678 any time."),
+        ],
+        "PENDING",
+    )
+    assert results == ["invalid", "invalid", "blocked_pii"]
+
+
+def test_read_rows_streams_csv_and_jsonl(tmp_path) -> None:
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("building_id,comment\n7,hello\n,\n", encoding="utf-8")
+    assert list(_read_rows(csv_path, "csv")) == [
+        {"building_id": "7", "comment": "hello"},
+        {"building_id": None, "comment": None},
+    ]
+
+    jsonl_path = tmp_path / "rows.jsonl"
+    jsonl_path.write_text(json.dumps({"building_id": 7}) + "\n\n", encoding="utf-8")
+    assert list(_read_rows(jsonl_path, "jsonl")) == [{"building_id": 7}]
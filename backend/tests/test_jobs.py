@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.jobs import queue
+from app.jobs.queue import _handlers, backoff_seconds, next_poll_interval, register, wake_workers, worker_loop
+
+
+def test_backoff_grows_exponentially_and_caps() -> None:
+    assert backoff_seconds(1) == 5.0
+    assert backoff_seconds(2) == 10.0
+    assert backoff_seconds(4) == 40.0
+    assert backoff_seconds(50) == 3600.0
+
+
+def test_register_adds_handler() -> None:
+    @register("test.noop")
+    async def noop(db, payload) -> None:
+        return None
+
+    assert _handlers["test.noop"] is noop
+
+
+def test_review_enrich_handler_is_registered() -> None:
+    import app.jobs  # noqa: F401
+
+    assert "review.enrich" in _handlers
+
+
+def test_idle_poll_interval_doubles_up_to_the_cap() -> None:
+    assert next_poll_interval(1.0, 1.0, 30.0) == 2.0
+    assert next_poll_interval(16.0, 1.0, 30.0) == 30.0
+    assert next_poll_interval(30.0, 1.0, 30.0) == 30.0
+
+
+@pytest.mark.asyncio
+async def test_idle_worker_backs_off_and_wakes_on_enqueue(monkeypatch: pytest.MonkeyPatch) -> None:
+    polls: list[float] = []
+
+    async def run_one() -> bool:
+        polls.append(asyncio.get_running_loop().time())
+        return False
+
+    monkeypatch.setattr(queue, "run_one", run_one)
+    worker = asyncio.create_task(worker_loop(0.01, 60.0))
+    try:
+        await asyncio.sleep(0.2)
+        idle_polls = len(polls)
+        # Doubling from 10ms gives a handful of polls, not twenty.
+        assert 3 <= idle_polls <= 6
+        wake_workers()
+        await asyncio.sleep(0.01)
+        assert len(polls) == idle_polls + 1
+    finally:
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+    assert not queue._idle_workers
+
+
+@pytest.mark.asyncio
+async def test_enqueue_wakes_workers_once_after_commit(monkeypatch: pytest.MonkeyPatch) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    wakes: list[int] = []
+    monkeypatch.setattr(queue, "wake_workers", lambda: wakes.append(1))
+    db = AsyncSession()
+    queue.enqueue(db, "review.enrich", {})
+    queue.enqueue(db, "review.enrich", {})
+    assert wakes == []
+    db.expunge_all()
+    await db.commit()
+    assert wakes == [1]
+    db.sync_session.begin()
+    await db.commit()
+    assert wakes == [1]
+
+
+def test_claim_fails_stale_jobs_that_used_up_their_attempts() -> None:
+    sql = " ".join(str(queue._CLAIM).split())
+    exhausted, claim = sql.split(") UPDATE jobs", 1)
+    assert "SET status = 'FAILED'" in exhausted
+    assert "attempts >= max_attempts" in exhausted
+    assert "AND attempts < max_attempts )" in claim
@@ -0,0 +1,122 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api.admin import _apply_status
+
+from app.models.enums import ReviewStatus
+from app.moderation.queue import (
+    CLAIM_STATEMENT,
+    QueueFilters,
+    bulk_transition_statement,
+    claim_blocks,
+    decode_cursor,
+    encode_cursor,
+    queue_query,
+)
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime(2026, 10, 1, 12, 30, 5, 123456, tzinfo=UTC)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "MjAyNi0xMC0wMQ"])
+def test_decode_cursor_rejects_garbage(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_queue_query_uses_keyset_and_filters() -> None:
+    after = (datetime(2026, 10, 1, tzinfo=UTC), 7)
+    sql = _sql(queue_query(QueueFilters(ReviewStatus.PENDING, pii_flagged=True, language="pt"), after, 51))
+    assert "reviews.status = 'PENDING'" in sql
+    assert "reviews.pii_flagged IS true" in sql
+    assert "reviews.language_tag = 'pt'" in sql
+    assert "(reviews.created_at, reviews.id) > ('2026-10-01 00:00:00+00:00', 7)" in sql
+    assert "ORDER BY reviews.created_at, reviews.id" in sql
+    assert "LIMIT 51" in sql
+    assert "OFFSET" not in sql
+    # Only a preview of the comment leaves the database.
+    assert "substr(reviews.comment, 1, 280)" in sql
+
+
+def test_queue_query_without_cursor_or_optional_filters() -> None:
+    sql = _sql(queue_query(QueueFilters(ReviewStatus.CHANGES_REQUESTED), None, 10))
+    assert "reviews.status = 'CHANGES_REQUESTED'" in sql
+    assert "pii_flagged" not in sql.split("WHERE", 1)[1]
+    assert "author_badge" not in sql.split("WHERE", 1)[1]
+
+
+def test_bulk_transition_is_one_locked_set_based_statement() -> None:
+    sql = _sql(bulk_transition_statement([3, 1, 2], ReviewStatus.REJECTED, None, "spam"))
+    assert sql.count("UPDATE reviews") == 1
+    assert "FOR UPDATE" in sql
+    assert "reviews.id IN (3, 1, 2)" in sql
+    assert "targets.status IN ('CHANGES_REQUESTED', 'PENDING')" in sql
+    assert "approved_at" not in sql
+
+
+def test_bulk_approval_stamps_approved_at() -> None:
+    sql = _sql(bulk_transition_statement([1], ReviewStatus.APPROVED, None, None))
+    assert "approved_at=now()" in sql
+
+
+def test_bulk_transition_skips_rows_leased_to_others() -> None:
+    sql = _sql(bulk_transition_statement([1], ReviewStatus.APPROVED, None, None))
+    assert "targets.claimed IS NOT true" in sql
+    assert "claimed_by=NULL" in sql
+
+
+def test_claim_statement_skips_locked_rows() -> None:
+    sql = str(CLAIM_STATEMENT)
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "claim_expires_at < now()" in sql
+
+
+def test_claim_blocks_only_for_live_leases_of_others() -> None:
+    me, other = uuid.uuid4(), uuid.uuid4()
+    later = datetime.now(UTC) + timedelta(minutes=5)
+    earlier = datetime.now(UTC) - timedelta(minutes=5)
+    assert claim_blocks(other, later, me)
+    assert not claim_blocks(me, later, me)
+    assert not claim_blocks(other, earlier, me)
+    assert not claim_blocks(None, None, me)
+
+
+def test_apply_status_refuses_review_claimed_by_another_moderator() -> None:
+    review = SimpleNamespace(
+        status=ReviewStatus.PENDING,
+        claimed_by=uuid.uuid4(),
+        claim_expires_at=datetime.now(UTC) + timedelta(minutes=5),
+    )
+    with pytest.raises(HTTPException) as exc:
+        _apply_status(review, ReviewStatus.APPROVED, SimpleNamespace(id=uuid.uuid4()))
+    assert exc.value.status_code == 409
+
+
+def test_apply_status_clears_own_lease() -> None:
+    admin = SimpleNamespace(id=uuid.uuid4())
+    review = SimpleNamespace(
+        status=ReviewStatus.PENDING,
+        claimed_by=admin.id,
+        claim_expires_at=datetime.now(UTC) + timedelta(minutes=5),
+    )
+    _apply_status(review, ReviewStatus.REJECTED, admin, "spam")
+    assert review.status == ReviewStatus.REJECTED
+    assert review.claimed_by is None and review.claim_expires_at is None
+
+
+def test_every_status_queue_has_a_keyset_index() -> None:
+    from app.models.entities import Review
+
+    indexes = {index.name: [column.name for column in index.columns] for index in Review.__table__.indexes}
+    assert indexes["ix_review_status_created_at"] == ["status", "created_at", "id"]
@@ -0,0 +1,73 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import near_duplicates
+from app.services.near_duplicates import (
+    BANDS,
+    band_hashes,
+    minhash,
+    pack_signature,
+    shingles,
+    similarity,
+    unpack_signature,
+)
+
+SPAM = (
+    "Amazing flat, best landlord ever! Contact our agency for the cheapest rents in Lisbon, "
+    "available now with no deposit and immediate move-in for students."
+)
+SPAM_VARIANT = (
+    "Amazing flat, best landlord ever!! Contact our agency for the cheapest rents in Porto, "
+    "available now with no deposit and immediate move in for students."
+)
+GENUINE = (
+    "The building was quiet during the week but the heating in winter never worked properly, "
+    "and the neighbours upstairs had a dog that barked at night."
+)
+
+
+def test_shingles_ignore_case_accents_and_punctuation() -> None:
+    assert shingles("Ótimo   PRÉDIO!!") == shingles("otimo predio")
+
+
+def test_near_duplicates_share_bands_and_score_high() -> None:
+    a, b, c = minhash(SPAM), minhash(SPAM_VARIANT), minhash(GENUINE)
+    assert similarity(a, b) >= 0.8
+    assert similarity(a, c) < 0.3
+    assert set(band_hashes(a)) & set(band_hashes(b))
+    assert not set(band_hashes(a)) & set(band_hashes(c))
+
+
+def test_signature_round_trip_and_band_layout() -> None:
+    signature = minhash(GENUINE)
+    assert unpack_signature(pack_signature(signature)) == signature
+    assert len(pack_signature(signature)) == 256
+    bands = band_hashes(signature)
+    assert [band for band, _ in bands] == list(range(BANDS))
+    assert all(-(2**63) <= value < 2**63 for _, value in bands)
+    assert minhash(GENUINE) == signature
+
+
+@pytest.mark.asyncio
+async def test_signing_runs_off_the_event_loop_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: list[int] = []
+
+    def recording_minhash(text: str) -> list[int]:
+        threads.append(threading.get_ident())
+        return minhash(text)
+
+    async def no_matches(db, signature, *, exclude_id=None, threshold=None):
+        return []
+
+    async def no_index(db, review_id, signature) -> None:
+        return None
+
+    monkeypatch.setattr(near_duplicates, "minhash", recording_minhash)
+    monkeypatch.setattr(near_duplicates, "find_near_duplicates", no_matches)
+    monkeypatch.setattr(near_duplicates, "index_signature", no_index)
+
+    review = SimpleNamespace(id=1, comment=GENUINE, pii_reasons=[], pii_flagged=False)
+    await near_duplicates.flag_near_duplicates(None, review)
+    assert threads and threads[0] != threading.get_ident()
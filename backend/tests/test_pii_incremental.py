@@ -0,0 +1,84 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pii import check_pii
+from app.pii.incremental import PiiSessionStore, apply_edit, summarize
+from app.pii.scanner import find_pii, scan_pii
+from app.schemas.reviews import PiiCheckPayload, PiiEdit
+
+
+def _full_scan(text):
+    return sorted(find_pii(text), key=lambda m: (m.start, m.end, m.category))
+
+
+def test_apply_edit_matches_full_rescan_under_random_edits() -> None:
+    pieces = list("aZ09 .-+@:/º,\n\t_%") + [
+        "www.", "http://", "351 ", "+351", "PT50 ", "andar", "Maria ", "Silva ", "me@ex.com", ". ",
+        "912 ", "1234 ", "12345678 ", "9AB1", "5", "7",
+    ]
+    rng = random.Random(7)
+    for _ in range(400):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+        matches = find_pii(text)
+        for _ in range(30):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, min(len(text), start + 6))
+            insert = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 4)))
+            text, matches = apply_edit(text, matches, start, end, insert)
+            assert matches == _full_scan(text), text
+
+
+def test_apply_edit_rescans_when_the_edit_moves_a_cut_point() -> None:
+    text = "x 1234 912 345 678"
+    new_text, matches = apply_edit(text, find_pii(text), 6, 6, "+")
+    assert matches == _full_scan(new_text)
+    assert [(m.category, m.start, m.end) for m in matches] == [("phone", 8, 19)]
+
+
+def test_summarize_agrees_with_scan_pii() -> None:
+    text = "Maria Silva Santos lives at 3º andar, call +351 912345678 or https://x.pt"
+    assert summarize(find_pii(text)) == scan_pii(text)
+
+
+def test_apply_edit_rejects_out_of_range() -> None:
+    with pytest.raises(ValueError):
+        apply_edit("short", [], 3, 10, "x")
+
+
+def test_session_store_evicts_least_recent() -> None:
+    store = PiiSessionStore(max_sessions=2)
+    store.put("a", "one", [])
+    store.put("b", "two", [])
+    store.get("a")
+    store.put("c", "three", [])
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert len(store) == 2
+
+
+@pytest.mark.asyncio
+async def test_check_pii_incremental_session_flow() -> None:
+    request = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"))
+    first = await check_pii(PiiCheckPayload(text="Nice flat, write to ", session_key="session-123"), request)
+    assert first["blocked"] is False
+
+    second = await check_pii(
+        PiiCheckPayload(
+            session_key="session-123",
+            edit=PiiEdit(start=20, end=20, insert="me@example.com"),
+            base_length=first["length"],
+        ),
+        request,
+    )
+    assert second["blocked"] is True
+    assert second["spans"] == [{"category": "email", "start": 20, "end": 34, "blocking": True}]
+
+    other_client = SimpleNamespace(client=SimpleNamespace(host="10.0.0.2"))
+    with pytest.raises(HTTPException) as exc:
+        await check_pii(
+            PiiCheckPayload(session_key="session-123", edit=PiiEdit(start=0, end=0, insert="x")), other_client
+        )
+    assert exc.value.status_code == 409
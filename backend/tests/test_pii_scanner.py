@@ -1,4 +1,6 @@
-from app.pii.scanner import scan_pii
+import time
+
+from app.pii.scanner import find_pii, scan_pii
 
 
 def test_scan_pii_detects_email_and_phone() -> None:
@@ -51,3 +53,35 @@ def test_scan_pii_portuguese_phone_format() -> None:
     assert flagged is True
     assert "phone" in reasons
     assert blocked is True
+
+
+def test_find_pii_returns_typed_spans() -> None:
+    text = "Write to me@test.com or visit www.example.org"
+    matches = find_pii(text)
+    by_category = {match.category: match for match in matches}
+    assert text[by_category["email"].start : by_category["email"].end] == "me@test.com"
+    assert by_category["email"].blocking is True
+    assert text[by_category["url"].start : by_category["url"].end] == "www.example.org"
+    assert by_category["url"].blocking is False
+
+
+def test_find_pii_skips_rules_without_triggers() -> None:
+    assert find_pii("quiet street, lovely neighbours, no complaints at all") == []
+
+
+def test_scan_pii_adversarial_inputs_stay_fast() -> None:
+    inputs = [
+        "a" * 5000,
+        "a" * 4999 + "@",
+        "a@" + "a." * 2499,
+        "1" * 5000,
+        "1 " * 2500,
+        "1234567x" * 625,
+        "Abcdef  " * 625,
+        "AB12 " * 1000,
+        "Ab1@. " * 833,
+    ]
+    for text in inputs:
+        started = time.perf_counter()
+        scan_pii(text)
+        assert time.perf_counter() - started < 0.05, text[:20]
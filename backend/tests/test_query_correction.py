@@ -0,0 +1,101 @@
+"""Tests for micro-batched search query correction."""
+
+import asyncio
+
+import pytest
+
+from app.services import query_correction
+from app.services.query_correction import CorrectionBatcher, build_batch_prompt, parse_batch_answer
+
+
+def test_build_batch_prompt_numbers_queries():
+    prompt = build_batch_prompt(["rua joao freitas", "av republica"])
+    assert "1. rua joao freitas" in prompt
+    assert "2. av republica" in prompt
+
+
+def test_parse_batch_answer_maps_numbers_to_slots():
+    raw = "2) Avenida da República\n1. Rua João de Freitas\nnoise line\n7. out of range"
+    assert parse_batch_answer(raw, 2) == ["Rua João de Freitas", "Avenida da República"]
+
+
+def test_parse_batch_answer_leaves_missing_items_empty():
+    assert parse_batch_answer("1. Rua Augusta", 3) == ["Rua Augusta", None, None]
+    assert parse_batch_answer(None, 2) == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_generate_text(prompt: str, **kwargs):
+        calls.append(prompt)
+        return "1. Rua A corrigida\n2. Rua B corrigida"
+
+    monkeypatch.setattr(query_correction, "generate_text", fake_generate_text)
+    batcher = CorrectionBatcher(window=0.01, max_items=8)
+
+    results = await asyncio.gather(batcher.correct("rua a"), batcher.correct("rua b"))
+
+    assert results == ["Rua A corrigida", "Rua B corrigida"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_unanswered_item_falls_back_to_individual_call(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_generate_text(prompt: str, **kwargs):
+        calls.append(prompt)
+        if "numbered list" in prompt:
+            return "1. Rua A corrigida"
+        return "Rua B individual"
+
+    monkeypatch.setattr(query_correction, "generate_text", fake_generate_text)
+    batcher = CorrectionBatcher(window=0.01, max_items=8)
+
+    results = await asyncio.gather(batcher.correct("rua a"), batcher.correct("rua b"))
+
+    assert results == ["Rua A corrigida", "Rua B individual"]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_budget_exhausted_returns_no_correction(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_generate_text(prompt: str, **kwargs):
+        calls.append(prompt)
+        await asyncio.sleep(1)
+        return None
+
+    monkeypatch.setattr(query_correction, "generate_text", fake_generate_text)
+    batcher = CorrectionBatcher(window=0.01, max_items=2, budget=0.05)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await asyncio.gather(batcher.correct("rua a"), batcher.correct("rua b"))
+
+    assert results == [None, None]
+    assert loop.time() - started < 0.5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_calls_fit_inside_the_caller_budget(monkeypatch):
+    deadlines: dict[str, float] = {}
+
+    async def fake_generate_text(prompt: str, **kwargs):
+        if "numbered list" in prompt:
+            deadlines["batch"] = kwargs["deadline"]
+            return "1. Rua A corrigida"
+        deadlines["single"] = kwargs["deadline"]
+        return "Rua B individual"
+
+    monkeypatch.setattr(query_correction, "generate_text", fake_generate_text)
+    batcher = CorrectionBatcher(window=0.01, max_items=8, budget=2.0)
+
+    await asyncio.gather(batcher.correct("rua a"), batcher.correct("rua b"))
+
+    assert deadlines["batch"] < 2.0 - 0.01
+    assert 0 < deadlines["single"] <= 2.0
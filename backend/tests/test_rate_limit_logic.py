@@ -1,5 +1,7 @@
 from datetime import UTC, datetime, timedelta
 
+import pytest
+
 
 def _check(count_ip: int, count_building: int, count_fp: int) -> str | None:
     if count_ip >= 5:
@@ -27,3 +29,53 @@ def test_window_math_example() -> None:
     now = datetime.now(UTC)
     since = now - timedelta(hours=24)
     assert since < now
+
+
+def test_exceeded_limit_precedence() -> None:
+    from app.rate_limit.service import RateLimitConfig, exceeded_limit
+
+    config = RateLimitConfig(window_hours=24, ip_max=5, building_max=5, fp_max=3)
+    assert exceeded_limit(5, 5, 3, config) == "IP limit exceeded"
+    assert exceeded_limit(0, 5, 3, config) == "Building limit exceeded"
+    assert exceeded_limit(0, 0, 3, config) == "Fingerprint limit exceeded"
+    assert exceeded_limit(4, 4, 2, config) is None
+
+
+def test_config_defaults_depend_on_environment(monkeypatch) -> None:
+    from app.core.config import settings
+    from app.rate_limit.service import get_config
+
+    monkeypatch.setattr(settings, "environment", "production")
+    monkeypatch.setattr(settings, "rate_limit_fp_max", 7)
+    get_config.cache_clear()
+    try:
+        config = get_config()
+        assert (config.ip_max, config.building_max, config.fp_max) == (5, 5, 7)
+    finally:
+        get_config.cache_clear()
+
+
+class _Row:
+    ip_count = building_count = fp_count = 0
+
+
+@pytest.mark.asyncio
+async def test_recording_check_locks_its_keys_first(fake_db) -> None:
+    from app.rate_limit import service
+
+    db = fake_db(_Row())
+    await service.evaluate_rate_limit(db, ip="203.0.113.9", fingerprint="fp1", building_id=42)
+    (lock, lock_params), (check, _params) = db.statements
+    assert lock is service._LOCK_KEYS
+    assert "pg_advisory_xact_lock" in str(lock)
+    assert lock_params == {"keys": ["ip:203.0.113.9", "building:42", "fp:fp1"]}
+    assert check is service._CHECK_AND_BUMP
+
+
+@pytest.mark.asyncio
+async def test_read_only_check_takes_no_locks(fake_db) -> None:
+    from app.rate_limit import service
+
+    db = fake_db(_Row())
+    await service.evaluate_rate_limit(db, ip="203.0.113.9", fingerprint="fp1", building_id=42, record=False)
+    assert [statement for statement, _params in db.statements] == [service._CHECK_ONLY]
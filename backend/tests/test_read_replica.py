@@ -0,0 +1,95 @@
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from starlette.requests import Request
+
+from app import main
+from app.core import database
+
+
+def _request(cookies: dict[str, str] | None = None) -> Request:
+    cookie = "; ".join(f"{name}={value}" for name, value in (cookies or {}).items())
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/api/search", "headers": headers})
+
+
+class _Factory:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self.name
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+async def _session_for(request: Request) -> str:
+    generator = database.get_read_db(request)
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+@pytest.fixture
+def replica(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(database, "read_engine", object())
+    monkeypatch.setattr(database, "AsyncSessionLocal", _Factory("primary"))
+    monkeypatch.setattr(database, "ReadSessionLocal", _Factory("replica"))
+
+
+def test_without_read_url_reads_share_the_primary_engine() -> None:
+    assert database.read_engine is database.engine
+    assert database.has_read_replica() is False
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_replica(replica) -> None:
+    assert await _session_for(_request()) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_sticky_cookie_pins_reads_to_the_primary(replica) -> None:
+    assert await _session_for(_request({database.PRIMARY_STICKY_COOKIE: "1"})) == "primary"
+
+
+def _sticky_app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(main.stick_to_primary_after_writes)
+
+    @app.post("/write", dependencies=[Depends(database.stick_to_primary)])
+    async def write() -> dict:
+        return {}
+
+    @app.post("/rejected-write", dependencies=[Depends(database.stick_to_primary)])
+    async def rejected_write() -> dict:
+        raise HTTPException(status_code=400, detail="nope")
+
+    @app.post("/check")
+    async def check() -> dict:
+        return {}
+
+    return app
+
+
+async def _sticky_cookie(path: str) -> str | None:
+    transport = httpx.ASGITransport(app=_sticky_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(path)
+    return response.cookies.get(database.PRIMARY_STICKY_COOKIE)
+
+
+@pytest.mark.asyncio
+async def test_middleware_sticks_only_after_marked_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(main, "has_read_replica", lambda: True)
+    assert await _sticky_cookie("/write") == "1"
+    assert await _sticky_cookie("/check") is None
+    assert await _sticky_cookie("/rejected-write") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_never_sticks_without_a_replica() -> None:
+    assert await _sticky_cookie("/write") is None
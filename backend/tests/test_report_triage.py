@@ -0,0 +1,91 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.entities import ReportReviewStats
+from app.models.enums import ReportReason
+from app.moderation.reports import (
+    REASON_COLUMNS,
+    decode_triage_cursor,
+    encode_triage_cursor,
+    record_report,
+    resolve_review_reports,
+    triage_query,
+)
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class _RecordingSession:
+    def __init__(self, rowcount: int = 0) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.rowcount = rowcount
+
+    async def execute(self, statement, params=None):
+        self.calls.append((str(statement), params))
+        return type("Result", (), {"rowcount": self.rowcount})()
+
+
+def test_every_reason_has_a_counter_column() -> None:
+    assert set(REASON_COLUMNS) == set(ReportReason)
+    assert set(REASON_COLUMNS.values()) <= set(ReportReviewStats.__table__.columns.keys())
+
+
+def test_triage_cursor_round_trip() -> None:
+    key = (3, datetime(2026, 10, 19, 8, 0, 1, 5, tzinfo=UTC), 77)
+    assert decode_triage_cursor(encode_triage_cursor(key)) == key
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", "MXwyfDM"])
+def test_decode_triage_cursor_rejects_garbage(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_triage_cursor(cursor)
+
+
+def test_open_triage_orders_hottest_first_and_seeks() -> None:
+    after = (2, datetime(2026, 10, 19, tzinfo=UTC), 10)
+    sql = _sql(triage_query(False, after, 51))
+    assert "report_review_stats.open_count > 0" in sql
+    assert "report_review_stats.open_count < 2" in sql
+    assert "(report_review_stats.last_reported_at, report_review_stats.review_id) <" in sql
+    assert (
+        "ORDER BY report_review_stats.open_count DESC, report_review_stats.last_reported_at DESC, "
+        "report_review_stats.review_id DESC" in sql
+    )
+    assert "OFFSET" not in sql
+    assert "LIMIT 51" in sql
+
+
+def test_resolved_triage_uses_recency_only() -> None:
+    after = (0, datetime(2026, 10, 19, tzinfo=UTC), 10)
+    sql = _sql(triage_query(True, after, 20))
+    assert "report_review_stats.open_count = 0" in sql
+    assert "report_review_stats.open_count <" not in sql
+    assert "ORDER BY report_review_stats.last_reported_at DESC, report_review_stats.review_id DESC" in sql
+
+
+@pytest.mark.asyncio
+async def test_record_report_bumps_the_reason_column() -> None:
+    db = _RecordingSession()
+    at = datetime(2026, 10, 19, tzinfo=UTC)
+    await record_report(db, 5, ReportReason.FALSE_INFO, at)
+    sql, params = db.calls[0]
+    assert "ON CONFLICT (review_id) DO UPDATE" in sql
+    assert "false_info_count = s.false_info_count + 1" in sql
+    assert "spam_count" not in sql
+    assert params == {"review_id": 5, "at": at}
+
+
+@pytest.mark.asyncio
+async def test_resolve_locks_stats_before_touching_reports() -> None:
+    db = _RecordingSession(rowcount=4)
+    admin_id = uuid.uuid4()
+    assert await resolve_review_reports(db, 5, admin_id) == 4
+    lock, resolve, reset = (sql for sql, _ in db.calls)
+    assert "FOR UPDATE" in lock
+    assert "resolved_at IS NULL" in resolve
+    assert "open_count = 0" in reset and "pii_count = 0" in reset
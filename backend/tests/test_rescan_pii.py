@@ -0,0 +1,42 @@
+import hashlib
+
+from app.tools.rescan_pii import _STAMP_VERSION, _UPDATE_FLAGS, rescan_batch
+
+
+def test_rescan_batch_splits_changed_and_unchanged_rows() -> None:
+    result = rescan_batch(
+        [
+            (1, "Quiet building, nothing to report here at all.", False, []),
+            (2, "Email the landlord at owner@example.com for keys.", False, []),
+            (3, "Check https://example.org for the floor plans.", True, ["url"]),
+            (4, "Old rules flagged this clean comment by mistake.", True, ["handle"]),
+        ]
+    )
+    assert result.unchanged == [1, 3]
+    assert result.changed == [
+        {"id": 2, "flagged": True, "reasons": ["email"]},
+        {"id": 4, "flagged": False, "reasons": []},
+    ]
+    assert result.newly_blocked == 1
+
+
+def test_rescan_batch_keeps_reasons_from_other_detectors() -> None:
+    result = rescan_batch([(5, "Same text as another review, nothing personal.", True, ["near_duplicate"])])
+    assert result.unchanged == [5]
+
+
+def test_rescan_batch_records_what_each_scan_read() -> None:
+    comment = "Check https://example.org for the floor plans."
+    result = rescan_batch([(3, comment, True, ["url", "near_duplicate"]), (6, comment, False, None)])
+    assert result.read_as == {
+        3: (hashlib.md5(comment.encode()).hexdigest(), '["url", "near_duplicate"]'),
+        6: (hashlib.md5(comment.encode()).hexdigest(), None),
+    }
+
+
+def test_write_backs_skip_rows_changed_since_the_scan() -> None:
+    for statement in (_UPDATE_FLAGS, _STAMP_VERSION):
+        sql = " ".join(str(statement).split())
+        assert "pii_ruleset_version < :version" in sql
+        assert "md5(" in sql and "comment_md5" in sql
+        assert "IS NOT DISTINCT FROM CAST(" in sql
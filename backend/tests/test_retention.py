@@ -0,0 +1,117 @@
+from datetime import date
+
+import pytest
+
+from app.maintenance import retention
+from app.maintenance.retention import (
+    _PARTITION_NAME,
+    RetentionReport,
+    ensure_partitions,
+    partition_name,
+    run_retention,
+)
+
+
+def test_partition_name_round_trips() -> None:
+    name = partition_name(date(2026, 3, 7))
+    assert name == "rate_limit_events_p20260307"
+    assert _PARTITION_NAME.match(name).group(1) == "20260307"
+    assert _PARTITION_NAME.match("rate_limit_events_default") is None
+
+
+def test_report_summary_lists_reclaimed_rows() -> None:
+    report = RetentionReport(rows_deleted={"sessions": 12, "magic_link_tokens": 3}, elapsed_seconds=0.5)
+    summary = report.summary()
+    assert "sessions=12" in summary
+    assert "0.50s" in summary
+
+
+@pytest.mark.asyncio
+async def test_purges_still_run_when_partition_creation_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    purged: list[str] = []
+
+    async def ensure_partitions(today, days_ahead):
+        raise RuntimeError("updated partition constraint for default partition would be violated")
+
+    async def drop_expired_partitions(today, keep_days):
+        return ["rate_limit_events_p20260101"]
+
+    async def delete_in_batches(table, key, condition, params, batch_size):
+        purged.append(table)
+        return 2
+
+    monkeypatch.setattr(retention, "ensure_partitions", ensure_partitions)
+    monkeypatch.setattr(retention, "drop_expired_partitions", drop_expired_partitions)
+    monkeypatch.setattr(retention, "delete_in_batches", delete_in_batches)
+
+    report = await run_retention()
+    assert report.failed_steps == ["ensure_partitions"]
+    assert report.partitions_dropped == ["rate_limit_events_p20260101"]
+    assert {
+        "rate_limit_events_default", "sessions", "magic_link_tokens", "jobs", "email_outbox", "idempotency_keys"
+    } <= set(purged)
+    assert report.rows_deleted["sessions"] == 2
+    assert "failed [ensure_partitions]" in report.summary()
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_purged_after_their_retention_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    conditions: dict[str, tuple[str, dict]] = {}
+
+    async def noop(*args, **kwargs):
+        return []
+
+    async def delete_in_batches(table, key, condition, params, batch_size):
+        conditions[table] = (condition, params)
+        return 0
+
+    monkeypatch.setattr(retention, "ensure_partitions", noop)
+    monkeypatch.setattr(retention, "drop_expired_partitions", noop)
+    monkeypatch.setattr(retention, "delete_in_batches", delete_in_batches)
+
+    await run_retention()
+    condition, params = conditions["jobs"]
+    assert "status = 'FAILED' AND run_after < :failed_cutoff" in condition
+    assert (params["cutoff"] - params["failed_cutoff"]).days == retention.settings.failed_job_retention_days - 7
+
+
+class _PartitionDb:
+    def __init__(self, existing: set[str]) -> None:
+        self.existing = existing
+        self.statements: list[tuple[str, dict | None]] = []
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def scalar(self, statement, params):
+        return params["name"] in self.existing
+
+    async def execute(self, statement, params=None):
+        self.statements.append((" ".join(str(statement).split()), params))
+
+    async def commit(self) -> None:
+        self.committed = True
+
+
+@pytest.mark.asyncio
+async def test_new_partitions_take_default_rows_and_utc_bounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    db = _PartitionDb({"rate_limit_events_p20261019"})
+    monkeypatch.setattr(retention, "AsyncSessionLocal", lambda: db)
+
+    created = await ensure_partitions(date(2026, 10, 19), days_ahead=1)
+
+    assert created == ["rate_limit_events_p20261020"]
+    (create, _), (move, bounds), (attach, _) = db.statements
+    assert create == "CREATE TABLE rate_limit_events_p20261020 (LIKE rate_limit_events INCLUDING DEFAULTS)"
+    assert "DELETE FROM rate_limit_events_default" in move
+    assert "INSERT INTO rate_limit_events_p20261020 SELECT * FROM moved" in move
+    assert bounds == {"lower": "2026-10-20 00:00:00+00", "upper": "2026-10-21 00:00:00+00"}
+    assert attach == (
+        "ALTER TABLE rate_limit_events ATTACH PARTITION rate_limit_events_p20261020 "
+        "FOR VALUES FROM ('2026-10-20 00:00:00+00') TO ('2026-10-21 00:00:00+00')"
+    )
+    assert db.committed
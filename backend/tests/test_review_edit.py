@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.reviews import update_review
+from app.models.entities import Review, User
+from app.models.enums import ReviewStatus, UserRole
+from app.pii.scanner import RULESET_VERSION
+from app.schemas.reviews import ReviewUpdatePayload
+
+
+def _review(author: User, **values) -> Review:
+    defaults = {"pii_flagged": False, "pii_reasons": [], "pii_ruleset_version": RULESET_VERSION}
+    return Review(
+        id=1,
+        author_user_id=author.id,
+        status=ReviewStatus.APPROVED,
+        comment="Quiet building, friendly neighbours.",
+        **{**defaults, **values},
+    )
+
+
+def _payload(comment: str) -> ReviewUpdatePayload:
+    return ReviewUpdatePayload.model_construct(comment=comment, edit_token=None)
+
+
+@pytest.mark.asyncio
+async def test_edit_rescans_the_new_comment(fake_db) -> None:
+    author = User(id=uuid.uuid4(), email="a@example.com", role=UserRole.USER)
+    review = _review(author, pii_flagged=True, pii_reasons=["url", "near_duplicate"])
+    db = fake_db(review)
+
+    await update_review(1, _payload("Ask Maria Silva Santos about the flat."), db, author)
+
+    assert db.committed
+    assert review.status == ReviewStatus.PENDING
+    assert review.pii_reasons == ["possible_full_name", "near_duplicate"]
+    assert review.pii_flagged is True
+    assert review.pii_ruleset_version == RULESET_VERSION
+
+
+@pytest.mark.asyncio
+async def test_edit_adding_blocking_pii_is_rejected(fake_db) -> None:
+    author = User(id=uuid.uuid4(), email="a@example.com", role=UserRole.USER)
+    review = _review(author)
+    db = fake_db(review)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await update_review(1, _payload("Write to me at someone@example.com"), db, author)
+    assert exc_info.value.status_code == 400
+    assert not db.committed
+    assert review.comment == "Quiet building, friendly neighbours."
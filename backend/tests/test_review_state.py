@@ -1,4 +1,4 @@
-from app.moderation.state import can_transition
+from app.moderation.state import can_transition, sources_for
 from app.models.enums import ReviewStatus
 
 
@@ -11,3 +11,13 @@ def test_valid_transitions() -> None:
 def test_invalid_transitions() -> None:
     assert not can_transition(ReviewStatus.APPROVED, ReviewStatus.PENDING)
     assert not can_transition(ReviewStatus.REJECTED, ReviewStatus.APPROVED)
+
+
+def test_sources_for_inverts_transitions() -> None:
+    assert sources_for(ReviewStatus.APPROVED) == {ReviewStatus.PENDING, ReviewStatus.CHANGES_REQUESTED}
+    assert sources_for(ReviewStatus.REMOVED) == {
+        ReviewStatus.PENDING,
+        ReviewStatus.CHANGES_REQUESTED,
+        ReviewStatus.APPROVED,
+    }
+    assert sources_for(ReviewStatus.PENDING) == set()
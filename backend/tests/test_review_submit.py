@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import reviews
+from app.models.entities import Building
+from app.schemas.reviews import ReviewCreatePayload
+
+_PAYLOAD = ReviewCreatePayload.model_validate(ReviewCreatePayload.model_config["json_schema_extra"]["example"])
+
+
+@pytest.fixture
+def submit(monkeypatch: pytest.MonkeyPatch):
+    events: list[str] = []
+
+    failures: set[str] = set()
+
+    async def verify_captcha(token, remote_ip) -> None:
+        events.append("captcha:start")
+        await asyncio.sleep(0.01)
+        events.append("captcha:done")
+        if "captcha" in failures:
+            raise HTTPException(status_code=400, detail="Captcha verification failed")
+
+    async def evaluate_rate_limit(db, ip, fingerprint, building_id, *, record=True) -> None:
+        events.append("rate_limit:record" if record else "rate_limit:check")
+        if "rate_limit" in failures:
+            raise reviews.RateLimitExceeded("IP limit exceeded")
+
+    monkeypatch.setattr(reviews, "verify_captcha", verify_captcha)
+    monkeypatch.setattr(reviews, "evaluate_rate_limit", evaluate_rate_limit)
+    monkeypatch.setattr(reviews, "enqueue_review_enrichment", lambda db, review_id: None)
+    monkeypatch.setattr(reviews.settings, "review_group_commit", False)
+
+    async def run(db, payload: ReviewCreatePayload = _PAYLOAD) -> dict:
+        request = SimpleNamespace(client=SimpleNamespace(host="203.0.113.9"))
+        return await reviews._create_review(payload, request, db, None, "fp1")
+
+    run.events = events
+    run.failures = failures
+    return run
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_keys_are_locked_only_after_the_captcha(submit, fake_db) -> None:
+    db = fake_db(Building(id=1))
+    result = await submit(db)
+
+    assert result["id"] == 1
+    assert db.committed
+    assert submit.events == ["rate_limit:check", "captcha:start", "captcha:done", "rate_limit:record"]
+
+
+async def _rejection(submit, db, payload: ReviewCreatePayload = _PAYLOAD) -> HTTPException:
+    with pytest.raises(HTTPException) as exc_info:
+        await submit(db, payload)
+    assert not db.committed
+    return exc_info.value
+
+
+_BLOCKED = _PAYLOAD.model_copy(update={"comment": "Call the owner on 912 345 678 for the keys."})
+
+
+@pytest.mark.asyncio
+async def test_missing_building_wins_and_keeps_the_captcha_token(submit, fake_db) -> None:
+    submit.failures.update({"rate_limit", "captcha"})
+    assert (await _rejection(submit, fake_db(None), _BLOCKED)).status_code == 404
+    assert submit.events == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_beats_captcha_and_keeps_the_captcha_token(submit, fake_db) -> None:
+    submit.failures.update({"rate_limit", "captcha"})
+    assert (await _rejection(submit, fake_db(Building(id=1)), _BLOCKED)).status_code == 429
+    assert "captcha:start" not in submit.events
+
+
+@pytest.mark.asyncio
+async def test_captcha_failure_beats_blocked_pii(submit, fake_db) -> None:
+    submit.failures.add("captcha")
+    rejection = await _rejection(submit, fake_db(Building(id=1)), _BLOCKED)
+    assert (rejection.status_code, rejection.detail) == (400, "Captcha verification failed")
+
+
+@pytest.mark.asyncio
+async def test_blocked_pii_is_rejected_after_a_passing_captcha(submit, fake_db) -> None:
+    rejection = await _rejection(submit, fake_db(Building(id=1)), _BLOCKED)
+    assert rejection.status_code == 400
+    assert "phone numbers" in rejection.detail
+    assert "rate_limit:record" not in submit.events
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.rate_limit.service import RateLimitHit
+from app.services.review_writer import GroupCommitWriter
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_commit(monkeypatch) -> None:
+    writer = GroupCommitWriter(window=0.02, max_batch=10)
+    batches: list[int] = []
+
+    async def fake_commit(batch) -> None:
+        batches.append(len(batch))
+        for offset, item in enumerate(batch):
+            item.future.set_result(100 + offset)
+
+    monkeypatch.setattr(writer, "_commit", fake_commit)
+    hit = RateLimitHit(ip="1.2.3.4", fingerprint="fp", building_id=1)
+    try:
+        ids = await asyncio.gather(*(writer.submit({"comment": str(i)}, hit) for i in range(3)))
+    finally:
+        await writer.stop()
+
+    assert ids == [100, 101, 102]
+    assert batches == [3]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_item(monkeypatch) -> None:
+    writer = GroupCommitWriter(window=0.02, max_batch=10)
+
+    async def fake_commit(batch) -> None:
+        if len(batch) > 1:
+            raise RuntimeError("batch failed")
+        item = batch[0]
+        if item.values["comment"] == "bad":
+            raise ValueError("bad row")
+        item.future.set_result(1)
+
+    monkeypatch.setattr(writer, "_commit", fake_commit)
+    hit = RateLimitHit(ip="1.2.3.4", fingerprint="fp", building_id=1)
+    try:
+        good, bad = await asyncio.gather(
+            writer.submit({"comment": "good"}, hit),
+            writer.submit({"comment": "bad"}, hit),
+            return_exceptions=True,
+        )
+    finally:
+        await writer.stop()
+
+    assert good == 1
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_stop_commits_queued_submissions_first(monkeypatch) -> None:
+    writer = GroupCommitWriter(window=0.05, max_batch=10)
+
+    async def fake_commit(batch) -> None:
+        for item in batch:
+            item.future.set_result(7)
+
+    monkeypatch.setattr(writer, "_commit", fake_commit)
+    hit = RateLimitHit(ip="1.2.3.4", fingerprint="fp", building_id=1)
+    pending = [asyncio.create_task(writer.submit({"comment": str(i)}, hit)) for i in range(3)]
+    await asyncio.sleep(0)
+    await writer.stop()
+
+    assert await asyncio.gather(*pending) == [7, 7, 7]
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_submissions_it_cannot_drain(monkeypatch) -> None:
+    writer = GroupCommitWriter(window=0.001, max_batch=1)
+
+    async def stuck_commit(batch) -> None:
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(writer, "_commit", stuck_commit)
+    hit = RateLimitHit(ip="1.2.3.4", fingerprint="fp", building_id=1)
+    pending = [asyncio.create_task(writer.submit({"comment": str(i)}, hit)) for i in range(2)]
+    await asyncio.sleep(0.01)
+    await writer.stop(drain_timeout=0.05)
+
+    results = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, RuntimeError) for result in results)
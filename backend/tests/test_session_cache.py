@@ -0,0 +1,103 @@
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.auth import dependencies
+from app.auth.session_cache import SessionCache
+from app.core.security import create_jwt, hash_token, utcnow
+from app.models.entities import User
+from app.models.enums import UserRole
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> SessionCache:
+    cache = SessionCache(max_entries=100, ttl=30.0)
+    monkeypatch.setattr(dependencies, "session_cache", cache)
+    return cache
+
+
+def test_cache_expires_with_ttl_and_session_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = SessionCache(ttl=30.0)
+    user_id = uuid.uuid4()
+    cache.put("live", user_id, "a@example.com", UserRole.USER, utcnow() + timedelta(hours=1))
+    cache.put("expired", user_id, "a@example.com", UserRole.USER, utcnow() - timedelta(seconds=1))
+    assert cache.get("live").user_id == user_id
+    assert cache.get("expired") is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.auth.session_cache.time.monotonic", lambda: now + 31)
+    assert cache.get("live") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = SessionCache(max_entries=2)
+    expires_at = utcnow() + timedelta(hours=1)
+    for key in ("a", "b"):
+        cache.put(key, uuid.uuid4(), f"{key}@example.com", UserRole.USER, expires_at)
+    cache.get("a")
+    cache.put("c", uuid.uuid4(), "c@example.com", UserRole.USER, expires_at)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_invalidate_user_drops_every_session_of_that_user() -> None:
+    cache = SessionCache()
+    expires_at = utcnow() + timedelta(hours=1)
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    cache.put("one", user_id, "a@example.com", UserRole.USER, expires_at)
+    cache.put("two", user_id, "a@example.com", UserRole.USER, expires_at)
+    cache.put("three", other_id, "b@example.com", UserRole.ADMIN, expires_at)
+    cache.invalidate_user(user_id)
+    assert cache.get("one") is None and cache.get("two") is None
+    assert cache.get("three") is not None
+
+
+@pytest.mark.asyncio
+async def test_miss_uses_one_joined_query_and_fills_the_cache(cache: SessionCache, fake_db) -> None:
+    user = User(id=uuid.uuid4(), email="a@example.com", role=UserRole.ADMIN)
+    token = create_jwt(str(user.id))
+    db = fake_db((user, utcnow() + timedelta(hours=1)))
+
+    assert await dependencies.get_current_user(db=db, session_token=token) is user
+    assert len(db.statements) == 1
+    assert "JOIN sessions" in str(db.statements[0][0])
+
+    cached = await dependencies.get_current_user(db=db, session_token=token)
+    assert len(db.statements) == 1
+    assert (cached.id, cached.email, cached.role) == (user.id, "a@example.com", UserRole.ADMIN)
+
+
+@pytest.mark.asyncio
+async def test_cached_session_is_bound_to_the_token_subject(cache: SessionCache, fake_db) -> None:
+    token = create_jwt(str(uuid.uuid4()))
+    cache.put(hash_token(token), uuid.uuid4(), "a@example.com", UserRole.USER, utcnow() + timedelta(hours=1))
+    assert await dependencies.get_current_user(db=fake_db(), session_token=token) is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_session_is_not_cached(cache: SessionCache, fake_db) -> None:
+    token = create_jwt(str(uuid.uuid4()))
+    assert await dependencies.get_current_user(db=fake_db(None), session_token=token) is None
+    assert len(cache) == 0
+
+
+def test_invalidated_session_is_not_cached_again_by_an_earlier_read(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = SessionCache(ttl=30.0)
+    expires_at = utcnow() + timedelta(hours=1)
+    user_id = uuid.uuid4()
+    # A request read the session row, then logout deleted it and invalidated the cache.
+    cache.invalidate("token")
+    cache.put("token", user_id, "a@example.com", UserRole.USER, expires_at)
+    assert cache.get("token") is None
+
+    cache.invalidate_user(user_id)
+    cache.put("other", user_id, "a@example.com", UserRole.ADMIN, expires_at)
+    assert cache.get("other") is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.auth.session_cache.time.monotonic", lambda: now + 31)
+    cache.put("other", user_id, "a@example.com", UserRole.USER, expires_at)
+    assert cache.get("other") is not None
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS, CACHING_DISABLED
+
+from app.api.search import _BUILDING_DETAIL, _search_statement, search_params
+from app.auth.dependencies import _SESSION_USER
+from app.core import metrics
+from app.core.statement_cache import record_cache_outcome
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_search_statement_is_memoized_per_shape() -> None:
+    assert _search_statement(True, "top", False) is _search_statement(True, "top", False)
+    assert _search_statement(True, "top", False) is not _search_statement(True, "recency", False)
+
+
+def test_search_sql_does_not_depend_on_query_tokens() -> None:
+    short, long = search_params("alvalade"), search_params("rua da republica 100 lisboa")
+    assert len(short["token_patterns"]) != len(long["token_patterns"])
+    # The same statement serves both queries: only the bound arrays differ.
+    sql = _sql(_search_statement(True, "recency", True))
+    assert "LIKE ANY" in sql
+    assert "LIKE ALL" in sql
+    assert "unnest" in sql
+    assert "republica" not in sql
+
+
+def test_search_params_build_token_arrays() -> None:
+    params = search_params("Rua Republca 100")
+    assert params["numbers"] == [100]
+    assert params["token_patterns"] == ["%rua%", "%republca%"]
+    assert params["loose_patterns"] == ["%rua%", "%republca%", "%repu%"]
+    assert search_params("12")["token_patterns"] == []
+
+
+def test_search_without_query_has_no_filters() -> None:
+    sql = _sql(_search_statement(False, "recency", False))
+    assert "LIKE" not in sql
+    assert "unnest" not in sql
+
+
+def test_hot_lookups_bind_their_values() -> None:
+    assert "%(building_id)s" in _sql(_BUILDING_DETAIL)
+    sql = _sql(_SESSION_USER)
+    for name in ("token_hash", "now", "user_id"):
+        assert f"%({name})s" in sql
+
+
+def test_compile_cache_outcomes_are_counted() -> None:
+    before = {key: metrics.counter(f"db.compile_cache.test.{key}").value for key in ("hit", "miss", "uncached")}
+    for outcome in (CACHE_MISS, CACHE_HIT, CACHE_HIT, CACHING_DISABLED):
+        record_cache_outcome("test", SimpleNamespace(cache_hit=outcome))
+    after = {key: metrics.counter(f"db.compile_cache.test.{key}").value for key in ("hit", "miss", "uncached")}
+    assert after["hit"] - before["hit"] == 2
+    assert after["miss"] - before["miss"] == 1
+    assert after["uncached"] - before["uncached"] == 1
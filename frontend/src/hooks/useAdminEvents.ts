@@ -0,0 +1,36 @@
+import { useEffect, useRef } from 'react';
+
+import { api } from '../api/client';
+
+export type AdminEvent = {
+  type: 'review.created' | 'review.status_changed' | 'report.created' | 'report.resolved' | 'stream.connected';
+  id?: number;
+  status?: string;
+  previous_status?: string;
+  review_id?: number;
+  reason?: string;
+  resolved_at?: string;
+  pii_flagged?: boolean;
+};
+
+const EVENT_TYPES: AdminEvent['type'][] = [
+  'review.created',
+  'review.status_changed',
+  'report.created',
+  'report.resolved',
+  'stream.connected'
+];
+
+// Subscribes to the admin server-sent event stream for the lifetime of the
+// calling component. The browser reconnects on its own after drops.
+export function useAdminEvents(onEvent: (event: AdminEvent) => void) {
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    const source = new EventSource(`${api.defaults.baseURL}/admin/events`, { withCredentials: true });
+    const listener = (message: MessageEvent<string>) => handler.current(JSON.parse(message.data) as AdminEvent);
+    EVENT_TYPES.forEach((type) => source.addEventListener(type, listener as EventListener));
+    return () => source.close();
+  }, []);
+}
@@ -0,0 +1,67 @@
+import { useEffect, useRef, useState } from 'react';
+
+import { api } from '../api/client';
+
+export type PiiSpan = {
+  category: string;
+  start: number;
+  end: number;
+  blocking: boolean;
+};
+
+export type PiiCheck = {
+  flagged: boolean;
+  blocked: boolean;
+  reasons: string[];
+  length: number;
+  spans: PiiSpan[];
+};
+
+function diff(previous: string, next: string) {
+  let start = 0;
+  const max = Math.min(previous.length, next.length);
+  while (start < max && previous[start] === next[start]) start += 1;
+  let tail = 0;
+  while (tail < max - start && previous[previous.length - 1 - tail] === next[next.length - 1 - tail]) tail += 1;
+  return { start, end: previous.length - tail, insert: next.slice(start, next.length - tail) };
+}
+
+// Checks the comment for personal data as the user types. After the first
+// full check only the changed range is sent; the server re-scans around it.
+export function usePiiCheck(text: string, delayMs = 400) {
+  const [result, setResult] = useState<PiiCheck | null>(null);
+  const sessionKey = useRef(`${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`);
+  const lastSent = useRef<string | null>(null);
+
+  useEffect(() => {
+    if (!text.trim()) {
+      setResult(null);
+      return;
+    }
+    const handle = window.setTimeout(async () => {
+      const previous = lastSent.current;
+      try {
+        let response;
+        try {
+          response = await api.post<PiiCheck>(
+            '/pii/check',
+            previous === null
+              ? { text, session_key: sessionKey.current }
+              : { session_key: sessionKey.current, edit: diff(previous, text), base_length: previous.length }
+          );
+        } catch (err: any) {
+          if (err?.response?.status !== 409) throw err;
+          response = await api.post<PiiCheck>('/pii/check', { text, session_key: sessionKey.current });
+        }
+        lastSent.current = text;
+        setResult(response.data);
+      } catch {
+        // The live check is advisory; POST /reviews still enforces the rules.
+        lastSent.current = null;
+      }
+    }, delayMs);
+    return () => window.clearTimeout(handle);
+  }, [text, delayMs]);
+
+  return result;
+}
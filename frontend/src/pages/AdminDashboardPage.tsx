@@ -1,16 +1,77 @@
+import { useEffect, useState } from 'react';
 import { Link, useParams } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
 
+import { api } from '../api/client';
+
+type StatsPoint = {
+  bucket: string;
+  submitted: number;
+  approved: number;
+  rejected: number;
+  reports_created: number;
+  pii_flag_rate: number | null;
+  avg_approval_seconds: number | null;
+};
+
+type Stats = { status_counts: Record<string, number>; series: StatsPoint[] };
+
 export function AdminDashboardPage() {
   const { t } = useTranslation();
   const { locale = 'en' } = useParams();
+  const [stats, setStats] = useState<Stats | null>(null);
+
+  useEffect(() => {
+    api.get<Stats>('/admin/stats', { params: { granularity: 'day', points: 14 } }).then((response) => setStats(response.data));
+  }, []);
 
   return (
-    <main className="grid gap-3 md:grid-cols-2">
-      <Link className="card font-semibold text-primary" to={`/${locale}/admin/reviews`}>{t('admin_moderate_reviews')}</Link>
-      <Link className="card font-semibold text-primary" to={`/${locale}/admin/reports`}>{t('admin_resolve_reports')}</Link>
-      <Link className="card font-semibold text-primary" to={`/${locale}/admin/places`}>{t('admin_manage_places')}</Link>
-      <Link className="card font-semibold text-primary" to={`/${locale}/admin/users`}>{t('admin_manage_users')}</Link>
+    <main className="space-y-3">
+      <div className="grid gap-3 md:grid-cols-2">
+        <Link className="card font-semibold text-primary" to={`/${locale}/admin/reviews`}>{t('admin_moderate_reviews')}</Link>
+        <Link className="card font-semibold text-primary" to={`/${locale}/admin/reports`}>{t('admin_resolve_reports')}</Link>
+        <Link className="card font-semibold text-primary" to={`/${locale}/admin/places`}>{t('admin_manage_places')}</Link>
+        <Link className="card font-semibold text-primary" to={`/${locale}/admin/users`}>{t('admin_manage_users')}</Link>
+      </div>
+      {stats && (
+        <>
+          <section className="card flex flex-wrap gap-4">
+            {Object.entries(stats.status_counts).map(([status, count]) => (
+              <p key={status} className="text-sm text-ink">
+                <span className="font-semibold">{count}</span> {status}
+              </p>
+            ))}
+          </section>
+          <section className="card overflow-x-auto">
+            <table className="w-full text-left text-sm text-ink">
+              <thead>
+                <tr>
+                  <th>{t('admin_stats_day')}</th>
+                  <th>{t('admin_stats_submitted')}</th>
+                  <th>{t('admin_stats_approved')}</th>
+                  <th>{t('admin_stats_rejected')}</th>
+                  <th>{t('admin_stats_pii_rate')}</th>
+                  <th>{t('admin_stats_approval_hours')}</th>
+                  <th>{t('admin_stats_reports')}</th>
+                </tr>
+              </thead>
+              <tbody>
+                {stats.series.map((point) => (
+                  <tr key={point.bucket}>
+                    <td>{point.bucket}</td>
+                    <td>{point.submitted}</td>
+                    <td>{point.approved}</td>
+                    <td>{point.rejected}</td>
+                    <td>{point.pii_flag_rate === null ? '-' : `${Math.round(point.pii_flag_rate * 100)}%`}</td>
+                    <td>{point.avg_approval_seconds === null ? '-' : (point.avg_approval_seconds / 3600).toFixed(1)}</td>
+                    <td>{point.reports_created}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </section>
+        </>
+      )}
     </main>
   );
 }
@@ -1,29 +1,100 @@
-import { useEffect, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 
 import { api } from '../api/client';
+import { useAdminEvents } from '../hooks/useAdminEvents';
 
-type Report = { id: number; review_id: number; reason: string; details: string | null; resolved_at: string | null };
+type TriageItem = {
+  review_id: number;
+  review_status: string;
+  comment_preview: string;
+  open_count: number;
+  total_count: number;
+  reasons: Record<string, number>;
+  first_reported_at: string | null;
+  last_reported_at: string;
+};
+
+type TriagePage = { items: TriageItem[]; next_cursor: string | null };
 
 export function AdminReportsPage() {
   const { t } = useTranslation();
-  const [reports, setReports] = useState<Report[]>([]);
+  const [items, setItems] = useState<TriageItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [state, setState] = useState<'open' | 'resolved'>('open');
+  const [newCount, setNewCount] = useState(0);
+
+  const load = useCallback(
+    async (cursor?: string) => {
+      const response = await api.get<TriagePage>('/admin/reports/triage', { params: { state, cursor } });
+      setItems((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
+      if (!cursor) setNewCount(0);
+    },
+    [state]
+  );
 
   useEffect(() => {
-    api.get<Report[]>('/admin/reports').then((response) => setReports(response.data));
-  }, []);
+    void load();
+  }, [load]);
+
+  useAdminEvents((event) => {
+    if (event.type === 'report.created' && state === 'open') {
+      // New reports change the ordering, so they are surfaced rather than
+      // spliced into the current page.
+      setNewCount((count) => count + 1);
+    } else if (event.type === 'stream.connected') {
+      void load();
+    }
+  });
+
+  async function resolve(reviewId: number) {
+    await api.post(`/admin/reports/reviews/${reviewId}/resolve`);
+    setItems((previous) => previous.filter((item) => item.review_id !== reviewId));
+  }
 
   return (
     <main className="space-y-3">
-      {reports.map((report) => (
-        <article className="card" key={report.id}>
-          <p className="font-semibold">Report #{report.id}</p>
-          <p>{t('admin_report_review')} {report.review_id}</p>
-          <p>{t('admin_report_reason')} {report.reason}</p>
-          <p>{t('admin_report_details')} {report.details ?? '-'}</p>
-          <p>{report.resolved_at ? t('admin_report_status_resolved') : t('admin_report_status_open')}</p>
+      <div className="card flex flex-wrap items-center gap-3">
+        <label className="text-sm font-medium text-ink">
+          {t('admin_report_state')}{' '}
+          <select className="input" value={state} onChange={(event) => setState(event.target.value as 'open' | 'resolved')}>
+            <option value="open">{t('admin_report_status_open')}</option>
+            <option value="resolved">{t('admin_report_status_resolved')}</option>
+          </select>
+        </label>
+      </div>
+      {newCount > 0 && (
+        <button className="btn w-full" onClick={() => void load()}>
+          {t('admin_report_new_items', { count: newCount })}
+        </button>
+      )}
+      {items.map((item) => (
+        <article className="card" key={item.review_id}>
+          <p className="font-semibold">
+            {t('admin_report_review')} #{item.review_id} · {item.review_status}
+          </p>
+          <p className="text-sm text-ink">{item.comment_preview}</p>
+          <p>{t('admin_report_counts', { open: item.open_count, total: item.total_count })}</p>
+          <p>
+            {t('admin_report_reason')}{' '}
+            {Object.entries(item.reasons)
+              .filter(([, count]) => count > 0)
+              .map(([reason, count]) => `${reason} (${count})`)
+              .join(', ') || '-'}
+          </p>
+          {state === 'open' && (
+            <button className="btn" onClick={() => void resolve(item.review_id)}>
+              {t('admin_report_resolve')}
+            </button>
+          )}
         </article>
       ))}
+      {nextCursor && (
+        <button className="btn" onClick={() => void load(nextCursor)}>
+          {t('admin_queue_load_more')}
+        </button>
+      )}
     </main>
   );
 }
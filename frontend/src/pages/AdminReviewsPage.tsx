@@ -1,35 +1,110 @@
-import { useEffect, useState } from 'react';
+import { useCallback, useEffect, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 
 import { api } from '../api/client';
+import { useAdminEvents } from '../hooks/useAdminEvents';
 
-type Review = { id: number; status: string; comment: string; pii_flagged: boolean };
+type QueueItem = {
+  id: number;
+  status: string;
+  comment_preview: string;
+  pii_flagged: boolean;
+  pii_reasons: string[];
+  language_tag: string;
+  verified: boolean;
+};
+
+type QueuePage = { items: QueueItem[]; next_cursor: string | null };
+
+const STATUSES = ['PENDING', 'CHANGES_REQUESTED', 'APPROVED', 'REJECTED', 'REMOVED'] as const;
 
 export function AdminReviewsPage() {
   const { t } = useTranslation();
-  const [reviews, setReviews] = useState<Review[]>([]);
+  const [reviews, setReviews] = useState<QueueItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [statusFilter, setStatusFilter] = useState<(typeof STATUSES)[number]>('PENDING');
+  const [piiOnly, setPiiOnly] = useState(false);
+  const [newCount, setNewCount] = useState(0);
 
-  async function load() {
-    const response = await api.get<Review[]>('/admin/reviews');
-    setReviews(response.data);
-  }
+  const load = useCallback(
+    async (cursor?: string) => {
+      const response = await api.get<QueuePage>('/admin/reviews/queue', {
+        params: { status: statusFilter, pii_flagged: piiOnly ? true : undefined, cursor }
+      });
+      setReviews((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
+      if (!cursor) setNewCount(0);
+    },
+    [statusFilter, piiOnly]
+  );
 
   useEffect(() => {
     void load();
-  }, []);
+  }, [load]);
+
+  useAdminEvents((event) => {
+    if (event.type === 'review.created' && event.status === statusFilter) {
+      setNewCount((count) => count + 1);
+    } else if (event.type === 'review.status_changed' && event.status !== statusFilter) {
+      setReviews((previous) => previous.filter((review) => review.id !== event.id));
+    } else if (event.type === 'stream.connected') {
+      void load();
+    }
+  });
+
+  // Leases the next batch to this moderator so others working the same
+  // queue get different reviews.
+  async function claimNext() {
+    const response = await api.post<{ items: QueueItem[] }>('/admin/reviews/claim', {
+      limit: 10,
+      status: statusFilter === 'CHANGES_REQUESTED' ? 'CHANGES_REQUESTED' : 'PENDING'
+    });
+    setReviews(response.data.items);
+    setNextCursor(null);
+  }
 
   async function moderate(id: number, action: 'approve' | 'reject' | 'request-changes' | 'remove') {
     await api.post(`/admin/reviews/${id}/${action}`, { message: `Action ${action} applied.` });
-    await load();
+    setReviews((previous) => previous.filter((review) => review.id !== id));
   }
 
   return (
     <main className="space-y-3">
+      <div className="card flex flex-wrap items-center gap-3">
+        <label className="text-sm font-medium text-ink">
+          {t('admin_queue_status')}{' '}
+          <select
+            className="input"
+            value={statusFilter}
+            onChange={(event) => setStatusFilter(event.target.value as (typeof STATUSES)[number])}
+          >
+            {STATUSES.map((value) => (
+              <option key={value} value={value}>
+                {value}
+              </option>
+            ))}
+          </select>
+        </label>
+        <label className="text-sm text-ink">
+          <input type="checkbox" checked={piiOnly} onChange={(event) => setPiiOnly(event.target.checked)} />{' '}
+          {t('admin_queue_pii_only')}
+        </label>
+        <button className="btn" onClick={() => void claimNext()}>
+          {t('admin_queue_claim')}
+        </button>
+      </div>
+      {newCount > 0 && (
+        <button className="btn w-full" onClick={() => void load()}>
+          {t('admin_queue_new_items', { count: newCount })}
+        </button>
+      )}
       {reviews.map((review) => (
         <article key={review.id} className="card space-y-2">
-          <p className="font-semibold">#{review.id} · {review.status}</p>
-          <p>{review.comment}</p>
-          <p>{review.pii_flagged ? t('admin_pii_flagged') : t('admin_no_pii')}</p>
+          <p className="font-semibold">#{review.id} · {review.status} · {review.language_tag}</p>
+          <p>{review.comment_preview}</p>
+          <p>
+            {review.pii_flagged ? `${t('admin_pii_flagged')} (${review.pii_reasons.join(', ')})` : t('admin_no_pii')}
+          </p>
           <div className="flex flex-wrap gap-2">
             <button className="btn" onClick={() => moderate(review.id, 'approve')}>{t('admin_approve')}</button>
             <button className="btn" onClick={() => moderate(review.id, 'request-changes')}>{t('admin_request_changes')}</button>
@@ -38,6 +113,11 @@ export function AdminReviewsPage() {
           </div>
         </article>
       ))}
+      {nextCursor && (
+        <button className="btn" onClick={() => void load(nextCursor)}>
+          {t('admin_queue_load_more')}
+        </button>
+      )}
     </main>
   );
 }
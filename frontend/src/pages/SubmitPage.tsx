@@ -4,6 +4,7 @@ import { useTranslation } from 'react-i18next';
 
 import { api } from '../api/client';
 import { StarRating } from '../components/StarRating';
+import { usePiiCheck } from '../hooks/usePiiCheck';
 
 const initialRatings = {
   people_noise: 3,
@@ -62,6 +63,7 @@ export function SubmitPage() {
   const [toYear, setToYear] = useState(2024);
   const [durationMonths, setDurationMonths] = useState(12);
   const [comment, setComment] = useState('');
+  const piiCheck = usePiiCheck(comment);
   const [ratings, setRatings] = useState(initialRatings);
   const [result, setResult] = useState<{ tracking_code: string; edit_token: string } | null>(null);
   const [apiError, setApiError] = useState<string | null>(null);
@@ -405,6 +407,7 @@ export function SubmitPage() {
             placeholder={t('submit_notes_placeholder')}
           />
           {errors.comment && <p className="mt-1 text-sm text-red-700">{errors.comment}</p>}
+          {piiCheck?.blocked && <p className="mt-1 text-sm text-red-700">{t('submit_pii_blocked')}</p>}
           <p className="mt-2 text-xs text-ink/60">{t('submit_notes_duration_hint')}</p>
         </section>
 